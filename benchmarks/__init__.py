@@ -0,0 +1,5 @@
+"""Benchmarks for performance relevant parts of the flask app.
+
+Run a benchmark with ``poetry run invoke benchmark --name=<module>``
+or directly with ``python -m benchmarks.<module>``.
+"""
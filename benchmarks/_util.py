@@ -0,0 +1,50 @@
+"""Utilities shared by the benchmarks."""
+
+from os import environ
+from statistics import mean, median
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+from flask import Flask
+
+
+def create_benchmark_app(**config: Any) -> Flask:
+    """Create an app with the production defaults and the config overrides."""
+    # import here to allow benchmarks to measure the import time
+    from flask_template import create_app
+    from flask_template.util.config import ProductionConfig
+
+    environ.setdefault("INSTANCE_PATH", mkdtemp(prefix="flask_template_bench_"))
+    test_config: Dict[str, Any] = {
+        key: getattr(ProductionConfig, key)
+        for key in dir(ProductionConfig)
+        if key.isupper()
+    }
+    test_config.update(
+        TESTING=True,
+        SECRET_KEY="benchmark-secret-key-benchmark-secret-key",
+        SQLALCHEMY_DATABASE_URI="sqlite://",
+    )
+    test_config.update(config)
+    return create_app(test_config)
+
+
+def timeit(func: Callable[[], Any], repeat: int = 5, number: int = 1) -> List[float]:
+    """Time ``number`` calls of func ``repeat`` times (seconds per call)."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((perf_counter() - start) / number)
+    return timings
+
+
+def format_timings(timings: List[float]) -> str:
+    """Format timings (in seconds) as a short human readable string."""
+    return (
+        f"median {median(timings) * 1000:9.3f} ms, "
+        f"mean {mean(timings) * 1000:9.3f} ms, "
+        f"min {min(timings) * 1000:9.3f} ms"
+    )
@@ -0,0 +1,60 @@
+"""Benchmark bulk inserts and upserts against inserting ORM objects singly."""
+
+from tempfile import mkdtemp
+from time import perf_counter
+
+from sqlalchemy import delete
+
+from flask_template.db import DB
+from flask_template.db.bulk import bulk_insert, bulk_upsert
+from flask_template.db.models.example import Example, TestDataclass
+
+from ._util import create_benchmark_app
+
+ROW_COUNTS = (10_000, 100_000)
+
+
+def main():
+    db_folder = mkdtemp(prefix="flask_template_bench_")
+    app = create_benchmark_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_folder}/bulk.db")
+    with app.app_context():
+        DB.create_all()
+
+        def report(name: str, count: int, seconds: float):
+            print(f"{name:>22} {count:7d} rows: {count / seconds:10.0f} rows/s")
+
+        for count in ROW_COUNTS:
+            DB.session.execute(delete(Example))
+            DB.session.commit()
+            if count <= 10_000:  # too slow for more rows
+                start = perf_counter()
+                for i in range(count):
+                    DB.session.add(Example(name=f"example-{i}"))
+                    DB.session.flush()
+                DB.session.commit()
+                report("ORM add + flush", count, perf_counter() - start)
+                DB.session.execute(delete(Example))
+                DB.session.commit()
+
+            result = bulk_insert(
+                Example, ({"name": f"example-{i}"} for i in range(count))
+            )
+            report("bulk_insert (dicts)", count, result.seconds)
+
+            result = bulk_upsert(
+                Example,
+                ({"id": i, "name": f"updated-{i}"} for i in range(1, count * 2, 2)),
+            )
+            report("bulk_upsert (dicts)", count, result.seconds)
+
+            DB.session.execute(delete(TestDataclass))
+            DB.session.commit()
+            result = bulk_insert(
+                TestDataclass,
+                (TestDataclass(id=i, name=f"name-{i}") for i in range(1, count + 1)),
+            )
+            report("bulk_insert (dataclass)", count, result.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Benchmark the connection setup latency versus the number of apps created."""
+
+from tempfile import mkdtemp
+
+from flask_template.db import DB
+from flask_template.db.connection import get_connection_setup_stats
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+APP_COUNTS = (1, 50, 200)
+
+
+def main():
+    db_folder = mkdtemp(prefix="flask_template_bench_")
+    created = 0
+    for app_count in APP_COUNTS:
+        while created < app_count:
+            app = create_benchmark_app(
+                SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_folder}/app{created}.db"
+            )
+            created += 1
+        with app.app_context():
+            engine = DB.engine
+
+            def connect():
+                engine.dispose()  # always open a new dbapi connection
+                with engine.connect():
+                    pass
+
+            timings = timeit(connect, repeat=5, number=20)
+            stats = get_connection_setup_stats()
+        print(
+            f"{app_count:4d} apps: connect {format_timings(timings)}, "
+            f"setup mean {stats['meanSeconds'] * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark CORS preflight and cross origin requests.
+
+Compares the previous global ``flask_cors.CORS(app)`` with the precomputed
+``CORS_POLICIES`` answering preflight requests in a WSGI middleware.
+"""
+
+from flask_cors import CORS
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+URL = "/api/v1/auth/login/"
+PREFLIGHT_HEADERS = {
+    "Origin": "https://example.com",
+    "Access-Control-Request-Method": "POST",
+    "Access-Control-Request-Headers": "content-type, authorization",
+}
+
+
+def main():
+    flask_cors_app = create_benchmark_app(CORS_POLICIES={})
+    CORS(flask_cors_app)
+    apps = (("flask-cors", flask_cors_app), ("CORS_POLICIES", create_benchmark_app()))
+    for name, app in apps:
+        client = app.test_client()
+
+        def preflight():
+            client.options(URL, headers=PREFLIGHT_HEADERS)
+
+        def cross_origin_get():
+            client.get("/api/", headers={"Origin": "https://example.com"})
+
+        preflight()  # warm up (lazy components)
+        print(f"{name:>14} preflight: " + format_timings(timeit(preflight, number=2_000)))
+        print(
+            f"{name:>14} GET      : "
+            + format_timings(timeit(cross_origin_get, number=2_000))
+        )
+
+
+if __name__ == "__main__":
+    main()
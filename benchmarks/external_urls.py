@@ -0,0 +1,51 @@
+"""Benchmark building the hypermedia links of the API root views."""
+
+import marshmallow as ma
+from flask import url_for
+
+from flask_template.api.links import external_url
+from flask_template.api.util import MaBaseSchema
+from flask_template.api.v1_api.models import AuthRootSchema
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+ENDPOINTS = (
+    "api-v1.LoginView",
+    "api-v1.RefreshView",
+    "api-v1.LogoutView",
+    "api-v1.WhoamiView",
+)
+
+
+class UrlAuthRootSchema(MaBaseSchema):
+    login = ma.fields.Url(required=True, allow_none=False, dump_only=True)
+    refresh = ma.fields.Url(required=True, allow_none=False, dump_only=True)
+    logout = ma.fields.Url(required=True, allow_none=False, dump_only=True)
+    whoami = ma.fields.Url(required=True, allow_none=False, dump_only=True)
+
+
+def main():
+    app = create_benchmark_app(RESPONSE_CACHE_ENABLED=False)
+    with app.test_request_context("/api/v1/auth/"):
+        for name, build in (
+            ("url_for", lambda e: url_for(e, _external=True)),
+            ("external_url", external_url),
+        ):
+            timings = timeit(lambda: [build(e) for e in ENDPOINTS], number=10_000)
+            print(f"{name:>16} (4 links): " + format_timings(timings))
+
+        links = {e.split(".")[1].lower()[:-4]: external_url(e) for e in ENDPOINTS}
+        for name, schema in (
+            ("MaBaseSchema", UrlAuthRootSchema()),
+            ("Compiled schema", AuthRootSchema()),
+        ):
+            timings = timeit(lambda: schema.dump(links), number=10_000)
+            print(f"{name:>16} dump     : " + format_timings(timings))
+
+    client = app.test_client()
+    timings = timeit(lambda: client.get("/api/v1/auth/"), number=2_000)
+    print("GET /api/v1/auth/ (uncached response): " + format_timings(timings))
+
+
+if __name__ == "__main__":
+    main()
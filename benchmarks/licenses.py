@@ -0,0 +1,25 @@
+"""Benchmark the licenses page rendered per request and prerendered."""
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+URL = "/licenses/"
+
+
+def main():
+    for prerender in (False, True):
+        client = create_benchmark_app(LICENSES_PRERENDER=prerender).test_client()
+        etag = client.get(URL).headers.get("ETag")
+        name = "prerendered" if prerender else "rendered"
+        for label, headers in (
+            ("GET", {}),
+            ("GET gzip", {"Accept-Encoding": "gzip"}),
+            ("GET 304", {"If-None-Match": etag or ""}),
+        ):
+            if label == "GET 304" and not prerender:
+                continue  # no etag without prerendering
+            timings = timeit(lambda: client.get(URL, headers=headers), number=500)
+            print(f"{name:>11} {label:<8}: " + format_timings(timings))
+
+
+if __name__ == "__main__":
+    main()
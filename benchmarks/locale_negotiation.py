@@ -0,0 +1,49 @@
+"""Benchmark the locale negotiation from the Accept-Language header."""
+
+from statistics import median
+
+from werkzeug.datastructures import LanguageAccept
+from werkzeug.http import parse_accept_header
+
+from flask_template.babel import SUPPORTED_LOCALES, negotiate_locale
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+HEADERS = [
+    "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
+    "en-US,en;q=0.5",
+    "fr-CH, fr;q=0.9, en;q=0.8, de;q=0.7, *;q=0.5",
+    "de",
+]
+
+
+def main():
+    def uncached():
+        for header in HEADERS:
+            parse_accept_header(header, LanguageAccept).best_match(SUPPORTED_LOCALES)
+
+    def cached():
+        for header in HEADERS:
+            negotiate_locale(header)
+
+    for name, func in (("uncached", uncached), ("cached", cached)):
+        timings = timeit(func, repeat=5, number=20_000)
+        per_call = median(timings) / len(HEADERS) * 1_000_000
+        print(f"{name:>8} negotiation: {per_call:8.3f} µs")
+
+    client = create_benchmark_app().test_client()
+    for header in HEADERS:
+        # warm up, the error message of the missing token is translated
+        client.post("/api/v1/auth/refresh/", headers={"Accept-Language": header})
+    timings = timeit(
+        lambda: client.post(
+            "/api/v1/auth/refresh/", headers={"Accept-Language": HEADERS[0]}
+        ),
+        repeat=5,
+        number=1_000,
+    )
+    print("translated 401 response: " + format_timings(timings))
+
+
+if __name__ == "__main__":
+    main()
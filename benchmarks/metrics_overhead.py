@@ -0,0 +1,35 @@
+"""Benchmark the per request overhead of the request metrics."""
+
+from statistics import median
+
+from flask_template.api.metrics import DEFAULT_BUCKETS, EndpointMetrics
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+REQUESTS = 2_000
+URL = "/api/v1/"
+
+
+def main():
+    metrics = EndpointMetrics(DEFAULT_BUCKETS)
+
+    def record():
+        metrics.start()
+        metrics.observe("GET", 200, 0.042)
+
+    timings = timeit(record, repeat=5, number=100_000)
+    print(f"record one request:  {median(timings) * 1_000_000:8.3f} µs")
+
+    results = {}
+    for enabled in (False, True):
+        client = create_benchmark_app(METRICS_ENABLED=enabled).test_client()
+        client.get(URL)  # warm up
+        timings = timeit(lambda: client.get(URL), repeat=7, number=REQUESTS)
+        results[enabled] = median(timings)
+        print(f"metrics enabled={enabled!s:5}: " + format_timings(timings))
+    overhead = results[True] - results[False]
+    print(f"overhead per request: {overhead * 1_000_000:8.3f} µs")
+
+
+if __name__ == "__main__":
+    main()
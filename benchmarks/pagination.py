@@ -0,0 +1,72 @@
+"""Benchmark keyset (cursor) against offset pagination on a large table."""
+
+from os import environ
+from pathlib import Path
+from tempfile import mkdtemp
+
+from sqlalchemy import delete, func, insert, select
+
+from flask_template.api.pagination import encode_cursor
+from flask_template.db import DB
+from flask_template.db.models.example import Example
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+ROW_COUNT = 1_000_000
+PAGE_SIZE = 20
+DEPTHS = (0, 1_000, 100_000, 500_000, 999_000)
+
+
+def _fill_table(row_count: int, batch_size: int = 50_000):
+    for start in range(1, row_count + 1, batch_size):
+        stop = min(start + batch_size, row_count + 1)
+        DB.session.execute(
+            insert(Example),
+            [{"id": i, "name": f"example-{i}"} for i in range(start, stop)],
+        )
+    DB.session.commit()
+
+
+def main():
+    db_path = Path(environ.get("BENCHMARK_DB", mkdtemp(prefix="flask_template_bench_")))
+    app = create_benchmark_app(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path / 'pagination.db'}",
+        SERVER_NAME="localhost",
+    )
+    with app.app_context():
+        DB.create_all()
+        if DB.session.scalar(select(func.count(Example.id))) != ROW_COUNT:
+            DB.session.execute(delete(Example))
+            print(f"Inserting {ROW_COUNT} rows...")
+            _fill_table(ROW_COUNT)
+
+        def offset_page(depth: int):
+            statement = select(Example).order_by(Example.id).offset(depth)
+            return DB.session.scalars(statement.limit(PAGE_SIZE)).all()
+
+        def keyset_page(depth: int):
+            statement = select(Example).where(Example.id > depth).order_by(Example.id)
+            return DB.session.scalars(statement.limit(PAGE_SIZE + 1)).all()
+
+        for depth in DEPTHS:
+            assert [e.id for e in offset_page(depth)] == [
+                e.id for e in keyset_page(depth)[:PAGE_SIZE]
+            ], "pages differ"
+            timings = timeit(lambda: offset_page(depth), repeat=10)
+            print(f"offset query, depth {depth:7d}: " + format_timings(timings))
+            timings = timeit(lambda: keyset_page(depth), repeat=10)
+            print(f"keyset query, depth {depth:7d}: " + format_timings(timings))
+            DB.session.remove()
+
+    client = app.test_client()
+    for depth in DEPTHS:
+        url = f"/api/v1/examples/?page_size={PAGE_SIZE}"
+        if depth:
+            url += f"&cursor={encode_cursor([depth])}"
+        assert client.get(url).status_code == 200
+        timings = timeit(lambda: client.get(url), repeat=10)
+        print(f"keyset endpoint, depth {depth:7d}: " + format_timings(timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark cached and uncached responses of the API root views.
+
+Measures the full request (test client) and only the view function (including
+serialization) of the root views with the response cache disabled and enabled.
+"""
+
+from flask_template.api.response_cache import RESPONSE_CACHE
+
+from ._util import create_benchmark_app, format_timings, timeit
+
+URLS = ("/api/", "/api/v1/", "/api/v1/auth/")
+
+
+def _per_url(timings):
+    return format_timings([t / len(URLS) for t in timings])
+
+
+def main():
+    for enabled in (False, True):
+        app = create_benchmark_app(RESPONSE_CACHE_ENABLED=enabled)
+        client = app.test_client()
+        etags = {url: client.get(url).headers.get("ETag") for url in URLS}
+        name = "cached" if enabled else "uncached"
+
+        def get_all():
+            for url in URLS:
+                client.get(url)
+
+        print(f"{name:>8} request{'':<15}: " + _per_url(timeit(get_all, number=1_000)))
+
+        adapter = app.url_map.bind("localhost")
+        for url in URLS:
+            endpoint, view_args = adapter.match(url)
+            view = app.view_functions[endpoint]
+            with app.test_request_context(url):
+                timings = timeit(lambda: view(**view_args), number=10_000)
+            print(f"{name:>8} view {url:<14}: " + format_timings(timings))
+
+        if enabled:
+
+            def get_all_conditional():
+                for url in URLS:
+                    client.get(url, headers={"If-None-Match": etags[url]})
+
+            timings = timeit(get_all_conditional, number=1_000)
+            print(f"{name:>8} 304{'':<19}: " + _per_url(timings))
+            print(RESPONSE_CACHE.stats(app=app))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark the compiled schemas against the regular marshmallow schemas."""
+
+from dataclasses import dataclass
+
+import marshmallow as ma
+
+from flask_template.api.compiled_schema import CompiledMaBaseSchema
+from flask_template.api.util import MaBaseSchema
+
+from ._util import format_timings, timeit
+
+ROW_COUNTS = (1_000, 10_000, 100_000)
+
+
+@dataclass
+class Row:
+    id: int
+    name: str
+    full_name: str
+    is_active: bool
+    score: float
+    self_link: str
+
+
+class RowSchema(MaBaseSchema):
+    id = ma.fields.Integer(required=True)
+    name = ma.fields.String(required=True)
+    full_name = ma.fields.String(allow_none=True)
+    is_active = ma.fields.Boolean()
+    score = ma.fields.Float()
+    self_link = ma.fields.Url(dump_only=True)
+
+
+class CompiledRowSchema(CompiledMaBaseSchema, RowSchema):
+    pass
+
+
+def main():
+    schemas = (RowSchema(many=True), CompiledRowSchema(many=True))
+    for count in ROW_COUNTS:
+        rows = [
+            Row(i, f"row-{i}", f"Row number {i}", i % 2 == 0, i / 3, f"http://x/{i}")
+            for i in range(count)
+        ]
+        payload = schemas[0].dump(rows)
+        assert schemas[1].dump(rows) == payload, "compiled dump differs"
+        for row in payload:
+            del row["selfLink"]  # dump only field
+        assert schemas[1].load(payload) == schemas[0].load(
+            payload
+        ), "compiled load differs"
+        for schema in schemas:
+            name = type(schema).__name__
+            timings = timeit(lambda: schema.dump(rows), repeat=5)
+            print(f"{name:>18} dump {count:7d} rows: " + format_timings(timings))
+            timings = timeit(lambda: schema.load(payload), repeat=5)
+            print(f"{name:>18} load {count:7d} rows: " + format_timings(timings))
+
+
+if __name__ == "__main__":
+    main()
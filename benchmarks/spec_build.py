@@ -0,0 +1,71 @@
+"""Benchmark the OpenAPI spec generation time versus the number of endpoints.
+
+Compares the ``SecurityBlueprint`` with a blueprint that looks up the
+available security schemes with ``spec.to_dict()`` for every operation (the
+previous implementation).
+"""
+
+from http import HTTPStatus
+from typing import Any, Dict, Type
+
+from flask import Flask
+from flask.views import MethodView
+from flask_smorest import Api
+
+from flask_template.api.jwt import SECURITY_SCHEMES
+from flask_template.api.util import SecurityBlueprint
+
+from ._util import format_timings, timeit
+
+ENDPOINT_COUNTS = (10, 50, 100, 250, 500)
+
+
+class LegacySecurityBlueprint(SecurityBlueprint):
+    """Security blueprint serializing the whole spec for every operation."""
+
+    def _prepare_security_doc(self, doc: Dict[str, Any], doc_info, *, spec, **kwargs):
+        if doc_info.get("security"):
+            spec.to_dict().get("components").get("securitySchemes")
+        return super()._prepare_security_doc(doc, doc_info, spec=spec, **kwargs)
+
+
+def build_blueprint(blueprint_class: Type[SecurityBlueprint], count: int):
+    blp = blueprint_class("bench", __name__, url_prefix="/bench")
+    for i in range(count):
+
+        class View(MethodView):
+            @blp.response(HTTPStatus.OK)
+            @blp.require_jwt("jwt")
+            def get(self):
+                """Benchmark endpoint."""
+                return {}
+
+        View.__name__ = f"View{i}"
+        blp.route(f"/endpoint-{i}/")(View)
+    return blp
+
+
+def build_spec(blueprint_class: Type[SecurityBlueprint], count: int):
+    blp = build_blueprint(blueprint_class, count)
+    app = Flask(__name__)
+    app.config["OPENAPI_VERSION"] = "3.0.2"
+    api = Api(app, spec_kwargs={"title": "Benchmark", "version": "v1"})
+    for name, scheme in SECURITY_SCHEMES.items():
+        api.spec.components.security_scheme(name, scheme)
+    api.register_blueprint(blp)
+    api.spec.to_dict()
+
+
+def main():
+    print("Spec build time (blueprint registration + spec.to_dict()):")
+    for count in ENDPOINT_COUNTS:
+        for blueprint_class in (SecurityBlueprint, LegacySecurityBlueprint):
+            timings = timeit(lambda: build_spec(blueprint_class, count), repeat=3)
+            print(
+                f"{blueprint_class.__name__:>24} {count:4d} endpoints: "
+                + format_timings(timings)
+            )
+
+
+if __name__ == "__main__":
+    main()
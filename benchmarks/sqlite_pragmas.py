@@ -0,0 +1,108 @@
+"""Benchmark concurrent SQLite read/write throughput with and without pragmas.
+
+Every profile runs in a fresh process (the pragmas are applied by a connect
+listener of the app) against a fresh database file.
+"""
+
+from multiprocessing import get_context
+from tempfile import mkdtemp
+from threading import Event, Thread
+from time import perf_counter, sleep
+from typing import Any, Dict, Optional
+
+from flask import Flask
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from flask_template.util.config.sqlalchemy_config import SQLAchemyProductionConfig
+
+from ._util import create_benchmark_app
+
+DURATION = 5  # seconds
+READERS = 4
+WRITERS = 2
+INITIAL_ROWS = 10_000
+
+PROFILES: Dict[str, Optional[Dict[str, Any]]] = {
+    "no pragmas": None,
+    "pragma profile": SQLAchemyProductionConfig.SQLITE_PRAGMAS,
+}
+
+
+def _create_app(pragmas: Optional[Dict[str, Any]]) -> Flask:
+    from flask_template.db import DB
+    from flask_template.db.models.example import Example
+
+    db_file = f"{mkdtemp(prefix='flask_template_bench_')}/pragmas.db"
+    app = create_benchmark_app(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_file}", SQLITE_PRAGMAS=pragmas
+    )
+    with app.app_context():
+        DB.create_all()
+        DB.session.add_all(Example(name=f"example-{i}") for i in range(INITIAL_ROWS))
+        DB.session.commit()
+    return app
+
+
+def _read(app: Flask, stop: Event, counts: Dict[str, int]):
+    from flask_template.db import DB
+    from flask_template.db.models.example import Example
+
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                DB.session.scalar(select(func.count(Example.id)))
+                DB.session.scalars(select(Example).limit(20)).all()
+                counts["reads"] += 1
+            except OperationalError:
+                counts["locked errors"] += 1
+            finally:
+                DB.session.rollback()
+
+
+def _write(app: Flask, stop: Event, counts: Dict[str, int]):
+    from flask_template.db import DB
+    from flask_template.db.models.example import Example
+
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                DB.session.add(Example(name="written"))
+                DB.session.commit()
+                counts["writes"] += 1
+            except OperationalError:
+                counts["locked errors"] += 1
+                DB.session.rollback()
+
+
+def _run_profile(pragmas: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    app = _create_app(pragmas)
+    stop = Event()
+    counts = {"reads": 0, "writes": 0, "locked errors": 0}
+    threads = [Thread(target=_read, args=(app, stop, counts)) for _ in range(READERS)]
+    threads += [Thread(target=_write, args=(app, stop, counts)) for _ in range(WRITERS)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+    return {key: int(value / elapsed) for key, value in counts.items()}
+
+
+def main():
+    context = get_context("spawn")
+    print(f"{READERS} reader and {WRITERS} writer threads, {DURATION}s per profile")
+    for name, pragmas in PROFILES.items():
+        with context.Pool(1) as pool:
+            result = pool.apply(_run_profile, (pragmas,))
+        print(
+            f"{name:>15}: {result['reads']:7d} reads/s, {result['writes']:7d} writes/s, "
+            f"{result['locked errors']:5d} errors/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
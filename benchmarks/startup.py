@@ -0,0 +1,86 @@
+"""Benchmark the cold start of the app with and without lazy loading.
+
+Every run is a fresh interpreter measuring the import of the package, the app
+factory and the first and second request, and the wall time of ``flask --help``
+and a database command.
+"""
+
+import json
+import sys
+from os import environ
+from statistics import median
+from subprocess import DEVNULL, run
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import Dict, List
+
+RUNS = 5
+URL = "/api/v1/"
+
+_SCRIPT = """
+import json, sys
+from time import perf_counter
+
+start = perf_counter()
+import flask_template
+imported = perf_counter()
+
+from benchmarks._util import create_benchmark_app
+app = create_benchmark_app(LAZY_LOADING=sys.argv[1] == "lazy")
+created = perf_counter()
+
+client = app.test_client()
+assert client.get(sys.argv[2]).status_code == 200
+first = perf_counter()
+client.get(sys.argv[2])
+second = perf_counter()
+
+print(json.dumps({
+    "import": imported - start,
+    "create_app": created - imported,
+    "first request": first - created,
+    "second request": second - first,
+}))
+"""
+
+
+def _run_app(mode: str) -> Dict[str, float]:
+    start = perf_counter()
+    result = run(
+        [sys.executable, "-c", _SCRIPT, mode, URL], capture_output=True, check=True
+    )
+    timings = json.loads(result.stdout)
+    timings["process"] = perf_counter() - start
+    return timings
+
+
+def _run_cli(mode: str, *args: str) -> float:
+    factory = f"flask_template:create_app(lazy={mode == 'lazy'})"
+    start = perf_counter()
+    run(
+        [sys.executable, "-m", "flask", "--app", factory, *args],
+        stdout=DEVNULL,
+        stderr=DEVNULL,
+        check=True,
+    )
+    return perf_counter() - start
+
+
+def main():
+    environ.setdefault("INSTANCE_PATH", mkdtemp(prefix="flask_template_bench_"))
+    print(f"median of {RUNS} runs in fresh processes (ms)")
+    for mode in ("eager", "lazy"):
+        runs: List[Dict[str, float]] = [_run_app(mode) for _ in range(RUNS)]
+        timings = {key: median(r[key] for r in runs) for key in runs[0]}
+        timings["flask --help"] = median(_run_cli(mode, "--help") for _ in range(RUNS))
+        timings["flask create-db"] = median(
+            _run_cli(mode, "create-db") for _ in range(RUNS)
+        )
+        print(
+            f"{mode:>5}: "
+            + ", ".join(f"{key} {value * 1000:7.1f}" for key, value in timings.items())
+        )
+
+
+if __name__ == "__main__":
+    main()
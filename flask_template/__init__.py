@@ -1,5 +1,6 @@
 """Root module containing the flask app factory."""
 
+from functools import partial
 from os import environ, makedirs
 from pathlib import Path
 from typing import Any, Dict, Optional, cast
@@ -9,28 +10,62 @@ from logging.config import dictConfig
 from flask.app import Flask
 from flask.cli import FlaskGroup
 from flask.logging import default_handler
-from flask_cors import CORS
-
-from json import load as load_json
-from tomli import load as load_toml
 
 import click
 
 from .util.config import ProductionConfig, DebugConfig
-from . import babel
-from . import licenses
-from . import db
-from . import api
-from .api import jwt
+from .util.config.loading import config_dump, load_instance_config
+from .util.lazy_loading import AppComponent, register_components
 
 # change this to change tha flask app name and the config env var prefix
 # must not contain any spaces!
 APP_NAME = __name__
 CONFIG_ENV_VAR_PREFIX = APP_NAME.upper().replace("-", "_").replace(" ", "_")
 
-
-def create_app(test_config: Optional[Dict[str, Any]] = None):
-    """Flask app factory."""
+"""The components of the app in registration order (imported on register)."""
+APP_COMPONENTS = (
+    # adds WSGI middleware, must not be deferred
+    AppComponent(
+        "reverse_proxy_fix",
+        f"{__name__}.util.reverse_proxy_fix:apply_reverse_proxy_fix",
+        deferrable=False,
+    ),
+    AppComponent("babel", f"{__name__}.babel:register_babel"),
+    AppComponent(
+        "licenses",
+        f"{__name__}.licenses:register_licenses",
+        cli_commands=("prerender-licenses",),
+    ),
+    AppComponent("db", f"{__name__}.db:register_db", deferrable=False),
+    AppComponent(
+        "migrations",
+        f"{__name__}.db.migrations:register_migrations",
+        handles_requests=False,
+        cli_commands=("db",),
+    ),
+    AppComponent("jwt", f"{__name__}.api.jwt:register_jwt"),
+    AppComponent("api", f"{__name__}.api:register_root_api", cli_commands=("openapi",)),
+    # adds WSGI middleware answering CORS preflights, must not be deferred
+    AppComponent("cors", f"{__name__}.util.cors:register_cors", deferrable=False),
+)
+
+"""Registers the debug routes (only in debug mode).
+
+Not deferrable as the flask CLI resets the DEBUG flag after creating the app.
+"""
+DEBUG_COMPONENT = AppComponent(
+    "debug_routes",
+    f"{__name__}.util.debug_routes:register_debug_routes",
+    deferrable=False,
+)
+
+
+def create_app(test_config: Optional[Dict[str, Any]] = None, lazy: Optional[bool] = None):
+    """Flask app factory.
+
+    In lazy mode (``lazy`` or config ``LAZY_LOADING``, default: only when called
+    by the flask CLI) most components are registered on first use instead.
+    """
     instance_path: str | None = environ.get("INSTANCE_PATH", None)
     if instance_path:
         if Path(instance_path).is_file():
@@ -54,19 +89,17 @@ def create_app(test_config: Optional[Dict[str, Any]] = None):
         config.from_object(ProductionConfig)
 
     if test_config is None:
-        # load the instance config, if it exists, when not testing
-        config.from_pyfile("config.py", silent=True)
-        # also try to load json config
-        config.from_file("config.json", load=load_json, silent=True)
-        # also try to load toml config
-        config.from_file("config.toml", load=load_toml, silent=True)
-        # load config from file specified in env var
-        config.from_envvar(f"{CONFIG_ENV_VAR_PREFIX}_SETTINGS", silent=True)
-        # TODO load some config keys directly from env vars
+        # load the instance config files, if they exist, when not testing
+        # (parsed files are cached by modification time), the file specified in
+        # the settings env var and single keys from env vars
+        # (e.g. FLASK_TEMPLATE_METRICS_ENABLED)
+        load_instance_config(app, CONFIG_ENV_VAR_PREFIX)
     else:
         # load the test config if passed in
         config.from_mapping(test_config)
 
+    app.cli.add_command(config_dump)
+
     # End Loading config #################
 
     # Configure logging
@@ -92,7 +125,9 @@ def create_app(test_config: Optional[Dict[str, Any]] = None):
 
     logger: Logger = app.logger
     logger.info(
-        f"Configuration loaded. Possible config locations are: 'config.py', 'config.json', Environment: '{CONFIG_ENV_VAR_PREFIX}_SETTINGS'"
+        "Configuration loaded. Possible config locations are: 'config.py', "
+        f"'config.json', 'config.toml', Environment: '{CONFIG_ENV_VAR_PREFIX}_SETTINGS' "
+        f"and '{CONFIG_ENV_VAR_PREFIX}_<KEY>'"
     )
 
     if config.get("SECRET_KEY") == "debug_secret":
@@ -108,28 +143,17 @@ def create_app(test_config: Optional[Dict[str, Any]] = None):
 
     # Begin loading extensions and routes
 
-    babel.register_babel(app)
-
-    licenses.register_licenses(app)
-
-    db.register_db(app)
-
-    jwt.register_jwt(app)
-    api.register_root_api(app)
-
-    # allow cors requests everywhere (CONFIGURE THIS TO YOUR PROJECTS NEEDS!)
-    CORS(app)
-
+    components = APP_COMPONENTS
     if config.get("DEBUG", False):
         # Register debug routes when in debug mode
-        from .util.debug_routes import register_debug_routes
+        components = (*components, DEBUG_COMPONENT)
 
-        register_debug_routes(app)
+    register_components(app, components, lazy=lazy)
 
     return app
 
 
-@click.group(cls=FlaskGroup, create_app=create_app)
+@click.group(cls=FlaskGroup, create_app=partial(create_app, lazy=False))
 def cli():
     """Cli entry point for autodoc tooling."""
     pass
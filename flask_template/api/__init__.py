@@ -2,25 +2,30 @@
 
 from typing import Dict
 from flask import Flask
-from flask.helpers import url_for
 from flask.views import MethodView
 import marshmallow as ma
-from flask_smorest import Api, Blueprint as SmorestBlueprint
+from flask_smorest import Api
 from http import HTTPStatus
-from .util import MaBaseSchema
+from .compiled_schema import CompiledMaBaseSchema
+from .links import external_url, register_external_url_cache
+from .util import SecurityBlueprint
 from .v1_api import API_V1
 from .jwt import SECURITY_SCHEMES
+from .doc_assets import register_doc_assets
+from .prerendered_spec import register_prerendered_spec
+from .metrics import register_metrics
+from .response_cache import register_response_cache
 
 """A single API instance. All api versions should be blueprints."""
 ROOT_API = Api(spec_kwargs={"title": "API Root", "version": "v1"})
 
 
-class VersionsRootSchema(MaBaseSchema):
+class VersionsRootSchema(CompiledMaBaseSchema):
     title = ma.fields.String(required=True, allow_none=False, dump_only=True)
     v1 = ma.fields.Url(required=True, allow_none=False, dump_only=True)
 
 
-ROOT_ENDPOINT = SmorestBlueprint(
+ROOT_ENDPOINT = SecurityBlueprint(
     "api-root",
     "root",
     url_prefix="/api",
@@ -30,19 +35,27 @@ ROOT_ENDPOINT = SmorestBlueprint(
 
 @ROOT_ENDPOINT.route("/")
 class RootView(MethodView):
+    @ROOT_ENDPOINT.cache_response()
     @ROOT_ENDPOINT.response(HTTPStatus.OK, VersionsRootSchema())
     def get(self) -> Dict[str, str]:
         """Get the Root API information containing the links to all versions of this api."""
         return {
             "title": ROOT_API.spec.title,
-            "v1": url_for("api-v1.RootView", _external=True),
+            "v1": external_url("api-v1.RootView"),
         }
 
 
 def register_root_api(app: Flask):
     """Register the API with the flask app."""
+    # must be configured before the api is initialized
+    register_doc_assets(app)
+
     ROOT_API.init_app(app)
 
+    # must be registered before the first request to a cached view
+    register_response_cache(app)
+    register_external_url_cache(app)
+
     # register security schemes in doc
     for name, scheme in SECURITY_SCHEMES.items():
         ROOT_API.spec.components.security_scheme(name, scheme)
@@ -50,3 +63,9 @@ def register_root_api(app: Flask):
     # register API blueprints (only do this after the API is registered with flask!)
     ROOT_API.register_blueprint(ROOT_ENDPOINT)
     ROOT_API.register_blueprint(API_V1)
+
+    # render the spec once after all blueprints are registered
+    register_prerendered_spec(app, ROOT_API)
+
+    # record request metrics of all api views
+    register_metrics(app, ROOT_API)
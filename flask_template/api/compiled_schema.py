@@ -0,0 +1,233 @@
+"""Module containing schemas with compiled fast paths for dump and load.
+
+The compiled functions are generated from the fields of a schema instance when
+the schema is instantiated. They only support simple field types without hooks
+and fall back to the regular marshmallow implementation for everything else, so
+the results are always identical to the results of ``MaBaseSchema``.
+"""
+
+from math import isfinite
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import marshmallow as ma
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import ensure_text_type, missing
+
+from .util import MaBaseSchema
+
+# field types with simple serialization: field type -> expression template
+_DUMP_EXPRESSIONS: Dict[type, str] = {
+    ma.fields.Raw: "{v}",
+    ma.fields.Boolean: "{v}",
+    ma.fields.String: "{v} if {v} is None or type({v}) is str else _text({v})",
+    ma.fields.Url: "{v} if {v} is None or type({v}) is str else _text({v})",
+    ma.fields.Email: "{v} if {v} is None or type({v}) is str else _text({v})",
+    ma.fields.Integer: "{v} if {v} is None or type({v}) is int else int({v})",
+    ma.fields.Float: "{v} if {v} is None else float({v})",
+}
+
+# field types with simple deserialization: field type -> accepted input types
+_LOAD_TYPES: Dict[type, Tuple[type, ...]] = {
+    ma.fields.String: (str,),
+    ma.fields.Integer: (int,),
+    ma.fields.Float: (float,),
+    ma.fields.Boolean: (bool,),
+}
+
+
+def _get_value_for_key(obj: Any, key: str) -> Any:
+    # same semantics as marshmallow.utils.get_value for keys without dots
+    try:
+        return obj[key]
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return getattr(obj, key, missing)
+
+
+def _compile(name: str, source: str, namespace: Dict[str, Any]) -> Callable:
+    exec(compile(source, f"<compiled {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def compile_dumper(schema: ma.Schema) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """Generate a function dumping a single object with the schema.
+
+    Returns None if the schema is not supported.
+    """
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        return None
+    if type(schema).get_attribute is not ma.Schema.get_attribute:
+        return None
+    if schema.dict_class is not dict:
+        return None
+
+    namespace: Dict[str, Any] = {
+        "MISSING": missing,
+        "_text": ensure_text_type,
+        "_get": _get_value_for_key,
+    }
+    attr_lines: List[str] = []
+    item_lines: List[str] = []
+    for i, (attr_name, field) in enumerate(schema.dump_fields.items()):
+        expression = _DUMP_EXPRESSIONS.get(type(field))
+        if expression is None:
+            return None
+        if getattr(field, "as_string", False):
+            return None
+        source_key = field.attribute if field.attribute is not None else attr_name
+        if not isinstance(source_key, str) or "." in source_key:
+            return None
+        data_key = field.data_key if field.data_key is not None else attr_name
+        namespace[f"key{i}"] = source_key
+        namespace[f"default{i}"] = field.dump_default
+        v = f"v{i}"
+        if field.dump_default is missing:
+            store = [
+                f"    if {v} is not MISSING:",
+                f"        out[{data_key!r}] = {expression.format(v=v)}",
+            ]
+        else:
+            default = f"default{i}()" if callable(field.dump_default) else f"default{i}"
+            store = [
+                f"    if {v} is MISSING:",
+                f"        {v} = {default}",
+                f"    if {v} is not MISSING:",
+                f"        out[{data_key!r}] = {expression.format(v=v)}",
+            ]
+        attr_lines += [f"    {v} = getattr(obj, key{i}, MISSING)", *store]
+        item_lines += [f"    {v} = _get(obj, key{i})", *store]
+
+    source = "\n".join(
+        [
+            "def dump_attributes(obj):",
+            "    out = {}",
+            *attr_lines,
+            "    return out",
+            "",
+            "def dump_items(obj):",
+            "    out = {}",
+            *item_lines,
+            "    return out",
+            "",
+            "def dump(obj):",
+            "    if hasattr(obj, '__getitem__'):",
+            "        return dump_items(obj)",
+            "    return dump_attributes(obj)",
+        ]
+    )
+    return _compile("dump", source, namespace)
+
+
+def compile_loader(
+    schema: ma.Schema,
+) -> Optional[Callable[[Dict[str, Any]], Any]]:
+    """Generate a function loading a single (valid) object with the schema.
+
+    The generated function returns ``MISSING`` for any input that would need
+    conversion or may be invalid. Returns None if the schema is not supported.
+    """
+    if any(schema._hooks.values()):
+        return None
+    if schema.unknown not in (ma.RAISE, ma.EXCLUDE):
+        return None
+
+    namespace: Dict[str, Any] = {"MISSING": missing, "_isfinite": isfinite}
+    lines: List[str] = []
+    data_keys: List[str] = []
+    for i, (attr_name, field) in enumerate(schema.load_fields.items()):
+        accepted_types = _LOAD_TYPES.get(type(field))
+        if accepted_types is None or field.validators:
+            return None
+        target_key = field.attribute if field.attribute is not None else attr_name
+        if "." in target_key:
+            return None
+        data_key = field.data_key if field.data_key is not None else attr_name
+        data_keys.append(data_key)
+        namespace[f"types{i}"] = accepted_types
+        namespace[f"default{i}"] = field.load_default
+        v = f"v{i}"
+        type_check = f"type({v}) in types{i}"
+        if type(field) is ma.fields.Float and not field.allow_nan:
+            type_check += f" and _isfinite({v})"
+        lines += [
+            f"    {v} = data.get({data_key!r}, MISSING)",
+            f"    if {v} is MISSING:",
+        ]
+        if field.required:
+            lines.append("        return MISSING")
+        elif field.load_default is not missing:
+            default = f"default{i}()" if callable(field.load_default) else f"default{i}"
+            lines.append(f"        out[{target_key!r}] = {default}")
+        else:
+            lines.append("        pass")
+        lines += [
+            f"    elif {v} is None:",
+            (
+                f"        out[{target_key!r}] = None"
+                if field.allow_none
+                else "        return MISSING"
+            ),
+            f"    elif {type_check}:",
+            f"        out[{target_key!r}] = {v}",
+            "    else:",
+            "        return MISSING",
+        ]
+
+    namespace["data_keys"] = frozenset(data_keys)
+    check_unknown = (
+        ["    if not data_keys.issuperset(data):", "        return MISSING"]
+        if schema.unknown == ma.RAISE
+        else []
+    )
+    source = "\n".join(
+        [
+            "def load(data):",
+            "    if type(data) is not dict:",
+            "        return MISSING",
+            *check_unknown,
+            "    out = {}",
+            *lines,
+            "    return out",
+        ]
+    )
+    return _compile("load", source, namespace)
+
+
+class CompiledMaBaseSchema(MaBaseSchema):
+    """MaBaseSchema with compiled functions for dump and load.
+
+    Use this base schema for schemas that (de)serialize large collections.
+    Unsupported schemas and inputs transparently use the regular marshmallow
+    code.
+    """
+
+    _compiled_dump: Optional[Callable[[Any], Dict[str, Any]]] = None
+    _compiled_load: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._compiled_dump = compile_dumper(self)
+        self._compiled_load = compile_loader(self)
+
+    def dump(self, obj: Any, *, many: Optional[bool] = None):
+        dumper = self._compiled_dump
+        if dumper is None or obj is None:
+            return super().dump(obj, many=many)
+        many = self.many if many is None else bool(many)
+        if many:
+            return [dumper(item) for item in obj]
+        return dumper(obj)
+
+    def load(self, data, *, many=None, partial=None, unknown=None):
+        loader = self._compiled_load
+        if loader is not None and not partial and unknown is None:
+            many = self.many if many is None else bool(many)
+            if many:
+                if isinstance(data, list):
+                    result = [loader(item) for item in data]
+                    if all(item is not missing for item in result):
+                        return result
+            else:
+                result = loader(data)
+                if result is not missing:
+                    return result
+        return super().load(data, many=many, partial=partial, unknown=unknown)
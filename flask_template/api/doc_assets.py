@@ -0,0 +1,127 @@
+"""Module serving vendored assets of the OpenAPI documentation renderers.
+
+If ``OPENAPI_ASSETS_MODE`` is set to ``"vendored"`` the Redoc, RapiDoc and
+Swagger UI bundles are served from ``flask_template/static/openapi`` instead of
+the CDN. The asset URLs contain a hash of the asset content, so that the assets
+can be cached forever by the browser (``Cache-Control: immutable``).
+
+Use ``poetry run invoke vendor-openapi-assets`` to download the assets.
+"""
+
+from hashlib import sha256
+from mimetypes import guess_type
+from pathlib import Path
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from flask import Blueprint, Flask, abort
+
+from ..util.precompressed import PrecompressedContent, make_precompressed_response
+
+"""The folder containing the vendored assets (one subfolder per renderer)."""
+ASSETS_FOLDER = Path(__file__).parent.parent / "static" / "openapi"
+
+"""The url path below OPENAPI_URL_PREFIX the assets are served under."""
+ASSETS_URL_PATH = "_assets"
+
+
+class RendererAssets(NamedTuple):
+    config_key: str  # the config key containing the asset url
+    path_key: str  # the config key containing the path of the renderer page
+    folder: str
+    url_file: str  # the file the url points to ("" for folder urls)
+
+
+RENDERER_ASSETS = (
+    RendererAssets(
+        "OPENAPI_REDOC_URL", "OPENAPI_REDOC_PATH", "redoc", "redoc.standalone.js"
+    ),
+    RendererAssets(
+        "OPENAPI_RAPIDOC_URL", "OPENAPI_RAPIDOC_PATH", "rapidoc", "rapidoc-min.js"
+    ),
+    RendererAssets("OPENAPI_SWAGGER_UI_URL", "OPENAPI_SWAGGER_UI_PATH", "swagger-ui", ""),
+)
+
+DOC_ASSETS_BLP = Blueprint("api-doc-assets", __name__)
+
+# folder -> content hash of the folder
+_ASSET_HASHES: Dict[str, str] = {}
+# (folder, filename) -> loaded asset
+_ASSET_CACHE: Dict[Tuple[str, str], PrecompressedContent] = {}
+_ASSET_LOCK = Lock()
+
+
+def hash_asset_folder(folder: Path) -> Optional[str]:
+    """Compute a hash over all (uncompressed) files in the folder."""
+    if not folder.is_dir():
+        return None
+    digest = sha256()
+    files = sorted(
+        p for p in folder.rglob("*") if p.is_file() and p.suffix not in (".gz", ".br")
+    )
+    if not files:
+        return None
+    for path in files:
+        digest.update(path.relative_to(folder).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@DOC_ASSETS_BLP.route(f"/{ASSETS_URL_PATH}/<folder>/<content_hash>/<path:filename>")
+def doc_asset(folder: str, content_hash: str, filename: str):
+    """Serve a vendored asset with long lived caching headers."""
+    if _ASSET_HASHES.get(folder) != content_hash:
+        abort(404)
+    key = (folder, filename)
+    content = _ASSET_CACHE.get(key)
+    if content is None:
+        folder_path = (ASSETS_FOLDER / folder).resolve()
+        path = (folder_path / filename).resolve()
+        if not path.is_file() or not path.is_relative_to(folder_path):
+            abort(404)
+        with _ASSET_LOCK:
+            content = _ASSET_CACHE.get(key)
+            if content is None:
+                mimetype = guess_type(path.name)[0] or "application/octet-stream"
+                content = PrecompressedContent.from_file(path, mimetype)
+                _ASSET_CACHE[key] = content
+    return make_precompressed_response(content, max_age=31536000, immutable=True)
+
+
+def _relative_asset_url(page_path: str, folder: str, content_hash: str, file: str):
+    # relative urls keep working behind reverse proxies with path prefixes
+    if not page_path.startswith("/"):
+        page_path = "/" + page_path
+    up = "../" * (page_path.count("/") - 1)
+    return f"{up}{ASSETS_URL_PATH}/{folder}/{content_hash}/{file}"
+
+
+def register_doc_assets(app: Flask):
+    """Configure the documentation renderers to use the vendored assets.
+
+    Must be called before the API is initialized with the app.
+    """
+    if app.config.get("OPENAPI_ASSETS_MODE", "cdn") != "vendored":
+        return
+    url_prefix = app.config.get("OPENAPI_URL_PREFIX")
+    if url_prefix is None:
+        return  # no documentation pages are served
+
+    for renderer in RENDERER_ASSETS:
+        page_path = app.config.get(renderer.path_key)
+        if page_path is None:
+            continue
+        content_hash = _ASSET_HASHES.get(renderer.folder)
+        if content_hash is None:
+            content_hash = hash_asset_folder(ASSETS_FOLDER / renderer.folder)
+        if content_hash is None:
+            app.logger.warning(
+                f"No vendored assets found for '{renderer.folder}', using {app.config.get(renderer.config_key)}"
+            )
+            continue
+        _ASSET_HASHES[renderer.folder] = content_hash
+        app.config[renderer.config_key] = _relative_asset_url(
+            page_path, renderer.folder, content_hash, renderer.url_file
+        )
+
+    app.register_blueprint(DOC_ASSETS_BLP, url_prefix="/" + url_prefix.lstrip("/"))
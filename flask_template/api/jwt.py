@@ -15,6 +15,9 @@ from flask_babel import gettext
 from warnings import warn
 from functools import wraps
 
+from .revocation import REVOCATION_STORE
+from .user_cache import USER_CACHE
+
 JWT = JWTManager()
 
 """Basic JWT security scheme."""
@@ -107,9 +110,9 @@ class JWTMixin:
         """Actually prepare the documentation."""
         operation: Optional[List[Dict[str, List[Any]]]] = doc_info.get("security")
         if operation:
-            available_schemas: Dict[str, Any] = (
-                spec.to_dict().get("components").get("securitySchemes")
-            )
+            # use the registered schemes directly, spec.to_dict() is
+            # expensive for large specs
+            available_schemas: Dict[str, Any] = spec.components.security_schemes
             for scheme in operation:
                 if not scheme:
                     continue  # encountered empty schema for optional security
@@ -138,13 +141,27 @@ def load_user_identity(user: DemoUser):
     return user.username
 
 
+def load_user(identity: str) -> Optional[DemoUser]:
+    # load the actual user object from the user identity here (e.g. from the
+    # database), send the USER_CHANGED signal if a user is updated to evict it
+    # from the cache
+    return DemoUser(identity)
+
+
 @JWT.user_lookup_loader
 def loadUserObject(jwt_header: dict, jwt_payload: dict):
-    # load the actual user object from the user identity here
     identity: Optional[str] = jwt_payload.get("sub")
     if not identity:
         raise KeyError("Could not find user Identity!")
-    return DemoUser(identity)
+    return USER_CACHE.get_or_load(identity, load_user)
+
+
+@JWT.token_in_blocklist_loader
+def is_token_revoked(jwt_header: dict, jwt_payload: dict) -> bool:
+    jti: Optional[str] = jwt_payload.get("jti")
+    if not jti:
+        return False
+    return REVOCATION_STORE.is_revoked(jti)
 
 
 # JWT errors
@@ -200,3 +217,5 @@ def on_revoked_token(jwt_header: dict, jwt_payload: dict):
 def register_jwt(app: Flask):
     """Register jwt manager with flask app."""
     JWT.init_app(app)
+    USER_CACHE.init_app(app)
+    REVOCATION_STORE.init_app(app)
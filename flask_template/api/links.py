@@ -0,0 +1,44 @@
+"""Module containing memoized external urls for hypermedia links.
+
+``external_url`` builds the external url of an endpoint without arguments once
+per url root (scheme, host and script root of the request after the reverse
+proxy fix was applied) and caches it in a bounded LRU cache, as the host is
+controlled by the client.
+"""
+
+from typing import Any, Optional
+
+from flask import Flask, current_app, has_request_context, request, url_for
+
+from ..util.cache import MISSING, LRUCache
+
+EXTENSION_NAME = "external_urls"
+
+
+def external_url(endpoint: str) -> str:
+    """Get the external url of an endpoint without arguments.
+
+    Same as ``url_for(endpoint, _external=True)`` but memoized per url root.
+    """
+    app: Flask = current_app._get_current_object()  # type: ignore
+    cache: Optional[LRUCache[Any, str]] = app.extensions.get(EXTENSION_NAME)
+    if cache is None or not has_request_context():
+        return url_for(endpoint, _external=True)
+    req = request._get_current_object()  # type: ignore
+    # the url root of the request (after ProxyFix rewrote the environ)
+    key = (endpoint, req.scheme, req.host, req.script_root)
+    url = cache.get(key, MISSING)
+    if url is MISSING:
+        url = url_for(endpoint, _external=True)
+        cache.set(key, url)
+    return url
+
+
+def register_external_url_cache(app: Flask):
+    """Memoize the urls of ``external_url``.
+
+    The cache size is configured in ``EXTERNAL_URL_CACHE_SIZE`` (0 to disable).
+    """
+    size = app.config.get("EXTERNAL_URL_CACHE_SIZE", 1024)
+    if size > 0:
+        app.extensions[EXTENSION_NAME] = LRUCache(maxsize=size)
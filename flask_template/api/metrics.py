@@ -0,0 +1,253 @@
+"""Module containing per endpoint request metrics in the Prometheus text format.
+
+Every view of the ``ROOT_API`` blueprints is wrapped to record a fixed bucket
+latency histogram, the response status codes and the number of requests in
+flight. The metrics (and the connection pool metrics of the database engines
+and the response cache statistics) are served on ``METRICS_PATH``. The latency
+is measured from the start to the end of the view function (including
+serialization, excluding the streaming of streamed responses).
+
+The metrics endpoint is not authenticated. ``METRICS_ENABLED`` is off in the
+production config, restrict the access to ``METRICS_PATH`` (e.g. in the reverse
+proxy) before enabling it.
+"""
+
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from flask import Flask, current_app, request
+from flask_smorest import Api
+from werkzeug.exceptions import HTTPException
+
+from ..db.connection import get_connection_setup_stats
+from ..db.pool import get_pool_stats
+from .response_cache import RESPONSE_CACHE
+
+EXTENSION_NAME = "metrics"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+"""The default upper bounds (in seconds) of the latency histogram buckets."""
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointMetrics:
+    """Latency histogram, status codes and in flight requests of an endpoint."""
+
+    __slots__ = (
+        "buckets",
+        "bucket_counts",
+        "sum",
+        "count",
+        "statuses",
+        "in_flight",
+        "lock",
+    )
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.statuses: Dict[Tuple[str, int], int] = {}  # (method, status) -> count
+        self.in_flight = 0
+        self.lock = Lock()
+
+    def start(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def observe(self, method: str, status: int, seconds: float):
+        index = bisect_left(self.buckets, seconds)
+        key = (method, status)
+        with self.lock:
+            self.in_flight -= 1
+            self.bucket_counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+
+
+class RequestMetrics:
+    """The request metrics of a single flask app."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+
+    def wrap_view(self, endpoint: str, view: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap the view function of the endpoint to record its metrics."""
+        metrics = self.endpoints.setdefault(endpoint, EndpointMetrics(self.buckets))
+
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any):
+            metrics.start()
+            status = 500
+            start = perf_counter()
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+                status = response.status_code
+                return response
+            except HTTPException as err:
+                status = err.code or 500
+                raise
+            finally:
+                metrics.observe(request.method, status, perf_counter() - start)
+
+        return wrapper
+
+    def render(self) -> Iterator[str]:
+        """Render the request metrics in the Prometheus text format."""
+        endpoints = sorted(self.endpoints.items())
+        snapshots: List[Tuple[str, List[int], float, int, Dict, int]] = []
+        for endpoint, metrics in endpoints:
+            with metrics.lock:
+                snapshots.append(
+                    (
+                        _escape(endpoint),
+                        list(metrics.bucket_counts),
+                        metrics.sum,
+                        metrics.count,
+                        dict(metrics.statuses),
+                        metrics.in_flight,
+                    )
+                )
+
+        yield "# HELP http_request_duration_seconds Latency of the API views.\n"
+        yield "# TYPE http_request_duration_seconds histogram\n"
+        for endpoint, bucket_counts, total, count, _, _ in snapshots:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), bucket_counts):
+                cumulative += bucket_count
+                yield (
+                    f'http_request_duration_seconds_bucket{{endpoint="{endpoint}",'
+                    f'le="{bound}"}} {cumulative}\n'
+                )
+            yield f'http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {total}\n'
+            yield f'http_request_duration_seconds_count{{endpoint="{endpoint}"}} {count}\n'
+
+        yield "# HELP http_requests_total Responses of the API views by status code.\n"
+        yield "# TYPE http_requests_total counter\n"
+        for endpoint, _, _, _, statuses, _ in snapshots:
+            for (method, status), count in sorted(statuses.items()):
+                yield (
+                    f'http_requests_total{{endpoint="{endpoint}",method="{method}",'
+                    f'status="{status}"}} {count}\n'
+                )
+
+        yield "# HELP http_requests_in_flight Requests currently handled by the API views.\n"
+        yield "# TYPE http_requests_in_flight gauge\n"
+        for endpoint, _, _, _, _, in_flight in snapshots:
+            yield f'http_requests_in_flight{{endpoint="{endpoint}"}} {in_flight}\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# (metric name, type, help, key in the pool stats)
+_POOL_METRICS = (
+    ("db_pool_size", "gauge", "Connections kept in the pool.", "size"),
+    ("db_pool_checked_out", "gauge", "Connections currently in use.", "checkedOut"),
+    ("db_pool_overflow", "gauge", "Connections above the pool size.", "overflow"),
+    ("db_pool_checkouts_total", "counter", "Connection checkouts.", "checkouts"),
+    ("db_pool_timeouts_total", "counter", "Checkouts that timed out.", "timeouts"),
+    (
+        "db_pool_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a connection.",
+        "waitTotalSeconds",
+    ),
+)
+
+
+def render_db_metrics(app: Flask) -> Iterator[str]:
+    """Render the connection pool and connection setup metrics."""
+    pools = sorted(get_pool_stats(app).items())
+    for name, metric_type, description, key in _POOL_METRICS:
+        values = [(bind, stats[key]) for bind, stats in pools if key in stats]
+        if not values:
+            continue
+        yield f"# HELP {name} {description}\n# TYPE {name} {metric_type}\n"
+        for bind, value in values:
+            yield f'{name}{{bind="{_escape(bind)}"}} {value}\n'
+    setup = get_connection_setup_stats(app)
+    yield "# HELP db_connections_total New database connections.\n"
+    yield "# TYPE db_connections_total counter\n"
+    yield f"db_connections_total {setup['count']}\n"
+    yield "# HELP db_connection_setup_seconds_total Time spent setting up connections.\n"
+    yield "# TYPE db_connection_setup_seconds_total counter\n"
+    yield f"db_connection_setup_seconds_total {setup['totalSeconds']}\n"
+
+
+# (metric name, type, help, key in the response cache stats)
+_RESPONSE_CACHE_METRICS = (
+    ("response_cache_size", "gauge", "Responses currently cached.", "size"),
+    ("response_cache_hits_total", "counter", "Responses served from the cache.", "hits"),
+    (
+        "response_cache_misses_total",
+        "counter",
+        "Cache lookups that called the view.",
+        "misses",
+    ),
+    (
+        "response_cache_not_modified_total",
+        "counter",
+        "Conditional requests answered with 304.",
+        "notModified",
+    ),
+    ("response_cache_evictions_total", "counter", "Evicted responses.", "evictions"),
+    (
+        "response_cache_invalidations_total",
+        "counter",
+        "Responses removed by tag or identity.",
+        "invalidations",
+    ),
+)
+
+
+def render_response_cache_metrics(app: Flask) -> Iterator[str]:
+    """Render the response cache statistics (if the cache is enabled)."""
+    stats = RESPONSE_CACHE.stats(app=app)
+    if not stats["enabled"]:
+        return
+    for name, metric_type, description, key in _RESPONSE_CACHE_METRICS:
+        yield f"# HELP {name} {description}\n# TYPE {name} {metric_type}\n"
+        yield f"{name} {stats[key]}\n"
+
+
+def register_metrics(app: Flask, api: Api):
+    """Record metrics of all api views and serve them on ``METRICS_PATH``.
+
+    Must be called after all blueprints are registered with the api.
+    """
+    if not app.config.get("METRICS_ENABLED", False):
+        return
+    metrics = RequestMetrics(app.config.get("METRICS_BUCKETS", DEFAULT_BUCKETS))
+    app.extensions[EXTENSION_NAME] = metrics
+
+    blp_name_to_api: Dict[str, Api] = app.extensions["flask-smorest"]["blp_name_to_api"]
+    blueprint_names = {
+        name for name, blp_api in blp_name_to_api.items() if blp_api is api
+    }
+    for endpoint, view in list(app.view_functions.items()):
+        if endpoint.split(".", 1)[0] in blueprint_names:
+            app.view_functions[endpoint] = metrics.wrap_view(endpoint, view)
+
+    path = app.config.get("METRICS_PATH", "/metrics")
+    if path:
+
+        def metrics_view():
+            body = "".join(
+                (
+                    *metrics.render(),
+                    *render_db_metrics(app),
+                    *render_response_cache_metrics(app),
+                )
+            )
+            return current_app.response_class(body, content_type=PROMETHEUS_CONTENT_TYPE)
+
+        app.add_url_rule(path, "metrics", metrics_view)
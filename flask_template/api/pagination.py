@@ -0,0 +1,207 @@
+"""Module containing keyset (cursor) pagination for SQLAlchemy statements.
+
+In contrast to offset pagination, keyset pagination filters the query by the
+sort key of the last item of the previous page. With an index on the sort key
+the cost of fetching a page does not depend on how deep the page is.
+"""
+
+import http
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import wraps
+from json import dumps, loads
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import marshmallow as ma
+from flask import current_app, request, url_for
+from flask_smorest import abort
+from flask_smorest.utils import unpack_tuple_response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+from werkzeug.datastructures import Headers
+
+from ..db import DB
+
+RT = TypeVar("RT")
+
+# the json types of sort key values (objects, arrays and null are not
+# comparable)
+CURSOR_VALUE_TYPES = (str, int, float, bool)
+
+
+@dataclass
+class CursorPaginationParameters:
+    """Holds the parsed cursor pagination arguments."""
+
+    cursor: Optional[List[Any]]
+    page_size: int
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key values of an item into an opaque cursor."""
+    data = dumps(list(values), separators=(",", ":"), default=str).encode()
+    return urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor created by ``encode_cursor``."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = loads(urlsafe_b64decode(padded.encode()))
+    if not isinstance(values, list) or not all(
+        isinstance(value, CURSOR_VALUE_TYPES) for value in values
+    ):
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+def _cursor_pagination_parameters_schema_factory(def_page_size, def_max_page_size):
+    """Generate a CursorPaginationParametersSchema"""
+
+    class CursorPaginationParametersSchema(ma.Schema):
+        """Deserializes cursor pagination params"""
+
+        class Meta:
+            unknown = ma.EXCLUDE
+
+        cursor = ma.fields.String(
+            load_default=None,
+            metadata={"description": "The opaque cursor of the page to load."},
+        )
+        page_size = ma.fields.Integer(
+            load_default=def_page_size,
+            validate=ma.validate.Range(min=1, max=def_max_page_size),
+        )
+
+        @ma.validates("cursor")
+        def validate_cursor(self, value: Optional[str], **kwargs):
+            if value is None:
+                return
+            try:
+                decode_cursor(value)
+            except ValueError as err:  # includes json and base64 errors
+                raise ma.ValidationError("Invalid cursor.") from err
+
+        @ma.post_load
+        def make_paginator(self, data, **kwargs):
+            cursor = data["cursor"]
+            return CursorPaginationParameters(
+                cursor=decode_cursor(cursor) if cursor else None,
+                page_size=data["page_size"],
+            )
+
+    return CursorPaginationParametersSchema
+
+
+"""Documentation of the Link header set by cursor paginated endpoints."""
+LINK_HEADER_DOC = {
+    "description": 'Links to the first and the next page (rel="first", rel="next").',
+    "schema": {"type": "string"},
+}
+
+
+class CursorPaginationMixin:
+    """Extend Blueprint to add keyset (cursor) pagination."""
+
+    def cursor_paginate(
+        self,
+        *order_by: InstrumentedAttribute,
+        page_size: int = 20,
+        max_page_size: int = 100,
+    ) -> Callable[[Callable[..., RT]], Callable[..., Any]]:
+        """Decorator paginating the select statement returned by the view.
+
+        The statement is ordered (ascending) by the given columns, which must
+        form a unique key (e.g. the primary key of the model). The items of the
+        requested page are returned to the next decorator (e.g. ``response``)
+        and links to the first and the next page are set in the ``Link`` header.
+
+        Args:
+            *order_by (InstrumentedAttribute): the model columns used as sort
+                key
+            page_size (int, optional): the default page size. Defaults to 20.
+            max_page_size (int, optional): the maximum page size. Defaults to
+                100.
+        """
+        if not order_by:
+            raise ValueError("At least one column to order by is required.")
+        params_schema = _cursor_pagination_parameters_schema_factory(
+            page_size, max_page_size
+        )
+        error_status_code = self.PAGINATION_ARGUMENTS_PARSER.DEFAULT_VALIDATION_STATUS
+        key = tuple_(*order_by) if len(order_by) > 1 else order_by[0]
+
+        def decorator(func: Callable[..., RT]) -> Callable[..., Any]:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any):
+                params: CursorPaginationParameters = (
+                    self.PAGINATION_ARGUMENTS_PARSER.parse(
+                        params_schema, request, location="query"
+                    )
+                )
+                statement, status, headers = unpack_tuple_response(
+                    current_app.ensure_sync(func)(*args, **kwargs)
+                )
+                if not isinstance(statement, Select):
+                    raise TypeError("Cursor paginated views must return a select.")
+                if params.cursor is not None:
+                    if len(params.cursor) != len(order_by):
+                        abort(error_status_code, message="Invalid cursor.")
+                    if len(order_by) > 1:
+                        statement = statement.where(key > tuple_(*params.cursor))
+                    else:
+                        statement = statement.where(key > params.cursor[0])
+                statement = statement.order_by(*order_by).limit(params.page_size + 1)
+                items = DB.session.scalars(statement).all()
+
+                next_cursor: Optional[str] = None
+                if len(items) > params.page_size:
+                    items = items[: params.page_size]
+                    next_cursor = encode_cursor(
+                        [getattr(items[-1], column.key) for column in order_by]
+                    )
+                headers = Headers(headers)
+                headers.add("Link", self._make_cursor_links(params, next_cursor))
+                return items, status, headers
+
+            wrapper._apidoc = deepcopy(getattr(wrapper, "_apidoc", {}))
+            wrapper._apidoc["cursor_pagination"] = {
+                "parameters": {"in": "query", "schema": params_schema},
+                "response": {
+                    error_status_code: http.HTTPStatus(error_status_code).name,
+                },
+            }
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def _make_cursor_links(
+        params: CursorPaginationParameters, next_cursor: Optional[str]
+    ) -> str:
+        args: Dict[str, Any] = request.args.to_dict()
+        args.pop("cursor", None)
+        args["page_size"] = params.page_size
+        endpoint = request.endpoint
+        view_args = request.view_args or {}
+        links = [
+            f'<{url_for(endpoint, **view_args, **args, _external=True)}>; rel="first"'
+        ]
+        if next_cursor is not None:
+            next_url = url_for(
+                endpoint, **view_args, **args, cursor=next_cursor, _external=True
+            )
+            links.append(f'<{next_url}>; rel="next"')
+        return ", ".join(links)
+
+    def _prepare_cursor_pagination_doc(self, doc, doc_info, **kwargs):
+        operation = doc_info.get("cursor_pagination")
+        if operation:
+            doc.setdefault("parameters", []).append(operation["parameters"])
+            doc.setdefault("responses", {}).update(operation["response"])
+            for success_status_code in doc_info.get("success_status_codes", []):
+                doc["responses"][success_status_code].setdefault("headers", {})[
+                    "Link"
+                ] = LINK_HEADER_DOC
+        return doc
@@ -0,0 +1,39 @@
+"""Module serving the OpenAPI spec from a buffer rendered once at startup."""
+
+from flask import Flask, json
+from flask_smorest import Api
+
+from ..util.precompressed import PrecompressedContent, make_precompressed_response
+
+
+def render_spec(api: Api) -> PrecompressedContent:
+    """Render the spec of the api into a compressed buffer.
+
+    Requires an app context.
+    """
+    # same serialization as flask-smorest uses for the spec
+    spec = json.dumps(api.spec.to_dict(), indent=2, sort_keys=False)
+    return PrecompressedContent.from_bytes(spec.encode(), "application/json")
+
+
+def register_prerendered_spec(app: Flask, api: Api):
+    """Replace the openapi json view of the api with a prerendered spec view.
+
+    Must be called after all blueprints are registered with the api, as the spec
+    is only rendered once!
+    """
+    if not app.config.get("OPENAPI_JSON_PRERENDER", True):
+        return
+    endpoint = f"{api._make_doc_blueprint_name()}.openapi_json"
+    if endpoint not in app.view_functions:
+        return  # OPENAPI_URL_PREFIX is None and the spec is not served
+
+    with app.app_context():
+        content = render_spec(api)
+
+    def openapi_json():
+        """Serve prerendered JSON spec file"""
+        return make_precompressed_response(content)
+
+    app.view_functions[endpoint] = openapi_json
+    app.logger.info(f"Prerendered OpenAPI spec ({len(content.data)} bytes).")
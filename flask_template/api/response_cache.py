@@ -0,0 +1,308 @@
+"""Module containing the cache for serialized responses of idempotent API views.
+
+Views decorated with ``cache_response`` are only executed on a cache miss. The
+serialized response is cached per endpoint, view and query arguments, url root,
+locale and (optionally) JWT identity in a bounded LRU cache with a time to
+live. Every cached response gets an ETag, so conditional requests with
+``If-None-Match`` are answered with ``304 Not Modified``. Cached responses can
+be invalidated by tags, responses cached per identity are invalidated by the
+``USER_CHANGED`` and ``TOKEN_REVOKED`` signals.
+"""
+
+from copy import deepcopy
+from dataclasses import dataclass, field
+from functools import wraps
+from hashlib import sha256
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple, TypeVar
+
+from flask import Flask, Response, current_app, request
+from flask.typing import ResponseReturnValue
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from ..babel import select_locale
+from ..util.cache import MISSING, LRUCache
+from .signals import TOKEN_REVOKED, USER_CHANGED
+
+RT = TypeVar("RT")
+
+CACHEABLE_METHODS = frozenset(("GET", "HEAD"))
+
+# headers that must not be replayed from the cache
+_UNCACHED_HEADERS = frozenset(("content-length", "etag", "set-cookie", "date"))
+
+NOT_MODIFIED_RESPONSE_DOC = {"description": "Not Modified"}
+ETAG_HEADER_DOC = {
+    "description": "The entity tag of the response (use it in If-None-Match).",
+    "schema": {"type": "string"},
+}
+IF_NONE_MATCH_PARAMETER_DOC = {
+    "in": "header",
+    "name": "If-None-Match",
+    "required": False,
+    "description": "Answer with 304 Not Modified if the ETag matches.",
+    "schema": {"type": "string"},
+}
+
+
+def identity_tag(identity: Any) -> str:
+    """The tag of all responses cached for the JWT identity."""
+    return f"identity:{identity}"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialized response with its ETag and invalidation tags."""
+
+    body: bytes
+    status: int
+    headers: Tuple[Tuple[str, str], ...]
+    etag: str
+    tags: FrozenSet[str]
+
+    @classmethod
+    def from_response(cls, response: Response, tags: FrozenSet[str]) -> "CachedResponse":
+        body = response.get_data()
+        etag, _ = response.get_etag()
+        return cls(
+            body=body,
+            status=response.status_code,
+            headers=tuple(
+                (k, v) for k, v in response.headers if k.lower() not in _UNCACHED_HEADERS
+            ),
+            etag=etag or sha256(body).hexdigest()[:32],
+            tags=tags,
+        )
+
+    def to_response(self, app: Flask, not_modified: bool = False) -> Response:
+        if not_modified:
+            # a 304 response must repeat the Vary header (but not the content
+            # headers)
+            headers = [(k, v) for k, v in self.headers if k.lower() == "vary"]
+            response = app.response_class(status=304, headers=headers)
+        else:
+            response = app.response_class(
+                self.body, status=self.status, headers=self.headers
+            )
+        response.set_etag(self.etag)
+        return response
+
+
+@dataclass
+class ResponseCacheState:
+    """The response cache state of a single flask app."""
+
+    enabled: bool
+    cache: LRUCache[Tuple[Any, ...], CachedResponse]
+    not_modified: int = 0
+    stats_by_endpoint: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record(self, endpoint: Optional[str], result: str):
+        counts = self.stats_by_endpoint.setdefault(
+            endpoint or "", {"hits": 0, "misses": 0}
+        )
+        counts[result] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = self.cache.stats
+        return {
+            "enabled": self.enabled,
+            "size": len(self.cache),
+            "maxsize": self.cache.maxsize,
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "notModified": self.not_modified,
+            "evictions": stats.evictions,
+            "invalidations": stats.invalidations,
+            "hitRatio": stats.hit_ratio,
+            "endpoints": {k: dict(v) for k, v in self.stats_by_endpoint.items()},
+        }
+
+
+class ResponseCache:
+    """Cache for the serialized responses of ``cache_response`` views."""
+
+    extension_name = "response_cache"
+
+    def init_app(self, app: Flask):
+        """Configure the response cache for the app.
+
+        Config keys:
+            RESPONSE_CACHE_ENABLED: enable or disable the cache (default: True)
+            RESPONSE_CACHE_SIZE: maximum number of responses cached per process
+                (default: 1024)
+            RESPONSE_CACHE_TTL: default seconds a response is cached, 0 for no
+                expiry (default: 300)
+        """
+        config = app.config
+        app.extensions[self.extension_name] = ResponseCacheState(
+            enabled=config.get("RESPONSE_CACHE_ENABLED", True),
+            cache=LRUCache(
+                maxsize=config.get("RESPONSE_CACHE_SIZE", 1024),
+                ttl=config.get("RESPONSE_CACHE_TTL", 300),
+            ),
+        )
+        USER_CHANGED.connect(self._on_user_changed, sender=app, weak=False)
+        TOKEN_REVOKED.connect(self._on_user_changed, sender=app, weak=False)
+
+    def _on_user_changed(self, app: Flask, identity: Optional[str] = None, **kwargs):
+        if identity is not None:
+            self.invalidate(identity_tag(identity), app=app)
+
+    def _state(self, app: Optional[Flask]) -> Optional[ResponseCacheState]:
+        return (app or current_app).extensions.get(self.extension_name)
+
+    def invalidate(self, *tags: str, app: Optional[Flask] = None) -> int:
+        """Remove all cached responses with any of the tags.
+
+        Returns the number of removed responses.
+        """
+        state = self._state(app)
+        if state is None:
+            return 0
+        tag_set = frozenset(tags)
+        return state.cache.delete_where(
+            lambda _, cached: not tag_set.isdisjoint(cached.tags)
+        )
+
+    def clear(self, *, app: Optional[Flask] = None):
+        """Remove all cached responses."""
+        state = self._state(app)
+        if state is not None:
+            state.cache.clear()
+
+    def stats(self, *, app: Optional[Flask] = None) -> Dict[str, Any]:
+        """Get the cache statistics."""
+        state = self._state(app)
+        return state.as_dict() if state is not None else {"enabled": False}
+
+    def handle(
+        self,
+        view: Callable[[], ResponseReturnValue],
+        view_kwargs: Dict[str, Any],
+        *,
+        ttl: Optional[float],
+        tags: Iterable[str],
+        per_identity: bool,
+    ) -> Response:
+        """Serve the response of the request from the cache or call the view."""
+        app: Flask = current_app._get_current_object()  # type: ignore
+        req = request._get_current_object()  # type: ignore
+        state: Optional[ResponseCacheState] = app.extensions.get(self.extension_name)
+        if state is None or not state.enabled or req.method not in CACHEABLE_METHODS:
+            return app.make_response(view())
+        key: Tuple[Any, ...] = (
+            req.endpoint,
+            # urls built with _external=True depend on the url root
+            req.scheme,
+            req.host,
+            req.script_root,
+            tuple(sorted(view_kwargs.items())),
+            tuple(sorted(req.args.items(multi=True))),
+            str(select_locale() or ""),
+        )
+        identity = None
+        if per_identity:
+            # the view decorated with require_jwt is only called on a cache miss
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+            key = (*key, identity)
+        cached: CachedResponse = state.cache.get(key, MISSING)
+        if cached is MISSING:
+            state.record(req.endpoint, "misses")
+            response = app.make_response(view())
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            if "Set-Cookie" in response.headers:
+                return response
+            response.vary.add("Accept-Language")
+            if per_identity:
+                response.vary.add("Authorization")
+            tag_set = frozenset(tag.format(**view_kwargs) for tag in tags)
+            if identity is not None:
+                tag_set |= {identity_tag(identity)}
+            cached = CachedResponse.from_response(response, tag_set)
+            state.cache.set(key, cached, ttl=ttl)
+        else:
+            state.record(req.endpoint, "hits")
+        etags = req.if_none_match
+        if etags and etags.contains(cached.etag):
+            state.not_modified += 1
+            return cached.to_response(app, not_modified=True)
+        return cached.to_response(app)
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+class ResponseCacheMixin:
+    """Extend Blueprint to cache the responses of idempotent views."""
+
+    def cache_response(
+        self,
+        *,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        per_identity: bool = False,
+    ) -> Callable[[Callable[..., RT]], Callable[..., ResponseReturnValue]]:
+        """Decorator caching the serialized GET responses of the view.
+
+        Must be placed above the ``response`` decorator. Only ``200`` responses
+        without cookies are cached. Views secured with ``require_jwt`` (placed
+        below this decorator) must be cached ``per_identity``, otherwise a cache
+        hit would skip the authentication.
+
+        Args:
+            ttl (Optional[float], optional): seconds the response is cached.
+                Defaults to None (``RESPONSE_CACHE_TTL``).
+            tags (Iterable[str], optional): tags to invalidate the responses
+                with ``RESPONSE_CACHE.invalidate``, formatted with the view
+                arguments (e.g. ``"example:{example_id}"``). Defaults to ().
+            per_identity (bool, optional): cache the response per JWT identity
+                (the access token is verified before the cache lookup).
+                Defaults to False.
+
+        Raises:
+            ValueError: if the view is secured but not cached ``per_identity``
+        """
+        tags = tuple(tags)
+
+        def decorator(func: Callable[..., RT]) -> Callable[..., ResponseReturnValue]:
+            if getattr(func, "_apidoc", {}).get("security") and not per_identity:
+                raise ValueError(
+                    f"The view '{func.__qualname__}' requires a JWT and must be "
+                    "cached with per_identity=True."
+                )
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> ResponseReturnValue:
+                return RESPONSE_CACHE.handle(
+                    lambda: func(*args, **kwargs),  # type: ignore
+                    kwargs,
+                    ttl=ttl,
+                    tags=tags,
+                    per_identity=per_identity,
+                )
+
+            # Store doc in wrapper function
+            # The deepcopy avoids modifying the wrapped function doc
+            wrapper._apidoc = deepcopy(getattr(func, "_apidoc", {}))
+            wrapper._apidoc["response_cache"] = True
+            return wrapper
+
+        return decorator
+
+    def _prepare_response_cache_doc(self, doc, doc_info, **kwargs):
+        if doc_info.get("response_cache"):
+            doc.setdefault("parameters", []).append(IF_NONE_MATCH_PARAMETER_DOC)
+            responses = doc.setdefault("responses", {})
+            for success_status_code in doc_info.get("success_status_codes", []):
+                responses[success_status_code].setdefault("headers", {})[
+                    "ETag"
+                ] = ETAG_HEADER_DOC
+            responses["304"] = NOT_MODIFIED_RESPONSE_DOC
+        return doc
+
+
+def register_response_cache(app: Flask):
+    """Register the response cache with the flask app."""
+    RESPONSE_CACHE.init_app(app)
@@ -0,0 +1,201 @@
+"""Module containing the store for revoked JWT tokens.
+
+Revoked tokens are persisted in the ``RevokedToken`` table. Every process keeps
+a bloom filter of all revoked token ids, so that the check of a token that was
+not revoked (the common case) does not need a database round trip. Positive
+bloom filter matches are confirmed with the database and the result is kept in
+a small LRU cache.
+
+The bloom filter is periodically synchronized with the database to pick up
+tokens revoked by other processes and periodically rebuilt without the expired
+tokens. Requests only read from the database, expired tokens are deleted with
+``flask compact-revoked-tokens`` (e.g. in a cron job).
+"""
+
+from dataclasses import dataclass, field
+from threading import RLock
+from time import monotonic, time
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import or_, select
+
+from ..db import DB
+from ..db.models.revoked_token import RevokedToken
+from ..util.bloom import BloomFilter
+from ..util.cache import MISSING, LRUCache
+from .signals import TOKEN_REVOKED
+
+# tokens revoked shortly before the last sync are fetched again on the next sync
+# to tolerate clock skew and long running transactions of other processes
+_SYNC_OVERLAP = 60  # seconds
+
+
+@dataclass
+class RevocationState:
+    """The revocation state of a single flask app."""
+
+    capacity: int
+    error_rate: float
+    refresh_interval: float
+    rebuild_interval: float
+    lock: RLock = field(default_factory=RLock)
+    bloom: Optional[BloomFilter] = None
+    confirmed: LRUCache[str, bool] = field(default_factory=LRUCache)
+    last_revoked_at: int = 0
+    last_refresh: float = 0
+    last_rebuild: float = 0
+    db_lookups: int = 0
+    bloom_rejects: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "bloomItems": self.bloom.count if self.bloom else 0,
+            "bloomCapacity": self.bloom.capacity if self.bloom else self.capacity,
+            "bloomRejects": self.bloom_rejects,
+            "dbLookups": self.db_lookups,
+            "cacheHits": self.confirmed.stats.hits,
+        }
+
+
+class TokenRevocationStore:
+    """Store for revoked tokens with a bloom filter prefilter."""
+
+    extension_name = "token_revocation"
+
+    def init_app(self, app: Flask):
+        """Configure the revocation store for the app.
+
+        Config keys:
+            JWT_REVOCATION_BLOOM_CAPACITY: expected number of revoked (not yet
+                expired) tokens (default: 100000)
+            JWT_REVOCATION_BLOOM_ERROR_RATE: false positive rate of the bloom
+                filter (default: 0.001)
+            JWT_REVOCATION_CACHE_SIZE: number of confirmed lookups to cache
+                (default: 4096)
+            JWT_REVOCATION_REFRESH_INTERVAL: seconds between syncs with the
+                database (default: 10)
+            JWT_REVOCATION_REBUILD_INTERVAL: seconds between rebuilds of the
+                bloom filter without expired tokens, 0 to disable
+                (default: 3600)
+        """
+        config = app.config
+        app.extensions[self.extension_name] = RevocationState(
+            capacity=config.get("JWT_REVOCATION_BLOOM_CAPACITY", 100_000),
+            error_rate=config.get("JWT_REVOCATION_BLOOM_ERROR_RATE", 0.001),
+            refresh_interval=config.get("JWT_REVOCATION_REFRESH_INTERVAL", 10),
+            rebuild_interval=config.get("JWT_REVOCATION_REBUILD_INTERVAL", 3600),
+            confirmed=LRUCache(maxsize=config.get("JWT_REVOCATION_CACHE_SIZE", 4096)),
+        )
+
+    def _state(self, app: Optional[Flask] = None) -> RevocationState:
+        return (app or current_app).extensions[self.extension_name]
+
+    def revoke(self, jwt_payload: Dict[str, Any], *, commit: bool = True):
+        """Revoke the token with the given (decoded) payload."""
+        jti: str = jwt_payload["jti"]
+        identity = jwt_payload.get("sub")
+        DB.session.merge(
+            RevokedToken(
+                jti=jti,
+                token_type=jwt_payload.get("type", "access"),
+                identity=None if identity is None else str(identity),
+                revoked_at=int(time()),
+                expires_at=jwt_payload.get("exp"),
+            )
+        )
+        if commit:
+            DB.session.commit()
+        state = self._state()
+        with state.lock:
+            if state.bloom is not None:
+                state.bloom.add(jti)
+            state.confirmed.set(jti, True)
+        TOKEN_REVOKED.send(current_app._get_current_object(), identity=identity, jti=jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check if the token with the given jti was revoked."""
+        state = self._state()
+        if self._refresh_due(state):
+            with state.lock:
+                # requests waiting for the lock do not refresh again
+                if self._refresh_due(state):
+                    self.refresh()
+        bloom = state.bloom
+        if bloom is not None and jti not in bloom:
+            state.bloom_rejects += 1
+            return False
+        revoked = state.confirmed.get(jti, MISSING)
+        if revoked is MISSING:
+            state.db_lookups += 1
+            revoked = DB.session.get(RevokedToken, jti) is not None
+            state.confirmed.set(jti, revoked)
+        return revoked
+
+    @staticmethod
+    def _refresh_due(state: RevocationState) -> bool:
+        return (
+            state.bloom is None
+            or monotonic() - state.last_refresh > state.refresh_interval
+        )
+
+    def refresh(self, *, force_rebuild: bool = False):
+        """Synchronize the bloom filter with the database.
+
+        Rebuilds the bloom filter without the expired tokens if the rebuild
+        interval has passed or the bloom filter holds more items than its
+        capacity. Only reads from the database.
+        """
+        state = self._state()
+        with state.lock:
+            now = monotonic()
+            rebuild = bool(state.rebuild_interval) and (
+                now - state.last_rebuild > state.rebuild_interval
+            )
+            bloom = state.bloom
+            if force_rebuild or rebuild or bloom is None or bloom.is_saturated:
+                self._rebuild(state)
+                state.last_rebuild = now
+            else:
+                query = select(RevokedToken.jti, RevokedToken.revoked_at).where(
+                    RevokedToken.revoked_at >= state.last_revoked_at - _SYNC_OVERLAP
+                )
+                for jti, revoked_at in DB.session.execute(query):
+                    if jti not in bloom:
+                        bloom.add(jti)
+                    state.confirmed.set(jti, True)
+                    state.last_revoked_at = max(state.last_revoked_at, revoked_at)
+            state.last_refresh = now
+
+    def _rebuild(self, state: RevocationState):
+        # expired tokens are rejected before the revocation check
+        not_expired = or_(
+            RevokedToken.expires_at.is_(None), RevokedToken.expires_at >= int(time())
+        )
+        count = (
+            DB.session.scalar(
+                select(DB.func.count()).select_from(RevokedToken).where(not_expired)
+            )
+            or 0
+        )
+        bloom = BloomFilter(max(state.capacity, count * 2), state.error_rate)
+        last_revoked_at = 0
+        query = (
+            select(RevokedToken.jti, RevokedToken.revoked_at)
+            .where(not_expired)
+            .execution_options(yield_per=10_000)
+        )
+        for jti, revoked_at in DB.session.execute(query):
+            bloom.add(jti)
+            last_revoked_at = max(last_revoked_at, revoked_at)
+        state.bloom = bloom
+        state.last_revoked_at = last_revoked_at
+        # expired or deleted tokens may still be cached as revoked
+        state.confirmed.clear()
+
+    def stats(self, *, app: Optional[Flask] = None) -> Dict[str, Any]:
+        """Get statistics about the revocation checks."""
+        return self._state(app).as_dict()
+
+
+REVOCATION_STORE = TokenRevocationStore()
@@ -0,0 +1,14 @@
+"""Module containing signals to notify caches about changes of users and tokens.
+
+All signals are sent with the flask app as sender.
+"""
+
+from blinker import Namespace
+
+_SIGNALS = Namespace()
+
+"""Send after a user was changed or deleted (keyword args: ``identity``)."""
+USER_CHANGED = _SIGNALS.signal("user-changed")
+
+"""Sent after a token was revoked (keyword args: ``identity``, ``jti``)."""
+TOKEN_REVOKED = _SIGNALS.signal("token-revoked")
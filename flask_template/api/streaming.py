@@ -0,0 +1,120 @@
+"""Module containing streaming responses for large collections."""
+
+from functools import wraps
+from http import HTTPStatus
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Type, TypeVar, Union
+
+import marshmallow as ma
+from flask import current_app, stream_with_context
+from flask.typing import ResponseReturnValue
+from flask_smorest.utils import (
+    resolve_schema_instance,
+    set_status_and_headers_in_response,
+    unpack_tuple_response,
+)
+from sqlalchemy.sql import Select
+
+from ..db import DB
+
+RT = TypeVar("RT")
+
+JSON_MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def _batches(items: Iterable[Any], batch_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def _iter_query(statement: Select, yield_per: int) -> Iterator[Any]:
+    # executed lazily, i.e. inside the (newly pushed) context of the streamed
+    # response
+    yield from DB.session.scalars(statement.execution_options(yield_per=yield_per))
+
+
+def generate_json_array(
+    items: Iterable[Any], schema: ma.Schema, batch_size: int = 100
+) -> Iterator[str]:
+    """Serialize items to a json array, yielding one chunk per batch."""
+    dumps = current_app.json.dumps
+    separator = "["
+    for batch in _batches(items, batch_size):
+        yield separator + ",".join(dumps(item) for item in schema.dump(batch, many=True))
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+
+def generate_ndjson(
+    items: Iterable[Any], schema: ma.Schema, batch_size: int = 100
+) -> Iterator[str]:
+    """Serialize items to newline delimited json, one chunk per batch."""
+    dumps = current_app.json.dumps
+    for batch in _batches(items, batch_size):
+        yield "".join(dumps(item) + "\n" for item in schema.dump(batch, many=True))
+
+
+class StreamingMixin:
+    """Extend Blueprint to stream large collections as json."""
+
+    def stream_response(
+        self,
+        status_code: Union[int, HTTPStatus],
+        schema: Union[ma.Schema, Type[ma.Schema]],
+        *,
+        ndjson: bool = False,
+        batch_size: int = 100,
+        description: Optional[str] = None,
+    ) -> Callable[[Callable[..., RT]], Callable[..., ResponseReturnValue]]:
+        """Decorator streaming the iterable returned by the view as json.
+
+        The items are serialized in batches with the schema while the response
+        is sent, so the collection is never materialized in memory. The response
+        is documented like with the ``response`` decorator.
+
+        The view can return a ``select`` statement, which is executed with
+        ``yield_per`` while streaming, or any other iterable. Query results
+        must not be returned directly, as the session of the view is closed
+        before the response is streamed (return a generator instead).
+
+        Args:
+            status_code (int|HTTPStatus): the status code of the response
+            schema (Schema): the schema of a single item
+            ndjson (bool, optional): stream newline delimited json instead of a
+                json array. Defaults to False.
+            batch_size (int, optional): the number of items serialized per
+                chunk. Defaults to 100.
+            description (Optional[str], optional): the description of the
+                response. Defaults to None.
+        """
+        schema = resolve_schema_instance(schema)
+        if schema.many:
+            raise ValueError("The schema must describe a single item (many=False).")
+        if ndjson:
+            generate, mimetype, doc_schema = generate_ndjson, NDJSON_MIMETYPE, schema
+        else:
+            generate, mimetype = generate_json_array, JSON_MIMETYPE
+            doc_schema = type(schema)(many=True, only=schema.only, exclude=schema.exclude)
+
+        def decorator(func: Callable[..., RT]) -> Callable[..., ResponseReturnValue]:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> ResponseReturnValue:
+                items, status, headers = unpack_tuple_response(func(*args, **kwargs))
+                if isinstance(items, Select):
+                    items = _iter_query(items, yield_per=batch_size * 10)
+                response = current_app.response_class(
+                    stream_with_context(generate(items, schema, batch_size)),
+                    status=status_code,
+                    mimetype=mimetype,
+                )
+                set_status_and_headers_in_response(response, status, headers)
+                return response
+
+            # use the response decorator to document the response
+            return self.response(
+                status_code, doc_schema, content_type=mimetype, description=description
+            )(wrapper)
+
+        return decorator
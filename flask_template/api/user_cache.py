@@ -0,0 +1,232 @@
+"""Module containing the cache for user objects loaded from JWT identities.
+
+The cache consists of a bounded in-process LRU cache with a short time to live
+and an optional shared backend (e.g. a SQLite file shared by all workers on a
+node). Cached users are evicted when the ``USER_CHANGED`` or ``TOKEN_REVOKED``
+signals are sent for their identity.
+"""
+
+import pickle
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import local
+from time import time
+from typing import Any, Callable, Dict, Optional, Protocol, TypeVar
+
+from flask import Flask, current_app
+
+from ..util.cache import MISSING, CacheStats, LRUCache
+from .signals import TOKEN_REVOKED, USER_CHANGED
+
+UT = TypeVar("UT")
+
+
+class SharedUserCacheBackend(Protocol):
+    """Interface of cache backends shared between multiple processes."""
+
+    def get(self, identity: str) -> Any:
+        """Return the cached user or ``MISSING``."""
+        ...
+
+    def set(self, identity: str, user: Any, ttl: float):
+        """Cache the user for ``ttl`` seconds."""
+        ...
+
+    def delete(self, identity: str):
+        """Remove the cached user."""
+        ...
+
+    def clear(self):
+        """Remove all cached users."""
+        ...
+
+
+class SqliteUserCacheBackend:
+    """Shared user cache backend storing pickled users in a local SQLite file.
+
+    Only use this backend with a file that is not writable by untrusted parties
+    as the cached values are unpickled!
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS user_cache "
+                "(identity TEXT PRIMARY KEY, user BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_user_cache_expires ON user_cache (expires)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, identity: str) -> Any:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT user FROM user_cache WHERE identity = ? AND expires > ?",
+                (identity, time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return MISSING
+        return pickle.loads(row[0])
+
+    def set(self, identity: str, user: Any, ttl: float):
+        now = time()
+        with self._connection() as connection:
+            # expired rows are never read again, delete them to bound the size
+            connection.execute("DELETE FROM user_cache WHERE expires <= ?", (now,))
+            connection.execute(
+                "INSERT OR REPLACE INTO user_cache (identity, user, expires) VALUES (?, ?, ?)",
+                (identity, pickle.dumps(user), now + ttl),
+            )
+
+    def delete(self, identity: str):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM user_cache WHERE identity = ?", (identity,))
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM user_cache")
+
+
+@dataclass
+class UserCacheState:
+    """The user cache state of a single flask app."""
+
+    enabled: bool
+    local: LRUCache[str, Any]
+    shared: Optional[SharedUserCacheBackend] = None
+    shared_ttl: float = 300
+    stats: CacheStats = field(default_factory=CacheStats)
+    shared_hits: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "size": len(self.local),
+            "maxsize": self.local.maxsize,
+            "hits": self.stats.hits,
+            "sharedHits": self.shared_hits,
+            "misses": self.stats.misses,
+            "evictions": self.local.stats.evictions,
+            "invalidations": self.stats.invalidations,
+            "hitRatio": self.stats.hit_ratio,
+        }
+
+
+class UserCache:
+    """Cache for user objects loaded by the JWT user lookup loader."""
+
+    extension_name = "user_cache"
+
+    def init_app(self, app: Flask):
+        """Configure the user cache for the app.
+
+        Config keys:
+            JWT_USER_CACHE_ENABLED: enable or disable the cache (default: True)
+            JWT_USER_CACHE_SIZE: maximum number of users cached per process
+                (default: 1024)
+            JWT_USER_CACHE_TTL: seconds a user is cached in process
+                (default: 60)
+            JWT_USER_CACHE_BACKEND: ``None`` or ``"sqlite"`` for a shared
+                backend (default: None)
+            JWT_USER_CACHE_SHARED_TTL: seconds a user is cached in the shared
+                backend (default: 300)
+            JWT_USER_CACHE_SQLITE_PATH: path of the sqlite file
+                (default: ``<instance_path>/user_cache.sqlite``)
+        """
+        config = app.config
+        shared: Optional[SharedUserCacheBackend] = None
+        backend = config.get("JWT_USER_CACHE_BACKEND")
+        if backend == "sqlite":
+            path = config.get("JWT_USER_CACHE_SQLITE_PATH") or (
+                Path(app.instance_path) / "user_cache.sqlite"
+            )
+            shared = SqliteUserCacheBackend(Path(path))
+        elif backend:
+            raise ValueError(f"Unknown user cache backend '{backend}'.")
+
+        app.extensions[self.extension_name] = UserCacheState(
+            enabled=config.get("JWT_USER_CACHE_ENABLED", True),
+            local=LRUCache(
+                maxsize=config.get("JWT_USER_CACHE_SIZE", 1024),
+                ttl=config.get("JWT_USER_CACHE_TTL", 60),
+            ),
+            shared=shared,
+            shared_ttl=config.get("JWT_USER_CACHE_SHARED_TTL", 300),
+        )
+
+        USER_CHANGED.connect(self._on_user_changed, sender=app, weak=False)
+        TOKEN_REVOKED.connect(self._on_user_changed, sender=app, weak=False)
+
+    def _on_user_changed(self, app: Flask, identity: Optional[str] = None, **kwargs):
+        if identity is not None:
+            self.invalidate(str(identity), app=app)
+
+    def _state(self, app: Optional[Flask] = None) -> UserCacheState:
+        return (app or current_app).extensions[self.extension_name]
+
+    def get_or_load(
+        self, identity: str, loader: Callable[[str], Optional[UT]]
+    ) -> Optional[UT]:
+        """Get the user for identity from the cache or load it with the loader.
+
+        Users that could not be loaded (i.e. ``None``) are not cached.
+        """
+        state = self._state()
+        if not state.enabled:
+            return loader(identity)
+        user = state.local.get(identity, MISSING, record_stats=False)
+        if user is not MISSING:
+            state.stats.hits += 1
+            return user
+        if state.shared is not None:
+            user = state.shared.get(identity)
+            if user is not MISSING:
+                state.stats.hits += 1
+                state.shared_hits += 1
+                state.local.set(identity, user)
+                return user
+        state.stats.misses += 1
+        user = loader(identity)
+        if user is not None:
+            state.local.set(identity, user)
+            if state.shared is not None:
+                state.shared.set(identity, user, state.shared_ttl)
+        return user
+
+    def invalidate(self, identity: str, *, app: Optional[Flask] = None):
+        """Remove the user with identity from all caches."""
+        state = self._state(app)
+        state.local.delete(identity)
+        if state.shared is not None:
+            state.shared.delete(identity)
+        state.stats.invalidations += 1
+
+    def clear(self, *, app: Optional[Flask] = None):
+        """Remove all cached users."""
+        state = self._state(app)
+        state.local.clear()
+        if state.shared is not None:
+            state.shared.clear()
+
+    def stats(self, *, app: Optional[Flask] = None) -> Dict[str, Any]:
+        """Get the cache statistics."""
+        return self._state(app).as_dict()
+
+
+USER_CACHE = UserCache()
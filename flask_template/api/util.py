@@ -1,22 +1,34 @@
 """Module containing utilities for flask smorest APIs."""
 
+from functools import lru_cache
 from typing import Any
 from .jwt import JWTMixin
+from .pagination import CursorPaginationMixin
+from .response_cache import ResponseCacheMixin
+from .streaming import StreamingMixin
 from flask_smorest import Blueprint
 import marshmallow as ma
 
 
-class SecurityBlueprint(Blueprint, JWTMixin):
+class SecurityBlueprint(
+    Blueprint, JWTMixin, StreamingMixin, CursorPaginationMixin, ResponseCacheMixin
+):
     """Blueprint that is aware of jwt tokens and how to document them.
 
     Use this Blueprint if you want to document security requirements for your api.
+    Also supports streaming large collections with ``stream_response`` and
+    keyset pagination with ``cursor_paginate`` and caches the responses of
+    idempotent views with ``cache_response``.
     """
 
     def __init__(self, *args: Any, **kwargs):
         super().__init__(*args, **kwargs)
         self._prepare_doc_cbks.append(self._prepare_security_doc)
+        self._prepare_doc_cbks.append(self._prepare_cursor_pagination_doc)
+        self._prepare_doc_cbks.append(self._prepare_response_cache_doc)
 
 
+@lru_cache(maxsize=4096)
 def camelcase(s: str) -> str:
     """Turn a string from python snake_case into camelCase."""
     parts = iter(s.split("_"))
@@ -2,7 +2,6 @@
 
 from .models.auth import AccessTokenSchema, UserSchema
 from typing import Dict
-from flask.helpers import url_for
 from flask.views import MethodView
 from dataclasses import dataclass
 from http import HTTPStatus
@@ -10,17 +9,21 @@ from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
     current_user,
+    get_jwt,
 )
 
 from .root import API_V1
 from .models import AuthRootSchema, LoginPostSchema, LoginTokensSchema
 from ..jwt import DemoUser
+from ..links import external_url
+from ..revocation import REVOCATION_STORE
 
 
 @dataclass
 class AuthRootData:
     login: str
     refresh: str
+    logout: str
     whoami: str
 
 
@@ -39,13 +42,15 @@ class RefreshedTokenData:
 class AuthRootView(MethodView):
     """Root endpoint for all authentication resources."""
 
+    @API_V1.cache_response()
     @API_V1.response(HTTPStatus.OK, AuthRootSchema())
     def get(self):
         """Get the urls for the authentication api."""
         return AuthRootData(
-            login=url_for("api-v1.LoginView", _external=True),
-            refresh=url_for("api-v1.RefreshView", _external=True),
-            whoami=url_for("api-v1.WhoamiView", _external=True),
+            login=external_url("api-v1.LoginView"),
+            refresh=external_url("api-v1.RefreshView"),
+            logout=external_url("api-v1.LogoutView"),
+            whoami=external_url("api-v1.WhoamiView"),
         )
 
 
@@ -88,6 +93,30 @@ class RefreshView(MethodView):
             access_token=create_access_token(identity=identity, fresh=True),
         )
 
+    @API_V1.response(HTTPStatus.NO_CONTENT)
+    @API_V1.require_jwt("jwt-refresh-token", refresh_token=True)
+    def delete(self):
+        """Revoke the refresh token.
+
+        This method requires the jwt refresh token!
+        """
+        REVOCATION_STORE.revoke(get_jwt())
+
+
+@API_V1.route("/auth/logout/")
+class LogoutView(MethodView):
+    """Logout endpoint to revoke api tokens."""
+
+    @API_V1.response(HTTPStatus.NO_CONTENT)
+    @API_V1.require_jwt("jwt")
+    def post(self):
+        """Revoke the access token used to authenticate this request.
+
+        Use the DELETE method of the refresh endpoint to also revoke the refresh
+        token.
+        """
+        REVOCATION_STORE.revoke(get_jwt())
+
 
 @API_V1.route("/auth/whoami/")
 class WhoamiView(MethodView):
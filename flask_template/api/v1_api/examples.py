@@ -0,0 +1,33 @@
+"""Module containing the example API of the v1 API."""
+
+from flask.views import MethodView
+from http import HTTPStatus
+from sqlalchemy import select
+
+from ...db import read_only
+from ...db.models.example import Example
+from .root import API_V1
+from .models import ExampleSchema
+
+
+@API_V1.route("/examples/")
+class ExamplesView(MethodView):
+    """List all examples."""
+
+    @API_V1.response(HTTPStatus.OK, ExampleSchema(many=True))
+    @API_V1.cursor_paginate(Example.id)
+    @read_only
+    def get(self):
+        """Get a page of examples (the ``Link`` header links the next page)."""
+        return select(Example)
+
+
+@API_V1.route("/examples/export/")
+class ExamplesExportView(MethodView):
+    """Export all examples."""
+
+    @API_V1.stream_response(HTTPStatus.OK, ExampleSchema(), ndjson=True)
+    @read_only
+    def get(self):
+        """Stream all examples as newline delimited json."""
+        return select(Example).order_by(Example.id)
@@ -2,3 +2,4 @@
 
 from .root import *  # noqa
 from .auth import *  # noqa
+from .examples import *  # noqa
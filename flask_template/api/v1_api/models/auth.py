@@ -1,6 +1,7 @@
 """Module containing all API schemas for the authentication API."""
 
 import marshmallow as ma
+from ...compiled_schema import CompiledMaBaseSchema
 from ...util import MaBaseSchema
 
 __all__ = [
@@ -12,9 +13,10 @@ __all__ = [
 ]
 
 
-class AuthRootSchema(MaBaseSchema):
+class AuthRootSchema(CompiledMaBaseSchema):
     login = ma.fields.Url(required=True, allow_none=False, dump_only=True)
     refresh = ma.fields.Url(required=True, allow_none=False, dump_only=True)
+    logout = ma.fields.Url(required=True, allow_none=False, dump_only=True)
     whoami = ma.fields.Url(required=True, allow_none=False, dump_only=True)
 
 
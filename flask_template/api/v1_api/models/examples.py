@@ -0,0 +1,13 @@
+"""Module containing all API schemas for the example API."""
+
+import marshmallow as ma
+from ...compiled_schema import CompiledMaBaseSchema
+
+__all__ = [
+    "ExampleSchema",
+]
+
+
+class ExampleSchema(CompiledMaBaseSchema):
+    id = ma.fields.Integer(required=True, allow_none=False, dump_only=True)
+    name = ma.fields.String(required=True, allow_none=False)
@@ -1,12 +1,14 @@
 """Module containing all API schemas for the root API endpoint."""
 
 import marshmallow as ma
-from ...util import MaBaseSchema
+from ...compiled_schema import CompiledMaBaseSchema
 
 __all__ = [
     "RootSchema",
 ]
 
 
-class RootSchema(MaBaseSchema):
+class RootSchema(CompiledMaBaseSchema):
     auth = ma.fields.Url(required=True, allow_none=False, dump_only=True)
+    examples = ma.fields.Url(required=True, allow_none=False, dump_only=True)
+    examples_export = ma.fields.Url(required=True, allow_none=False, dump_only=True)
@@ -1,9 +1,9 @@
 """Module containing the root endpoint of the v1 API."""
 
 from dataclasses import dataclass
-from flask.helpers import url_for
 from flask.views import MethodView
 from http import HTTPStatus
+from ..links import external_url
 from ..util import SecurityBlueprint as SmorestBlueprint
 from .models import RootSchema
 
@@ -15,13 +15,20 @@ API_V1 = SmorestBlueprint(
 @dataclass()
 class RootData:
     auth: str
+    examples: str
+    examples_export: str
 
 
 @API_V1.route("/")
 class RootView(MethodView):
     """Root endpoint of the v1 api."""
 
+    @API_V1.cache_response()
     @API_V1.response(HTTPStatus.OK, RootSchema())
     def get(self):
         """Get the urls of the next endpoints of the v1 api to call."""
-        return RootData(auth=url_for("api-v1.AuthRootView", _external=True))
+        return RootData(
+            auth=external_url("api-v1.AuthRootView"),
+            examples=external_url("api-v1.ExamplesView"),
+            examples_export=external_url("api-v1.ExamplesExportView"),
+        )
@@ -1,50 +1,100 @@
 """Module for setting up Babel support for flask app."""
 
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union
+from babel import Locale
 from flask import Flask, request, g
-from flask_babel import Babel, refresh as flask_babel_refresh
+from flask_babel import Babel, force_locale, get_translations
+from flask_babel import refresh as flask_babel_refresh
 from werkzeug.datastructures import LanguageAccept
+from werkzeug.http import parse_accept_header
 
 """The list of locales to support."""
 SUPPORTED_LOCALES = ["de", "en"]
 
+"""The number of (Accept-Language, lang) header values with a cached locale."""
+LOCALE_CACHE_SIZE = 256
 
-def _get_locale():
+
+@lru_cache(maxsize=LOCALE_CACHE_SIZE)
+def negotiate_locale(
+    accept_language: str, lang: Optional[str] = None
+) -> Optional[Locale]:
+    """Get the best supported locale for the Accept-Language header value.
+
+    The language from the custom 'lang' header is preferred over all accepted
+    languages.
+    """
+    accepted_languages = parse_accept_header(accept_language, LanguageAccept)
+    if lang:
+        accepted_languages = LanguageAccept(((lang, 10), *accepted_languages))
+    best_match = accepted_languages.best_match(SUPPORTED_LOCALES)
+    return Locale.parse(best_match) if best_match else None
+
+
+def select_locale() -> Union[Locale, str, None]:
+    """Select the locale of the current request (None for the default locale).
+
+    Unlike ``flask_babel.get_locale`` this does not store the selected locale.
+    """
     if "lang" in g:
         # check LanguageAccept option in g context
         accepted_languages = g.get("lang")
         if accepted_languages and isinstance(accepted_languages, LanguageAccept):
             # g context takes precedent over request accept_languages
             return accepted_languages.best_match(SUPPORTED_LOCALES)
-    # try to guess the language from the user accept
-    # header the browser transmits. We support SUPPORTED_LOCALES The best match wins.
-    return request.accept_languages.best_match(SUPPORTED_LOCALES)
+    # try to guess the language from the user accept header the browser
+    # transmits (and the custom 'lang' header if injected). We support
+    # SUPPORTED_LOCALES The best match wins.
+    return negotiate_locale(
+        request.headers.get("Accept-Language", ""), g.get("lang_header")
+    )
+
+
+def _get_locale():
+    # remember that the locale was selected (see inject_lang_from_header)
+    g._babel_locale_selected = True
+    return select_locale()
 
 
-BABEL = Babel(locale_selector=_get_locale)
+BABEL = Babel()
 
 
 def inject_lang_from_header():
-    """Inject the language defined in the custom 'lang' Hader into the g context.
+    """Use the language defined in the custom 'lang' Hader as first choice.
 
     This method can be used in a before request callback to read the custom
     header and use that to set the language for example for API requests.
     """
     lang: Optional[str] = request.headers.get("lang")
-    if lang:
-        old_accepts: LanguageAccept = request.accept_languages
-        if "lang" in g:
-            # check LanguageAccept option in g context
-            accepted_languages = g.get("lang")
-            if accepted_languages and isinstance(accepted_languages, LanguageAccept):
-                old_accepts = accepted_languages
-        # inject language from custom header as first choice into request
-        values = (lang, 10), *old_accepts
-        g.lang = LanguageAccept(values)
-        # Force refresh to make sure that the change is applied
+    if not lang:
+        return
+    accepted_languages = g.get("lang")
+    if accepted_languages and isinstance(accepted_languages, LanguageAccept):
+        # inject language from custom header as first choice into the g context
+        g.lang = LanguageAccept(((lang, 10), *accepted_languages))
+    elif lang == g.get("lang_header"):
+        return
+    else:
+        g.lang_header = lang
+    if g.get("_babel_locale_selected"):
+        # Force refresh to make sure that the change is applied (only needed if
+        # the locale was already selected in this request)
         flask_babel_refresh()
 
 
+def preload_translations(app: Flask):
+    """Load the translation catalogs of all supported locales."""
+    with app.app_context():
+        for locale in SUPPORTED_LOCALES:
+            with force_locale(locale):
+                get_translations()
+
+
 def register_babel(app: Flask):
     """Register babel to enable translations for this app."""
-    BABEL.init_app(app)
+    # the locale selector must be passed to init_app (Babel() ignores it
+    # without app)
+    BABEL.init_app(app, locale_selector=_get_locale)
+    if app.config.get("BABEL_PRELOAD_TRANSLATIONS", False):
+        preload_translations(app)
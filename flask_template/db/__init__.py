@@ -1,33 +1,38 @@
 """Module containing database cli and models."""
 
 from flask import Flask
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
 
-from .db import DB, MIGRATE
+from .db import DB  # noqa
 from .cli import register_cli_blueprint
+from .connection import register_engine_listeners
+from .instrumentation import register_query_instrumentation
+from .pool import apply_pool_config
+from .replicas import read_only, register_replicas  # noqa
 
 
 def register_db(app: Flask):
-    """Register the sqlalchemy db and alembic migrations with the flask app."""
+    """Register the sqlalchemy db with the flask app.
+
+    The alembic migrations are registered separately (see ``.migrations``).
+    """
     if not app.config.get("SQLALCHEMY_DATABASE_URI"):
         app.config["SQLALCHEMY_DATABASE_URI"] = (
             f"sqlite:///{app.instance_path}/{app.import_name}.db"
         )
 
+    # add the read replicas as binds
+    register_replicas(app)
+
+    # merge the pool config into the engine options
+    apply_pool_config(app)
+
     DB.init_app(app)
     app.logger.info(f'Connected to db "{app.config["SQLALCHEMY_DATABASE_URI"]}".')
 
     register_cli_blueprint(app)
 
-    MIGRATE.init_app(app, DB)
-
-    # Apply additional config for Sqlite databases
-    if app.config.get("SQLALCHEMY_DATABASE_URI", "").startswith("sqlite://"):
+    # Apply additional config (e.g. Sqlite pragmas) to new connections
+    register_engine_listeners(app)
 
-        @event.listens_for(Engine, "connect")
-        def set_sqlite_pragma(dbapi_connection, connection_record):
-            if app.config.get("SQLITE_FOREIGN_KEYS", True):
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
+    # count and time the queries of every request (if enabled)
+    register_query_instrumentation(app)
@@ -0,0 +1,207 @@
+"""Module containing bulk insert and upsert helpers for ``MODEL`` subclasses.
+
+The rows are converted to dicts, grouped into chunks and inserted with one
+executemany call per chunk. Upserts use ``INSERT ... ON CONFLICT`` (SQLite,
+PostgreSQL) or ``INSERT ... ON DUPLICATE KEY UPDATE`` (MySQL, MariaDB) and
+fall back to ``session.merge`` for other databases.
+"""
+
+from dataclasses import dataclass, fields, is_dataclass
+from itertools import islice
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import inspect, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Mapper, Session
+
+from .db import DB
+
+
+@dataclass
+class BulkResult:
+    """The result of a bulk operation."""
+
+    rows: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _row_to_dict(row: Any, column_keys: Sequence[str]) -> Dict[str, Any]:
+    # explicit None values are inserted as NULL for all row types, only values
+    # that were never set (or left at the dataclass default) use the column
+    # defaults
+    if isinstance(row, dict):
+        return row
+    if hasattr(row, "__mapper__"):
+        # the attributes set on the instance (including mapped dataclasses)
+        values = inspect(row).dict
+        return {key: values[key] for key in column_keys if key in values}
+    if is_dataclass(row) and not isinstance(row, type):
+        return {
+            f.name: value
+            for f in fields(row)
+            if f.name in column_keys and (value := getattr(row, f.name)) is not f.default
+        }
+    raise TypeError(f"Unsupported row type {type(row)!r}, use a dict or dataclass.")
+
+
+def _chunks(
+    rows: Iterable[Any], column_keys: Sequence[str], chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    iterator = (_row_to_dict(row, column_keys) for row in rows)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _group_by_keys(chunk: List[Dict[str, Any]]) -> Iterable[List[Dict[str, Any]]]:
+    # executemany requires the same keys in all parameter sets
+    groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for row in chunk:
+        groups.setdefault(frozenset(row), []).append(row)
+    return groups.values()
+
+
+def _run_chunked(
+    model: type,
+    rows: Iterable[Any],
+    execute: Callable[[Session, Mapper, List[Dict[str, Any]]], None],
+    chunk_size: int,
+    commit: bool,
+    session: Optional[Session],
+    on_chunk: Optional[Callable[[BulkResult], None]],
+) -> BulkResult:
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be at least 1.")
+    session = session if session is not None else DB.session
+    mapper: Mapper = inspect(model)
+    column_keys = [attr.key for attr in mapper.column_attrs]
+    result = BulkResult()
+    start = perf_counter()
+    for chunk in _chunks(rows, column_keys, chunk_size):
+        for group in _group_by_keys(chunk):
+            execute(session, mapper, group)
+        if commit:
+            session.commit()
+        result.rows += len(chunk)
+        result.chunks += 1
+        result.seconds = perf_counter() - start
+        if on_chunk is not None:
+            on_chunk(result)
+    result.seconds = perf_counter() - start
+    return result
+
+
+def bulk_insert(
+    model: type,
+    rows: Iterable[Any],
+    *,
+    chunk_size: int = 1000,
+    commit: bool = True,
+    session: Optional[Session] = None,
+    on_chunk: Optional[Callable[[BulkResult], None]] = None,
+) -> BulkResult:
+    """Insert many rows into the table of the model.
+
+    Args:
+        model (type): the model class (a ``MODEL`` subclass or mapped dataclass)
+        rows (Iterable[Any]): dicts (keyed by attribute name), dataclass or
+            model instances (None values are inserted, unset attributes use
+            the column defaults)
+        chunk_size (int, optional): the number of rows per executemany call.
+            Defaults to 1000.
+        commit (bool, optional): commit after every chunk. Defaults to True.
+        session (Optional[Session], optional): the session to use. Defaults to
+            ``DB.session``.
+        on_chunk (Optional[Callable[[BulkResult], None]], optional): called
+            after every chunk with the intermediate result. Defaults to None.
+    """
+
+    def execute(session: Session, mapper: Mapper, rows: List[Dict[str, Any]]):
+        session.execute(insert(mapper), rows)
+
+    return _run_chunked(model, rows, execute, chunk_size, commit, session, on_chunk)
+
+
+def bulk_upsert(
+    model: type,
+    rows: Iterable[Any],
+    *,
+    index_elements: Optional[Sequence[str]] = None,
+    update_columns: Optional[Sequence[str]] = None,
+    chunk_size: int = 1000,
+    commit: bool = True,
+    session: Optional[Session] = None,
+    on_chunk: Optional[Callable[[BulkResult], None]] = None,
+) -> BulkResult:
+    """Insert many rows into the table of the model, updating existing rows.
+
+    Args:
+        model (type): the model class (a ``MODEL`` subclass or mapped dataclass)
+        rows (Iterable[Any]): dicts (keyed by attribute name), dataclass or
+            model instances (None values are inserted, unset attributes use
+            the column defaults)
+        index_elements (Optional[Sequence[str]], optional): the attributes of
+            the unique key identifying existing rows. Defaults to the primary
+            key.
+        update_columns (Optional[Sequence[str]], optional): the attributes to
+            update for existing rows. Defaults to all given attributes not in
+            the key.
+        chunk_size (int, optional): the number of rows per executemany call.
+            Defaults to 1000.
+        commit (bool, optional): commit after every chunk. Defaults to True.
+        session (Optional[Session], optional): the session to use. Defaults to
+            ``DB.session``.
+        on_chunk (Optional[Callable[[BulkResult], None]], optional): called
+            after every chunk with the intermediate result. Defaults to None.
+    """
+    mapper: Mapper = inspect(model)
+    if index_elements is None:
+        index_elements = [
+            mapper.get_property_by_column(c).key for c in mapper.primary_key
+        ]
+    key_columns = [mapper.columns[key] for key in index_elements]
+
+    def execute(session: Session, mapper: Mapper, rows: List[Dict[str, Any]]):
+        updated = [
+            key
+            for key in (update_columns if update_columns is not None else rows[0])
+            if key not in index_elements
+        ]
+        dialect = session.get_bind(mapper=mapper).dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = dialect_insert(mapper)
+            excluded = statement.excluded
+            if updated:
+                statement = statement.on_conflict_do_update(
+                    index_elements=key_columns,
+                    set_={
+                        mapper.columns[key]: excluded[mapper.columns[key].name]
+                        for key in updated
+                    },
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=key_columns)
+            session.execute(statement, rows)
+        elif dialect in ("mysql", "mariadb"):
+            statement = mysql.insert(mapper)
+            inserted = statement.inserted
+            # updating a key column to itself turns conflicts into no-ops
+            statement = statement.on_duplicate_key_update(
+                {
+                    mapper.columns[key].name: inserted[mapper.columns[key].name]
+                    for key in (updated or index_elements)
+                }
+            )
+            session.execute(statement, rows)
+        else:
+            for row in rows:
+                session.merge(mapper.class_(**row))
+            session.flush()
+
+    return _run_chunked(model, rows, execute, chunk_size, commit, session, on_chunk)
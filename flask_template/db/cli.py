@@ -1,5 +1,9 @@
 """CLI functions for the db module."""
 
+from os import fstat
+from time import monotonic
+from typing import IO, Any, Callable, Optional
+
 from flask import Flask, Blueprint, current_app
 import click
 
@@ -9,6 +13,17 @@ from .db import DB
 
 # make sure all models are imported for CLI to work properly
 from . import models  # noqa
+from .models.revoked_token import RevokedToken
+from .bulk import BulkResult
+from .transfer import (
+    FORMATS,
+    export_rows,
+    get_model,
+    guess_format,
+    import_rows,
+    model_names,
+    open_binary,
+)
 
 DB_CLI_BLP = Blueprint("db_cli", __name__, cli_group=None)
 DB_CLI = DB_CLI_BLP.cli  # expose as attribute for autodoc generation
@@ -40,6 +55,168 @@ def drop_db_function(app: Flask):
     get_logger(app, DB_COMMAND_LOGGER).info("Dropped Database.")
 
 
+@DB_CLI.command("compact-revoked-tokens")
+@click.option(
+    "--vacuum",
+    is_flag=True,
+    default=False,
+    help="Also run VACUUM to shrink the database file (SQLite only).",
+)
+def compact_revoked_tokens(vacuum: bool):
+    """Delete revoked tokens that are expired anyway."""
+    deleted = compact_revoked_tokens_function(current_app, vacuum=vacuum)
+    click.echo(f"Deleted {deleted} expired revoked tokens.")
+
+
+def compact_revoked_tokens_function(app: Flask, vacuum: bool = False) -> int:
+    deleted = RevokedToken.delete_expired()
+    DB.session.commit()
+    if vacuum and DB.engine.dialect.name == "sqlite":
+        with DB.engine.connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(
+                "VACUUM"
+            )
+    get_logger(app, DB_COMMAND_LOGGER).info(f"Deleted {deleted} expired revoked tokens.")
+    return deleted
+
+
+def _resolve_model_and_format(model_name: str, path: str, file_format: Optional[str]):
+    try:
+        model = get_model(model_name)
+    except KeyError:
+        raise click.BadParameter(
+            f"Unknown model '{model_name}', use one of {', '.join(model_names())}.",
+            param_hint="MODEL",
+        )
+    file_format = file_format or guess_format(path)
+    if file_format is None:
+        raise click.BadParameter(
+            "Cannot guess the format from the file name.", param_hint="--format"
+        )
+    return model, file_format
+
+
+def _file_size(raw: IO[bytes]) -> Optional[int]:
+    try:
+        return fstat(raw.fileno()).st_size or None
+    except (OSError, ValueError):
+        return None
+
+
+def _throttled(func: Callable[..., None], interval: float = 1.0) -> Callable[..., None]:
+    # limit the progress output to one line per interval
+    last_call = -interval
+
+    def wrapper(*args: Any):
+        nonlocal last_call
+        now = monotonic()
+        if now - last_call >= interval:
+            last_call = now
+            func(*args)
+
+    return wrapper
+
+
+@DB_CLI.command("import-data")
+@click.argument("model_name", metavar="MODEL")
+@click.argument("path", type=click.Path(dir_okay=False, allow_dash=True))
+@click.option("--format", "file_format", type=click.Choice(FORMATS), default=None)
+@click.option("--batch-size", type=click.IntRange(min=1), default=1000, show_default=True)
+@click.option(
+    "--upsert",
+    is_flag=True,
+    default=False,
+    help="Update rows with an existing primary key instead of failing.",
+)
+def import_data(
+    model_name: str, path: str, file_format: Optional[str], batch_size: int, upsert: bool
+):
+    """Import the rows of a CSV or NDJSON file ('-': stdin) into a table.
+
+    The file is streamed and every batch is committed. The format is guessed
+    from the file name (.csv, .ndjson, .jsonl, optionally followed by .gz).
+    """
+    model, file_format = _resolve_model_and_format(model_name, path, file_format)
+    result = import_data_function(
+        current_app, model, path, file_format, batch_size=batch_size, upsert=upsert
+    )
+    click.echo(
+        f"Imported {result.rows} rows into {model.__name__} "
+        f"({result.rows_per_second:.0f} rows/s)."
+    )
+
+
+def import_data_function(
+    app: Flask,
+    model: type,
+    path: str,
+    file_format: str,
+    batch_size: int = 1000,
+    upsert: bool = False,
+) -> BulkResult:
+    with open_binary(path, "r") as (file, raw):
+        size = _file_size(raw)
+
+        def report_progress(result: BulkResult):
+            progress = f" ({raw.tell() / size:.1%})" if size else ""
+            click.echo(
+                f"Imported {result.rows} rows{progress}, "
+                f"{result.rows_per_second:.0f} rows/s",
+                err=True,
+            )
+
+        result = import_rows(
+            model,
+            file,
+            file_format,
+            batch_size=batch_size,
+            upsert=upsert,
+            on_batch=_throttled(report_progress),
+        )
+    get_logger(app, DB_COMMAND_LOGGER).info(
+        f"Imported {result.rows} rows into {model.__name__} from '{path}'."
+    )
+    return result
+
+
+@DB_CLI.command("export-data")
+@click.argument("model_name", metavar="MODEL")
+@click.argument("path", type=click.Path(dir_okay=False, writable=True, allow_dash=True))
+@click.option("--format", "file_format", type=click.Choice(FORMATS), default=None)
+@click.option("--batch-size", type=click.IntRange(min=1), default=1000, show_default=True)
+def export_data(model_name: str, path: str, file_format: Optional[str], batch_size: int):
+    """Export all rows of a model table to a CSV or NDJSON file ('-': stdout).
+
+    The rows are streamed from the database. The format is guessed from the file
+    name (.csv, .ndjson, .jsonl, optionally followed by .gz).
+    """
+    model, file_format = _resolve_model_and_format(model_name, path, file_format)
+    count = export_data_function(
+        current_app, model, path, file_format, batch_size=batch_size
+    )
+    click.echo(f"Exported {count} rows of {model.__name__}.", err=True)
+
+
+def export_data_function(
+    app: Flask, model: type, path: str, file_format: str, batch_size: int = 1000
+) -> int:
+    def report_progress(count: int):
+        click.echo(f"Exported {count} rows", err=True)
+
+    with open_binary(path, "w") as (file, _):
+        count = export_rows(
+            model,
+            file,
+            file_format,
+            batch_size=batch_size,
+            on_batch=_throttled(report_progress),
+        )
+    get_logger(app, DB_COMMAND_LOGGER).info(
+        f"Exported {count} rows of {model.__name__} to '{path}'."
+    )
+    return count
+
+
 def register_cli_blueprint(app: Flask):
     """Method to register the DB CLI blueprint."""
     app.register_blueprint(DB_CLI_BLP)
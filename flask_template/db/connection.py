@@ -0,0 +1,110 @@
+"""Module containing the connection listeners of the app's database engines.
+
+The listeners are attached to the engines of a single app (and not to the
+global ``Engine`` class), so creating many apps in one process does not slow
+down the connection setup of the other apps.
+"""
+
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .db import DB
+from .sqlite import execute_pragmas, sqlite_pragma_statements
+
+EXTENSION_NAME = "db_connection"
+
+# key in connection_record.info storing the start of the connection setup
+_CONNECT_START = "flask_template_connect_start"
+
+
+@dataclass
+class ConnectionSetupStats:
+    """Latency of setting up new dbapi connections (including the listeners)."""
+
+    count: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0  # seconds
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "totalSeconds": self.total,
+            "meanSeconds": self.mean,
+            "maxSeconds": self.max,
+        }
+
+
+@dataclass
+class EngineListeners:
+    """The connection listeners attached to the engines of a flask app."""
+
+    app: Flask
+    sqlite_pragmas: List[str]
+    stats: ConnectionSetupStats = field(default_factory=ConnectionSetupStats)
+
+    def on_do_connect(self, dialect, connection_record, cargs, cparams):
+        connection_record.info[_CONNECT_START] = perf_counter()
+
+    def on_sqlite_connect(self, dbapi_connection, connection_record):
+        if self.app.config.get("SQLITE_FOREIGN_KEYS", True):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+        execute_pragmas(dbapi_connection, self.sqlite_pragmas)
+
+    def on_connect(self, dbapi_connection, connection_record):
+        # registered last, i.e. runs after the other connect listeners
+        start = connection_record.info.pop(_CONNECT_START, None)
+        if start is not None:
+            self.stats.record(perf_counter() - start)
+
+    def attach(self, engine: Engine):
+        """Attach the listeners to the engine (if not already attached)."""
+        if event.contains(engine, "connect", self.on_connect):
+            return
+        event.listen(engine, "do_connect", self.on_do_connect)
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", self.on_sqlite_connect)
+        event.listen(engine, "connect", self.on_connect)
+
+
+def register_engine_listeners(app: Flask):
+    """Attach the connection listeners to all engines (binds) of the app.
+
+    Must be called after ``DB.init_app``. Calling it again for the same app
+    does not attach the listeners twice.
+    """
+    listeners = app.extensions.get(EXTENSION_NAME)
+    if listeners is None:
+        # validate the pragma profile once and fail early on invalid config
+        pragmas = sqlite_pragma_statements(app.config.get("SQLITE_PRAGMAS"))
+        listeners = EngineListeners(app=app, sqlite_pragmas=pragmas)
+        app.extensions[EXTENSION_NAME] = listeners
+    with app.app_context():
+        for engine in DB.engines.values():
+            listeners.attach(engine)
+
+
+def get_connection_setup_stats(app: Optional[Flask] = None) -> Dict[str, Any]:
+    """Get the connection setup latency statistics of the (current) app."""
+    app = app or current_app
+    listeners: EngineListeners = app.extensions[EXTENSION_NAME]
+    return listeners.stats.as_dict()
@@ -2,12 +2,13 @@
 
 from typing import Type, cast
 
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_sqlalchemy.model import Model
 from sqlalchemy.orm import DeclarativeBase, registry
 from sqlalchemy.schema import MetaData
 
+from .replicas import RoutingSession
+
 DB: SQLAlchemy = SQLAlchemy(
     metadata=MetaData(
         naming_convention={
@@ -17,7 +18,9 @@ DB: SQLAlchemy = SQLAlchemy(
             "uq": "uq_%(table_name)s_%(column_0_name)s",
             "ck": "ck_%(table_name)s_%(column_0_name)s",
         }
-    )
+    ),
+    # routes read only queries to the read replicas (if configured)
+    session_options={"class_": RoutingSession},
 )
 
 
@@ -30,5 +33,3 @@ if not issubclass(MODEL, Model):
 
 # remove this if you do not use the `REGISTRY.mapped_as_dataclass` decorator
 REGISTRY: registry = MODEL.registry
-
-MIGRATE = Migrate()
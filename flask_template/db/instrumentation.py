@@ -0,0 +1,163 @@
+"""Module containing request scoped query instrumentation with N+1 detection.
+
+If ``SQLALCHEMY_QUERY_INSTRUMENTATION`` is enabled, the queries of every request
+are counted and timed using the cursor execute events of the app's engines.
+The totals are added to the response as ``Server-Timing`` header and the last
+requests are kept for the ``/debug/queries`` page. Statements executed at least
+``SQLALCHEMY_N_PLUS_ONE_THRESHOLD`` times in one request are reported as
+possible N+1 query patterns.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Deque, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .db import DB
+
+EXTENSION_NAME = "db_query_instrumentation"
+
+# attribute of the execution context storing the start of the statement
+_START_ATTR = "_flask_template_query_start"
+# attribute of g storing the stats of the current request
+_STATS_ATTR = "_db_query_stats"
+
+
+@dataclass
+class StatementStats:
+    """Execution count and time of a single statement."""
+
+    statement: str
+    count: int = 0
+    duration: float = 0.0  # seconds
+
+
+@dataclass
+class RequestQueryStats:
+    """The queries executed while handling a single request."""
+
+    method: str = ""
+    path: str = ""
+    endpoint: Optional[str] = None
+    status_code: Optional[int] = None
+    count: int = 0
+    duration: float = 0.0  # seconds
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats(statement)
+        stats.count += 1
+        stats.duration += duration
+
+    def repeated_statements(self, threshold: int) -> List[StatementStats]:
+        """Get the statements executed at least threshold times.
+
+        These are possible N+1 queries.
+        """
+        return sorted(
+            (s for s in self.statements.values() if s.count >= threshold),
+            key=lambda s: s.count,
+            reverse=True,
+        )
+
+
+class QueryInstrumentation:
+    """The query instrumentation state of a single flask app."""
+
+    def __init__(self, history_size: int, threshold: int):
+        self.threshold = threshold
+        self.history: Deque[RequestQueryStats] = deque(maxlen=history_size)
+        self._lock = Lock()
+
+    def before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if context is not None:
+            setattr(context, _START_ATTR, perf_counter())
+
+    def after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        start = getattr(context, _START_ATTR, None)
+        if start is None or not has_request_context():
+            return
+        stats: Optional[RequestQueryStats] = g.get(_STATS_ATTR)
+        if stats is None:
+            stats = RequestQueryStats()
+            setattr(g, _STATS_ATTR, stats)
+        stats.record(statement, perf_counter() - start)
+
+    def attach(self, engine: Engine):
+        """Attach the listeners to the engine (if not already attached)."""
+        if event.contains(engine, "after_cursor_execute", self.after_cursor_execute):
+            return
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def finish_request(self, response: Response) -> Response:
+        stats: Optional[RequestQueryStats] = g.pop(_STATS_ATTR, None)
+        if stats is None:
+            return response
+        stats.method = request.method
+        stats.path = request.path
+        stats.endpoint = request.endpoint
+        stats.status_code = response.status_code
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats.duration * 1000:.3f};desc="{stats.count} queries"',
+        )
+        repeated = stats.repeated_statements(self.threshold)
+        if repeated:
+            current_app.logger.warning(
+                f"Possible N+1 queries in {stats.method} {stats.path}: "
+                + "; ".join(f"{s.count}x {s.statement!r}" for s in repeated)
+            )
+        with self._lock:
+            self.history.append(stats)
+        return response
+
+    def recent_requests(self) -> List[Tuple[RequestQueryStats, List[StatementStats]]]:
+        """Get the recorded requests (newest first) with repeated statements."""
+        with self._lock:
+            history = list(self.history)
+        return [
+            (stats, stats.repeated_statements(self.threshold))
+            for stats in reversed(history)
+        ]
+
+
+def register_query_instrumentation(app: Flask):
+    """Instrument the engines if ``SQLALCHEMY_QUERY_INSTRUMENTATION`` is set.
+
+    Must be called after ``DB.init_app``.
+    """
+    if not app.config.get("SQLALCHEMY_QUERY_INSTRUMENTATION", False):
+        return
+    instrumentation: Optional[QueryInstrumentation] = app.extensions.get(EXTENSION_NAME)
+    if instrumentation is None:
+        instrumentation = QueryInstrumentation(
+            history_size=app.config.get("SQLALCHEMY_QUERY_HISTORY_SIZE", 50),
+            threshold=app.config.get("SQLALCHEMY_N_PLUS_ONE_THRESHOLD", 5),
+        )
+        app.extensions[EXTENSION_NAME] = instrumentation
+        app.after_request(instrumentation.finish_request)
+    with app.app_context():
+        for engine in DB.engines.values():
+            instrumentation.attach(engine)
+
+
+def get_query_instrumentation(
+    app: Optional[Flask] = None,
+) -> Optional[QueryInstrumentation]:
+    """Get the query instrumentation of the (current) app (None if disabled)."""
+    app = app or current_app
+    return app.extensions.get(EXTENSION_NAME)
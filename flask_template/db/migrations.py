@@ -0,0 +1,17 @@
+"""Module containing the alembic migrations of the database (Flask-Migrate).
+
+Kept separate from the db module as importing alembic is slow and only the
+``flask db`` commands need it.
+"""
+
+from flask import Flask
+from flask_migrate import Migrate
+
+from .db import DB
+
+MIGRATE = Migrate()
+
+
+def register_migrations(app: Flask):
+    """Register the alembic migrations and the ``flask db`` commands."""
+    MIGRATE.init_app(app, DB)
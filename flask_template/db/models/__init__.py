@@ -5,3 +5,4 @@
 # or migration creation resulting in missing database tabes!
 
 from . import example  # noqa
+from . import revoked_token  # noqa
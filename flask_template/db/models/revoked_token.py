@@ -0,0 +1,40 @@
+"""Module containing the model of revoked JWT tokens.
+
+Expired tokens are deleted with ``flask compact-revoked-tokens``.
+"""
+
+from time import time
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import sqltypes as sql
+
+from ..db import DB, MODEL
+
+
+class RevokedToken(MODEL):
+    """A revoked JWT token identified by its ``jti`` claim."""
+
+    __tablename__ = "RevokedToken"
+    jti: Mapped[str] = mapped_column(sql.String(64), primary_key=True)
+    token_type: Mapped[str] = mapped_column(sql.String(16))
+    identity: Mapped[Optional[str]] = mapped_column(sql.String(255), default=None)
+    # unix timestamps (same format as the "iat" and "exp" claims of the token)
+    revoked_at: Mapped[int] = mapped_column(sql.Integer, index=True)
+    expires_at: Mapped[Optional[int]] = mapped_column(
+        sql.Integer, index=True, default=None
+    )
+
+    @classmethod
+    def delete_expired(cls, now: Optional[int] = None) -> int:
+        """Delete all revoked tokens that are expired anyway (does not commit!).
+
+        Returns the number of deleted rows.
+        """
+        if now is None:
+            now = int(time())
+        result = DB.session.execute(
+            delete(cls).where(cls.expires_at.is_not(None), cls.expires_at < now)
+        )
+        return result.rowcount
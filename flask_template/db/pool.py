@@ -0,0 +1,261 @@
+"""Module containing the connection pool configuration and pool metrics.
+
+The ``SQLALCHEMY_POOL`` config is merged with defaults for the database backend
+of each engine (default engine and binds) and converted to engine options.
+Options set explicitly in ``SQLALCHEMY_ENGINE_OPTIONS`` (or in a bind config)
+take precedence.
+"""
+
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, Mapping, Optional, Type
+
+from flask import Flask, current_app
+from sqlalchemy import exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.pool import (
+    AssertionPool,
+    NullPool,
+    Pool,
+    QueuePool,
+    SingletonThreadPool,
+    StaticPool,
+)
+
+from .db import DB
+
+POOL_CLASSES: Dict[str, Type[Pool]] = {
+    "QueuePool": QueuePool,
+    "NullPool": NullPool,
+    "StaticPool": StaticPool,
+    "SingletonThreadPool": SingletonThreadPool,
+    "AssertionPool": AssertionPool,
+}
+
+# options only supported by the QueuePool
+_QUEUE_POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_use_lifo")
+
+
+def _is_int(minimum: int) -> Callable[[Any], bool]:
+    return lambda v: isinstance(v, int) and not isinstance(v, bool) and v >= minimum
+
+
+"""The supported pool options with a validator for their values."""
+POOL_OPTIONS: Dict[str, Callable[[Any], bool]] = {
+    "poolclass": lambda v: v in POOL_CLASSES,
+    "pool_size": _is_int(0),  # 0 means no limit
+    "max_overflow": _is_int(-1),  # -1 means no limit
+    "pool_timeout": lambda v: isinstance(v, (int, float)) and v > 0,  # seconds
+    "pool_recycle": _is_int(-1),  # seconds, -1 to disable
+    "pool_pre_ping": lambda v: isinstance(v, bool),
+    "pool_use_lifo": lambda v: isinstance(v, bool),
+}
+
+"""Pool defaults per database backend (the backend name of the url)."""
+BACKEND_POOL_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "postgresql": {
+        "poolclass": "QueuePool",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,  # below typical idle timeouts of proxies and firewalls
+        "pool_pre_ping": True,  # detect stale connections before using them
+        "pool_use_lifo": True,  # lets surplus connections idle out after bursts
+    },
+    "mysql": {
+        "poolclass": "QueuePool",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": 3600,  # below the default wait_timeout of 8h
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    },
+    "sqlite": {
+        "poolclass": "QueuePool",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,  # local files cannot go stale
+    },
+}
+BACKEND_POOL_DEFAULTS["mariadb"] = BACKEND_POOL_DEFAULTS["mysql"]
+
+
+def validate_pool_config(pool_config: Mapping[str, Any]):
+    """Validate the ``SQLALCHEMY_POOL`` config.
+
+    Raises:
+        ValueError: if an option or its value is not supported
+    """
+    for name, value in pool_config.items():
+        validate = POOL_OPTIONS.get(name)
+        if validate is None:
+            raise ValueError(f"The pool option '{name}' is not supported.")
+        if value is not None and not validate(value):
+            raise ValueError(f"Invalid value {value!r} for pool option '{name}'.")
+    poolclass = pool_config.get("poolclass")
+    if poolclass not in (None, "QueuePool"):
+        for name in _QUEUE_POOL_OPTIONS:
+            if pool_config.get(name) is not None:
+                raise ValueError(f"The pool option '{name}' requires a QueuePool.")
+
+
+def pool_engine_options(
+    url: "str | URL", pool_config: Mapping[str, Any], *, metrics: bool = True
+) -> Dict[str, Any]:
+    """Build the pool related engine options for the database url.
+
+    Options set to None in the pool config use the backend default.
+
+    Args:
+        url (str|URL): the database url of the engine
+        pool_config (Mapping[str, Any]): the (validated) pool config
+        metrics (bool, optional): use a pool that records checkout metrics.
+            Defaults to True.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}  # in memory databases must use a StaticPool
+    options = dict(BACKEND_POOL_DEFAULTS.get(backend, {"pool_pre_ping": True}))
+    options.update({k: v for k, v in pool_config.items() if v is not None})
+
+    poolclass = POOL_CLASSES[options.pop("poolclass", "QueuePool")]
+    if poolclass is not QueuePool:
+        for name in _QUEUE_POOL_OPTIONS:
+            options.pop(name, None)
+    elif metrics:
+        poolclass = InstrumentedQueuePool
+    options["poolclass"] = poolclass
+    return options
+
+
+def _merge_pool_options(engine_options: Dict[str, Any], pool_options: Dict[str, Any]):
+    """Add the pool options not set explicitly in the engine options.
+
+    A pool class set in the engine options is kept. The sizing options of the
+    QueuePool are left out if it is not a QueuePool (other pools reject them).
+    """
+    poolclass = engine_options.get("poolclass")
+    if poolclass is not None:
+        excluded = {"poolclass"}
+        if not (isinstance(poolclass, type) and issubclass(poolclass, QueuePool)):
+            excluded.update(_QUEUE_POOL_OPTIONS)
+        pool_options = {k: v for k, v in pool_options.items() if k not in excluded}
+    for key, value in pool_options.items():
+        engine_options.setdefault(key, value)
+
+
+def apply_pool_config(app: Flask):
+    """Merge the pool config into the engine options of the app.
+
+    Must be called before ``DB.init_app``.
+    """
+    pool_config = app.config.get("SQLALCHEMY_POOL") or {}
+    validate_pool_config(pool_config)
+    metrics = app.config.get("SQLALCHEMY_POOL_METRICS", True)
+
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI")
+    if uri:
+        engine_options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+        _merge_pool_options(
+            engine_options, pool_engine_options(uri, pool_config, metrics=metrics)
+        )
+
+    binds = app.config.get("SQLALCHEMY_BINDS") or {}
+    for bind_key, bind in list(binds.items()):
+        bind_options = dict(bind) if isinstance(bind, Mapping) else {"url": bind}
+        if "url" not in bind_options:
+            continue
+        _merge_pool_options(
+            bind_options,
+            pool_engine_options(bind_options["url"], pool_config, metrics=metrics),
+        )
+        binds[bind_key] = bind_options
+
+
+@dataclass
+class PoolStats:
+    """Checkout metrics of a connection pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0  # seconds
+    wait_max: float = 0.0  # seconds
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def record_checkout(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+
+    def record_timeout(self, seconds: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "waitTotalSeconds": self.wait_total,
+            "waitMeanSeconds": (
+                self.wait_total / self.checkouts if self.checkouts else 0.0
+            ),
+            "waitMaxSeconds": self.wait_max,
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long checkouts wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout(perf_counter() - start)
+            raise
+        self.stats.record_checkout(perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats  # keep the stats when the engine is disposed
+        return pool
+
+
+def get_pool_stats(app: Optional[Flask] = None) -> Dict[str, Dict[str, Any]]:
+    """Get the pool status and checkout metrics of all engines of the app.
+
+    The engine of the default database uses the key ``"default"``.
+    """
+    app = app or current_app
+    result: Dict[str, Dict[str, Any]] = {}
+    with app.app_context():
+        engines = dict(DB.engines)
+    for bind_key, engine in engines.items():
+        pool = engine.pool
+        status: Dict[str, Any] = {"poolClass": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update(
+                size=pool.size(),
+                checkedIn=pool.checkedin(),
+                checkedOut=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        if isinstance(pool, InstrumentedQueuePool):
+            status.update(pool.stats.as_dict())
+        result["default" if bind_key is None else bind_key] = status
+    return result
@@ -0,0 +1,126 @@
+"""Module containing read/write splitting of the ``DB`` session on replicas.
+
+Configure the replicas with ``SQLALCHEMY_REPLICA_URIS``. Select statements on
+the default database are routed to a replica in views marked with the
+``read_only`` decorator (or in all views and cli commands if
+``SQLALCHEMY_REPLICA_AUTO_ROUTING`` is set). After the first write the session
+sticks to the primary database until the end of the request, so that the
+request always reads its own writes.
+"""
+
+from functools import wraps
+from itertools import cycle
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from flask import Flask, current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import Engine
+
+RT = TypeVar("RT")
+
+EXTENSION_NAME = "db_replicas"
+
+"""The bind keys of the replicas are this prefix followed by their index."""
+REPLICA_BIND_PREFIX = "replica_"
+
+STRATEGIES = ("round_robin", "least_connections")
+
+# key in session.info marking that the session has written to the primary
+# database
+_STICKY_PRIMARY = "flask_template_sticky_primary"
+# flag in g marking the current view as read only
+_READ_ONLY_FLAG = "db_read_only"
+
+
+class ReplicaRouter:
+    """Chooses the replica engine for read only queries of a flask app."""
+
+    def __init__(self, bind_keys: List[str], strategy: str, auto_routing: bool):
+        self.bind_keys = bind_keys
+        self.strategy = strategy
+        self.auto_routing = auto_routing
+        self._round_robin = cycle(bind_keys)
+
+    def choose(self, engines: Dict[Optional[str], Engine]) -> Engine:
+        """Choose a replica engine according to the configured strategy."""
+        if self.strategy == "least_connections":
+            return min(
+                (engines[key] for key in self.bind_keys), key=_checked_out_connections
+            )
+        return engines[next(self._round_robin)]
+
+
+def _checked_out_connections(engine: Engine) -> int:
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else 0
+
+
+def _is_read_only_clause(clause: Any) -> bool:
+    if clause is None or not getattr(clause, "is_select", False):
+        return False
+    return getattr(clause, "_for_update_arg", None) is None
+
+
+class RoutingSession(Session):
+    """Session routing read only queries of the default database to replicas."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or not has_app_context():
+            return engine
+        router: Optional[ReplicaRouter] = current_app.extensions.get(EXTENSION_NAME)
+        if router is None:
+            return engine
+        engines = self._db.engines
+        if engine is not engines.get(None):
+            return engine  # only route queries of the default database
+
+        if not _is_read_only_clause(clause) or self._flushing:
+            self.info[_STICKY_PRIMARY] = True
+            return engine
+        if self.info.get(_STICKY_PRIMARY) or self.new or self.dirty or self.deleted:
+            return engine
+        if router.auto_routing or g.get(_READ_ONLY_FLAG, False):
+            return router.choose(engines)
+        return engine
+
+
+def read_only(func: Callable[..., RT]) -> Callable[..., RT]:
+    """Decorator marking a view as read only, routing its queries to replicas.
+
+    Writes are still possible, but all following queries of the request then
+    use the primary database.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> RT:
+        g.setdefault(_READ_ONLY_FLAG, True)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def register_replicas(app: Flask):
+    """Add the read replicas as binds to the app config.
+
+    Must be called before ``DB.init_app``.
+    """
+    uris = app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+    if not uris:
+        return
+    strategy = app.config.get("SQLALCHEMY_REPLICA_STRATEGY", "round_robin")
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown replica strategy '{strategy}', use one of {', '.join(STRATEGIES)}."
+        )
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    bind_keys: List[str] = []
+    for index, uri in enumerate(uris):
+        bind_key = f"{REPLICA_BIND_PREFIX}{index}"
+        binds[bind_key] = uri
+        bind_keys.append(bind_key)
+    app.extensions[EXTENSION_NAME] = ReplicaRouter(
+        bind_keys,
+        strategy=strategy,
+        auto_routing=app.config.get("SQLALCHEMY_REPLICA_AUTO_ROUTING", False),
+    )
@@ -0,0 +1,72 @@
+"""Module containing the pragma profile applied to new SQLite connections."""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+
+def _one_of(*choices: str) -> Callable[[Any], bool]:
+    def validate(value: Any) -> bool:
+        return isinstance(value, str) and value.upper() in choices
+
+    return validate
+
+
+def _integer(minimum: Optional[int] = None) -> Callable[[Any], bool]:
+    def validate(value: Any) -> bool:
+        if not isinstance(value, int) or isinstance(value, bool):
+            return False
+        return minimum is None or value >= minimum
+
+    return validate
+
+
+"""The supported pragmas with a validator for their values.
+
+Only these pragmas can be set with the ``SQLITE_PRAGMAS`` config, as pragma
+statements cannot use bound parameters.
+"""
+SUPPORTED_PRAGMAS: Dict[str, Callable[[Any], bool]] = {
+    "journal_mode": _one_of("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+    "synchronous": _one_of("OFF", "NORMAL", "FULL", "EXTRA"),
+    "mmap_size": _integer(minimum=0),
+    "cache_size": _integer(),  # negative values are in KiB
+    "temp_store": _one_of("DEFAULT", "FILE", "MEMORY"),
+    "busy_timeout": _integer(minimum=0),  # milliseconds
+    "wal_autocheckpoint": _integer(minimum=0),  # pages
+    "journal_size_limit": _integer(minimum=-1),  # bytes
+}
+
+
+def sqlite_pragma_statements(pragmas: Optional[Mapping[str, Any]]) -> List[str]:
+    """Validate the pragma profile and build the pragma statements to execute.
+
+    Pragmas with the value None are skipped.
+
+    Raises:
+        ValueError: if a pragma or its value is not supported
+    """
+    statements: List[str] = []
+    # journal_mode first, as it may need a lock on the database
+    for name, value in sorted(
+        (pragmas or {}).items(), key=lambda item: item[0] != "journal_mode"
+    ):
+        if value is None:
+            continue
+        validate = SUPPORTED_PRAGMAS.get(name)
+        if validate is None:
+            raise ValueError(f"The SQLite pragma '{name}' is not supported.")
+        if not validate(value):
+            raise ValueError(f"Invalid value {value!r} for SQLite pragma '{name}'.")
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def execute_pragmas(dbapi_connection, statements: List[str]):
+    """Execute the pragma statements on a new dbapi connection."""
+    if not statements:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for statement in statements:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
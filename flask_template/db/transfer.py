@@ -0,0 +1,218 @@
+"""Module containing streaming import and export of tables (CSV and NDJSON).
+
+Rows are read and written one at a time, so the memory usage does not depend
+on the size of the file or table. Files ending with ``.gz`` are (de)compressed
+on the fly.
+"""
+
+import csv
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from decimal import Decimal
+from io import TextIOWrapper
+from pathlib import Path
+from typing import IO, Any, Callable, Container, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Mapper
+
+from .bulk import BulkResult, bulk_insert, bulk_upsert
+from .db import DB, MODEL
+
+FORMATS = ("csv", "ndjson")
+
+
+def get_model(name: str) -> type:
+    """Get a registered model class by its class name or table name.
+
+    Raises:
+        KeyError: if no model with that name is registered
+    """
+    for mapper in MODEL.registry.mappers:
+        table_name = getattr(mapper.local_table, "name", None)
+        if name in (mapper.class_.__name__, table_name):
+            return mapper.class_
+    raise KeyError(name)
+
+
+def model_names() -> List[str]:
+    """Get the class names of all registered models."""
+    return sorted(mapper.class_.__name__ for mapper in MODEL.registry.mappers)
+
+
+def guess_format(path: str) -> Optional[str]:
+    """Guess the file format from the file name (ignoring a ``.gz`` suffix)."""
+    suffixes = [s.lower() for s in Path(path).suffixes if s.lower() != ".gz"]
+    if not suffixes:
+        return None
+    suffix = suffixes[-1].lstrip(".")
+    if suffix in ("jsonl", "ndjson"):
+        return "ndjson"
+    return suffix if suffix in FORMATS else None
+
+
+@contextmanager
+def open_binary(path: str, mode: str) -> Iterator[Tuple[IO[bytes], IO[bytes]]]:
+    """Open the file (``-`` for stdin/stdout) in binary mode.
+
+    Files ending with ``.gz`` are (de)compressed. Yields the (uncompressed) file
+    and the underlying raw file, which can be used to report the progress in
+    bytes.
+    """
+    if path == "-":
+        std = (sys.stdin if mode == "r" else sys.stdout).buffer
+        yield std, std
+        if mode == "w":
+            std.flush()
+        return
+    with open(path, mode + "b") as raw:
+        if path.lower().endswith(".gz"):
+            with gzip.GzipFile(fileobj=raw, mode=mode + "b") as file:
+                yield file, raw
+        else:
+            yield raw, raw
+
+
+def _column_converters(mapper: Mapper) -> Dict[str, Callable[[Any], Any]]:
+    # converters from (csv) strings and json values to the python type of the
+    # column
+    converters: Dict[str, Callable[[Any], Any]] = {}
+    for attr in mapper.column_attrs:
+        try:
+            python_type = attr.columns[0].type.python_type
+        except NotImplementedError:
+            continue
+        if python_type is bool:
+            converters[attr.key] = lambda v: (
+                v if isinstance(v, bool) else v.lower() in ("1", "true", "yes")
+            )
+        elif python_type in (datetime, date, time):
+            converters[attr.key] = lambda v, t=python_type: (
+                t.fromisoformat(v) if isinstance(v, str) else v
+            )
+        elif python_type in (int, float, Decimal):
+            converters[attr.key] = lambda v, t=python_type: (
+                t(v) if isinstance(v, str) else v
+            )
+    return converters
+
+
+def _convert_row(
+    row: Dict[str, Any],
+    converters: Dict[str, Callable[[Any], Any]],
+    empty_is_null: Container[str],
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for key, value in row.items():
+        if value is None or (value == "" and key in empty_is_null):
+            result[key] = None
+            continue
+        converter = converters.get(key)
+        result[key] = converter(value) if converter is not None else value
+    return result
+
+
+def read_rows(file: IO[bytes], file_format: str, model: type) -> Iterator[Dict[str, Any]]:
+    """Read the rows of the file one by one, converted to the column types.
+
+    Empty CSV values of nullable columns are imported as NULL.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format '{file_format}'.")
+    mapper: Mapper = inspect(model)
+    converters = _column_converters(mapper)
+    nullable = {attr.key for attr in mapper.column_attrs if attr.columns[0].nullable}
+    text = TextIOWrapper(file, encoding="utf-8", newline="")
+    try:
+        if file_format == "csv":
+            for row in csv.DictReader(text):
+                yield _convert_row(row, converters, empty_is_null=nullable)
+        else:
+            for line in text:
+                if line.strip():
+                    yield _convert_row(json.loads(line), converters, empty_is_null=())
+    finally:
+        text.detach()  # do not close the underlying file
+
+
+def import_rows(
+    model: type,
+    file: IO[bytes],
+    file_format: str,
+    *,
+    batch_size: int = 1000,
+    upsert: bool = False,
+    on_batch: Optional[Callable[[BulkResult], None]] = None,
+) -> BulkResult:
+    """Import the rows of the file into the table of the model.
+
+    Every batch is committed.
+    """
+    bulk = bulk_upsert if upsert else bulk_insert
+    return bulk(
+        model,
+        read_rows(file, file_format, model),
+        chunk_size=batch_size,
+        commit=True,
+        on_chunk=on_batch,
+    )
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def export_rows(
+    model: type,
+    file: IO[bytes],
+    file_format: str,
+    *,
+    batch_size: int = 1000,
+    on_batch: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Export all rows of the table of the model to the file.
+
+    The rows are ordered by primary key. Returns the number of exported rows.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format '{file_format}'.")
+    mapper: Mapper = inspect(model)
+    columns: List[Tuple[str, Any]] = [
+        (attr.key, attr.columns[0]) for attr in mapper.column_attrs
+    ]
+    keys = [key for key, _ in columns]
+    statement = select(*(column for _, column in columns)).order_by(*mapper.primary_key)
+    result = DB.session.execute(
+        statement, execution_options={"yield_per": batch_size, "stream_results": True}
+    )
+    text = TextIOWrapper(file, encoding="utf-8", newline="", write_through=False)
+    count = 0
+    try:
+        if file_format == "csv":
+            writer = csv.writer(text)
+            writer.writerow(keys)
+            for partition in result.partitions():
+                writer.writerows([_json_value(v) for v in row] for row in partition)
+                count += len(partition)
+                if on_batch is not None:
+                    on_batch(count)
+        else:
+            for partition in result.partitions():
+                text.writelines(
+                    json.dumps(dict(zip(keys, map(_json_value, row)))) + "\n"
+                    for row in partition
+                )
+                count += len(partition)
+                if on_batch is not None:
+                    on_batch(count)
+    finally:
+        text.flush()
+        text.detach()  # do not close the underlying file
+    return count
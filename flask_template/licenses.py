@@ -1,13 +1,104 @@
-from flask import Blueprint, Flask, render_template
+"""Module serving the licenses of the dependencies.
+
+The licenses page only changes when ``invoke update-licenses`` regenerates the
+template, so it is rendered once per script root (the url prefix of the static
+files) and served from a precompressed buffer with ETag and ``304 Not Modified``
+support. ``flask prerender-licenses`` (or ``invoke prerender-licenses``) renders
+the page at build time into the static folder, then it is not rendered at
+runtime.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import click
+from flask import Blueprint, Flask, current_app, render_template, request
+from flask.cli import with_appcontext
+
+from .util.cache import MISSING, LRUCache
+from .util.precompressed import PrecompressedContent, make_precompressed_response
 
 LICENSE_BLP = Blueprint("licenses", __name__, url_prefix="/licenses")
 
+EXTENSION_NAME = "licenses"
+
+TEMPLATE = "included_licenses.html"
+
+"""The templates the licenses page is rendered from."""
+TEMPLATE_FILES = ("included_licenses.html", "licenses.html")
+
+"""The page rendered at build time (with precompressed siblings)."""
+PRERENDERED_PATH = Path(__file__).parent / "static" / "licenses" / "index.html"
+
+
+def render_licenses() -> PrecompressedContent:
+    """Render the licenses page for the script root of the current request."""
+    return PrecompressedContent.from_bytes(
+        render_template(TEMPLATE).encode(), "text/html"
+    )
+
+
+def _load_prerendered(app: Flask) -> Optional[PrecompressedContent]:
+    if not PRERENDERED_PATH.is_file():
+        return None
+    template_folder = Path(app.root_path) / (app.template_folder or "templates")
+    template_mtime = max(
+        (template_folder / name).stat().st_mtime for name in TEMPLATE_FILES
+    )
+    if PRERENDERED_PATH.stat().st_mtime < template_mtime:
+        app.logger.warning(
+            "The prerendered licenses page is older than the templates and is ignored "
+            "(run 'flask prerender-licenses' to update it)."
+        )
+        return None
+    return PrecompressedContent.from_file(PRERENDERED_PATH, "text/html")
+
 
 @LICENSE_BLP.route("/")
 def show_licenses():
     """Route for displaying licenses of dependencies."""
-    return render_template("included_licenses.html")
+    cache: Optional[LRUCache[str, PrecompressedContent]] = current_app.extensions.get(
+        EXTENSION_NAME
+    )
+    if cache is None:
+        return render_template(TEMPLATE)
+    # the urls of the static files depend on the script root
+    script_root = request.script_root
+    content = cache.get(script_root, MISSING)
+    if content is MISSING:
+        content = render_licenses()
+        cache.set(script_root, content)
+    return make_precompressed_response(content)
+
+
+@click.command("prerender-licenses")
+@with_appcontext
+def prerender_licenses():
+    """Render the licenses page into the static folder to serve it as is."""
+    # the page is served under the root script root
+    with current_app.test_request_context("/"):
+        content = render_licenses()
+    PRERENDERED_PATH.parent.mkdir(parents=True, exist_ok=True)
+    PRERENDERED_PATH.write_bytes(content.data)
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        compressed = PRERENDERED_PATH.with_name(PRERENDERED_PATH.name + suffix)
+        if encoding in content.variants:
+            compressed.write_bytes(content.variants[encoding])
+        else:
+            compressed.unlink(missing_ok=True)  # e.g. brotli is not installed
+    click.echo(f"Prerendered licenses page to '{PRERENDERED_PATH}'.")
 
 
 def register_licenses(app: Flask):
+    """Register the licenses page (prerendered if ``LICENSES_PRERENDER``)."""
     app.register_blueprint(LICENSE_BLP)
+    app.cli.add_command(prerender_licenses)
+    if not app.config.get("LICENSES_PRERENDER", True):
+        return
+    # rendered pages per script root (bounded, the script root may be set by
+    # proxies)
+    cache: LRUCache[str, PrecompressedContent] = LRUCache(maxsize=16)
+    prerendered = _load_prerendered(app)
+    if prerendered is not None:
+        cache.set("", prerendered)
+    app.extensions[EXTENSION_NAME] = cache
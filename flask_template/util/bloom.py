@@ -0,0 +1,62 @@
+"""Module containing a compact bloom filter for fast negative lookups."""
+
+from hashlib import blake2b
+from math import ceil, log
+from typing import Iterable, Iterator
+
+
+class BloomFilter:
+    """A bloom filter backed by a bytearray.
+
+    A bloom filter can answer "definitely not contained" without false
+    negatives. Positive answers may be false positives with (roughly) the
+    configured error rate as long as no more than ``capacity`` items are added.
+
+    Args:
+        capacity (int): the expected maximum number of items
+        error_rate (float, optional): the target false positive rate.
+            Defaults to 0.001.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0:
+            raise ValueError("The capacity must be greater than 0.")
+        if not (0 < error_rate < 1):
+            raise ValueError("The error rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, ceil(-capacity * log(error_rate) / (log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # double hashing with two 64 bit halves of a single digest
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % size
+
+    def add(self, item: str):
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def is_saturated(self) -> bool:
+        """True if more items than the capacity were added to the filter."""
+        return self.count > self.capacity
@@ -0,0 +1,120 @@
+"""Module containing small in-process caching utilities."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+KT = TypeVar("KT", bound=Hashable)
+VT = TypeVar("VT")
+
+"""Sentinel for cache misses (``None`` may be a valid cached value)."""
+MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The ratio of cache hits to all cache lookups."""
+        lookups = self.hits + self.misses
+        return (self.hits / lookups) if lookups else 0.0
+
+    def reset(self):
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+
+class LRUCache(Generic[KT, VT]):
+    """A thread safe, bounded LRU cache with an optional time to live.
+
+    Args:
+        maxsize (int): the maximum number of entries to keep (must be > 0)
+        ttl (float, optional): the time in seconds an entry stays valid.
+            Defaults to None (no expiry).
+        clock (Callable[[], float], optional): the clock used for the ttl.
+            Defaults to time.monotonic.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("The maxsize of a cache must be greater than 0.")
+        self.maxsize = maxsize
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.stats = CacheStats()
+        self._clock = clock
+        self._lock = Lock()
+        self._data: "OrderedDict[KT, Tuple[Optional[float], VT]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: KT) -> bool:
+        return self.get(key, MISSING, record_stats=False) is not MISSING
+
+    def get(self, key: KT, default: Any = None, *, record_stats: bool = True) -> Any:
+        """Get the cached value for key (default if not cached or expired)."""
+        with self._lock:
+            entry = self._data.get(key, MISSING)
+            if entry is not MISSING:
+                expires, value = entry
+                if expires is None or expires > self._clock():
+                    self._data.move_to_end(key)
+                    if record_stats:
+                        self.stats.hits += 1
+                    return value
+                del self._data[key]
+                self.stats.evictions += 1
+            if record_stats:
+                self.stats.misses += 1
+            return default
+
+    def set(self, key: KT, value: VT, *, ttl: Optional[float] = None):
+        """Cache value under key (evicting the least recently used entries)."""
+        ttl = ttl if ttl is not None else self.ttl
+        expires = (self._clock() + ttl) if ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: KT) -> bool:
+        """Remove key from the cache. Returns True if the key was cached."""
+        with self._lock:
+            if self._data.pop(key, MISSING) is MISSING:
+                return False
+            self.stats.invalidations += 1
+            return True
+
+    def delete_where(self, predicate: Callable[[KT, VT], bool]) -> int:
+        """Remove all entries matching the predicate.
+
+        Returns the number of removed entries.
+        """
+        with self._lock:
+            keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for key in keys:
+                del self._data[key]
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self.stats.invalidations += len(self._data)
+            self._data.clear()
@@ -5,17 +5,65 @@ from logging import WARNING, INFO
 
 from .sqlalchemy_config import SQLAchemyProductionConfig, SQLAchemyDebugConfig
 from .smorest_config import SmorestProductionConfig, SmorestDebugConfig
+from .jwt_config import JWTProductionConfig, JWTDebugConfig
 
 
-class ProductionConfig(SQLAchemyProductionConfig, SmorestProductionConfig):
+class ProductionConfig(
+    SQLAchemyProductionConfig, SmorestProductionConfig, JWTProductionConfig
+):
     ENV = "production"
     SECRET_KEY = urandom(32)
 
     REVERSE_PROXY_COUNT = 0
+    # only trust the X-Forwarded-* headers of requests from these networks
+    # (e.g. ("10.0.0.0/8",), the proxy count defaults to 1 if set)
+    REVERSE_PROXY_TRUSTED_CIDRS = ()
+
+    # request metrics of the api views in the Prometheus text format
+    # the endpoint is not authenticated, only enable it if access to
+    # METRICS_PATH is restricted (e.g. in the reverse proxy or to an internal
+    # network)
+    METRICS_ENABLED = False
+    METRICS_PATH = "/metrics"  # None to disable the endpoint
+    METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    # CORS policies per path prefix (see flask_template/util/cors.py)
+    # CONFIGURE THIS TO YOUR PROJECTS NEEDS!
+    CORS_MAX_AGE = 600  # seconds browsers may cache preflight responses
+    CORS_POLICIES = {
+        "api": {
+            "path_prefix": "/api/",
+            "origins": "*",
+            "expose_headers": ("ETag", "Link"),
+        },
+        "licenses": {
+            "path_prefix": "/licenses/",
+            "origins": "*",
+            "methods": ("GET", "HEAD", "OPTIONS"),
+        },
+    }
+
+    # cache of the serialized responses of views decorated with cache_response
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_SIZE = 1024  # responses per process
+    RESPONSE_CACHE_TTL = 300  # seconds, 0 for no expiry
+
+    # external urls of endpoints without arguments memoized per url root
+    # (0 to disable)
+    EXTERNAL_URL_CACHE_SIZE = 1024
 
     DEBUG = False
     TESTING = False
 
+    # register most components on first use, None: only in the flask CLI
+    LAZY_LOADING = None
+
+    # load the translation catalogs of all supported locales on startup
+    BABEL_PRELOAD_TRANSLATIONS = True
+
+    # render the licenses page once and serve it precompressed
+    LICENSES_PRERENDER = True
+
     JSON_SORT_KEYS = False
     JSONIFY_PRETTYPRINT_REGULAR = False
 
@@ -27,9 +75,22 @@ class ProductionConfig(SQLAchemyProductionConfig, SmorestProductionConfig):
     DEFAULT_LOG_DATE_FORMAT = None
 
 
-class DebugConfig(ProductionConfig, SQLAchemyDebugConfig, SmorestDebugConfig):
+class DebugConfig(
+    ProductionConfig, SQLAchemyDebugConfig, SmorestDebugConfig, JWTDebugConfig
+):
     ENV = "development"
     DEBUG = True
     SECRET_KEY = "debug_secret"  # FIXME make sure this NEVER! gets used in production!!!
 
     DEFAULT_LOG_SEVERITY = INFO
+
+    CORS_POLICIES = {
+        **ProductionConfig.CORS_POLICIES,
+        "debug": {"path_prefix": "/debug/", "origins": "*"},
+    }
+
+    LICENSES_PRERENDER = False  # show changes of the templates immediately
+
+    METRICS_ENABLED = True
+
+    DEBUG_PROFILER_HISTORY_SIZE = 20  # profiled requests kept for the debug page
@@ -0,0 +1,22 @@
+class JWTProductionConfig:
+    # cache for user objects loaded from the jwt identity
+    JWT_USER_CACHE_ENABLED = True
+    JWT_USER_CACHE_SIZE = 1024
+    JWT_USER_CACHE_TTL = 60  # seconds
+    # set to "sqlite" to share cached users between processes
+    JWT_USER_CACHE_BACKEND = None
+    JWT_USER_CACHE_SHARED_TTL = 300  # seconds
+    JWT_USER_CACHE_SQLITE_PATH = None  # defaults to a file in the instance folder
+
+    # revoked tokens (bloom filter prefilter in front of the RevokedToken table)
+    JWT_REVOCATION_BLOOM_CAPACITY = 100_000
+    JWT_REVOCATION_BLOOM_ERROR_RATE = 0.001
+    JWT_REVOCATION_CACHE_SIZE = 4096
+    JWT_REVOCATION_REFRESH_INTERVAL = 10  # seconds
+    # rebuild the bloom filter without expired tokens (deleted with the
+    # "flask compact-revoked-tokens" command)
+    JWT_REVOCATION_REBUILD_INTERVAL = 3600  # seconds, 0 to disable
+
+
+class JWTDebugConfig(JWTProductionConfig):
+    pass
@@ -0,0 +1,263 @@
+"""Module containing the loading of config files and environment overrides.
+
+Parsed config files are cached per process by path, modification time and size,
+so creating many apps (e.g. in test suites or pre-fork servers) only stats the
+files instead of reading and parsing them again. Python config files are
+therefore executed only once per modification and must not depend on state
+that changes between apps (use environment variable overrides instead).
+
+Environment variables ``<PREFIX>_<KEY>`` override single config keys. They are
+loaded with ``app.config.from_prefixed_env`` (values are parsed as json) and
+must match the type of the value they override (e.g.
+``FLASK_TEMPLATE_METRICS_ENABLED=false``). Nested keys are separated by ``__``
+(e.g. ``FLASK_TEMPLATE_SQLALCHEMY_POOL__pool_size=10``).
+"""
+
+import json
+import re
+from copy import deepcopy
+from datetime import timedelta
+from os import PathLike, environ, stat
+from pathlib import Path
+from threading import Lock
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import click
+from flask import Flask, current_app
+from flask.cli import with_appcontext
+from tomli import loads as loads_toml
+
+from ..cache import MISSING
+
+SOURCES_EXTENSION_NAME = "config_sources"
+
+"""Keys whose values are masked when dumping the config."""
+SECRET_KEY_PATTERN = re.compile(
+    r"SECRET|PASSWORD|PASSWD|PRIVATE_KEY|API_KEY|CREDENTIAL|_TOKEN$"
+)
+_URL_PASSWORD_PATTERN = re.compile(r"(://[^:/@\s]*:)[^@/\s]+@")
+
+_BOOL_VALUES = {
+    "1": True,
+    "true": True,
+    "yes": True,
+    "on": True,
+    "0": False,
+    "false": False,
+    "no": False,
+    "off": False,
+}
+
+# resolved path -> ((mtime_ns, size), parsed uppercase keys)
+_FileStamp = Tuple[int, int]
+_PARSED_FILES: Dict[str, Tuple[_FileStamp, Dict[str, Any]]] = {}
+_PARSED_FILES_LOCK = Lock()
+
+
+def _parse_python(path: Path, content: bytes) -> Dict[str, Any]:
+    # same as flask.Config.from_pyfile
+    module = ModuleType("config")
+    module.__file__ = str(path)
+    exec(compile(content, str(path), "exec"), module.__dict__)
+    return {key: getattr(module, key) for key in dir(module) if key.isupper()}
+
+
+def _parse_json(path: Path, content: bytes) -> Dict[str, Any]:
+    return {k: v for k, v in json.loads(content).items() if k.isupper()}
+
+
+def _parse_toml(path: Path, content: bytes) -> Dict[str, Any]:
+    return {k: v for k, v in loads_toml(content.decode()).items() if k.isupper()}
+
+
+PARSERS: Dict[str, Callable[[Path, bytes], Dict[str, Any]]] = {
+    ".json": _parse_json,
+    ".toml": _parse_toml,
+}
+
+
+def _read_config_file(path: Path) -> Optional[Dict[str, Any]]:
+    """Get the parsed config file from the cache (None if it does not exist)."""
+    key = str(path.resolve())
+    try:
+        file_stat = stat(key)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+    with _PARSED_FILES_LOCK:
+        cached = _PARSED_FILES.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    parser = PARSERS.get(path.suffix.lower(), _parse_python)
+    try:
+        parsed = parser(path, Path(key).read_bytes())
+    except OSError as err:
+        err.strerror = f"Unable to load configuration file ({err.strerror})"
+        raise
+    with _PARSED_FILES_LOCK:
+        _PARSED_FILES[key] = (stamp, parsed)
+    return parsed
+
+
+def clear_config_file_cache():
+    """Clear the cache of parsed config files."""
+    with _PARSED_FILES_LOCK:
+        _PARSED_FILES.clear()
+
+
+def get_config_sources(app: Flask) -> Dict[str, str]:
+    """Get the sources of the config keys that do not use the default value."""
+    return app.extensions.setdefault(SOURCES_EXTENSION_NAME, {})
+
+
+def load_config_file(app: Flask, filename: Union[str, PathLike]) -> bool:
+    """Load a python, json or toml config file (relative to the instance path).
+
+    Returns False if the file does not exist.
+    """
+    path = Path(app.config.root_path) / filename
+    parsed = _read_config_file(path)
+    if parsed is None:
+        return False
+    # copy the values as the app may modify them (e.g. merge dicts)
+    app.config.update(deepcopy(parsed))
+    sources = get_config_sources(app)
+    for key in parsed:
+        sources[key] = str(path)
+    return True
+
+
+def _get_nested(config: Dict[str, Any], path: List[str]) -> Any:
+    target: Any = config
+    for part in path[:-1]:
+        target = target.get(part) if isinstance(target, dict) else None
+    return target.get(path[-1]) if isinstance(target, dict) else None
+
+
+def _check_env_value(name: str, value: Any, current: Any) -> Any:
+    """Check the value parsed by flask against the type of the current value."""
+    raw = environ[name]
+    if isinstance(current, (str, bytes)):
+        return raw  # flask parses e.g. "123" as int
+    if isinstance(current, bool) and raw.lower() in _BOOL_VALUES:
+        return _BOOL_VALUES[raw.lower()]
+    value = _coerce(value, current)
+    if current is not None and type(value) is not type(current):
+        raise ValueError(
+            f"Environment variable {name} must be of type {type(current).__name__}, "
+            f"got {raw!r}."
+        )
+    return value
+
+
+def _coerce(value: Any, current: Any) -> Any:
+    """Convert a json value to the type of the current value where sensible."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, list)):
+        return value
+    if isinstance(current, timedelta) and not isinstance(value, list):
+        return timedelta(seconds=value)
+    if isinstance(current, float) and isinstance(value, int):
+        return float(value)
+    if isinstance(current, tuple) and isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def load_env_overrides(app: Flask, prefix: str) -> List[str]:
+    """Override config keys with the ``<prefix>_<KEY>`` environment variables.
+
+    The variables are loaded with ``app.config.from_prefixed_env`` and checked
+    against the type of the value they override. Returns the overridden keys.
+    """
+    config = app.config
+    settings_var = f"{prefix}_SETTINGS"
+    names = [
+        name
+        for name in sorted(environ)
+        if name.startswith(f"{prefix}_") and name != settings_var
+    ]
+    paths = {name: name[len(prefix) + 1 :].split("__") for name in names}
+    current = {name: _get_nested(config, path) for name, path in paths.items()}
+    for key in {path[0] for path in paths.values() if len(path) > 1}:
+        if isinstance(config.get(key), dict):
+            # flask updates nested dicts in place, they may be shared with the
+            # default config class
+            config[key] = deepcopy(config[key])
+    settings = config.get("SETTINGS", MISSING)
+    config.from_prefixed_env(prefix)
+    if settings_var in environ:
+        # the settings file is loaded separately and is not a config key
+        if settings is MISSING:
+            config.pop("SETTINGS", None)
+        else:
+            config["SETTINGS"] = settings
+
+    sources = get_config_sources(app)
+    overridden: List[str] = []
+    for name, path in paths.items():
+        target: Dict[str, Any] = config
+        for part in path[:-1]:
+            target = target[part]
+        target[path[-1]] = _check_env_value(name, target[path[-1]], current[name])
+        sources[path[0]] = f"environment variable {name}"
+        overridden.append(path[0])
+    return overridden
+
+
+def load_instance_config(app: Flask, prefix: str):
+    """Load the instance config files and the environment variable overrides.
+
+    Loads ``config.py``, ``config.json`` and ``config.toml`` from the instance
+    folder, the file in the ``<prefix>_SETTINGS`` environment variable and then
+    the ``<prefix>_<KEY>`` environment variables.
+    """
+    for filename in ("config.py", "config.json", "config.toml"):
+        load_config_file(app, filename)
+    settings_file = environ.get(f"{prefix}_SETTINGS")
+    if settings_file:
+        load_config_file(app, settings_file)
+    load_env_overrides(app, prefix)
+
+
+def _mask(key: str, value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _mask(str(k).upper(), v) for k, v in value.items()}
+    if value and SECRET_KEY_PATTERN.search(key):
+        return "***"
+    if isinstance(value, str):
+        return _URL_PASSWORD_PATTERN.sub(r"\1***@", value)
+    return value
+
+
+def effective_config(app: Flask, show_secrets: bool = False) -> Dict[str, Any]:
+    """Get the merged config of the app (secrets masked unless show_secrets)."""
+    if show_secrets:
+        return dict(app.config)
+    return {key: _mask(key, value) for key, value in app.config.items()}
+
+
+@click.command("config-dump")
+@click.option(
+    "--show-secrets",
+    is_flag=True,
+    default=False,
+    help="Do not mask secrets (e.g. SECRET_KEY, passwords in urls).",
+)
+@click.option(
+    "--sources",
+    is_flag=True,
+    default=False,
+    help="Show the source (default, config file or environment variable) of every key.",
+)
+@with_appcontext
+def config_dump(show_secrets: bool, sources: bool):
+    """Print the effective config of the app as json."""
+    config = effective_config(current_app, show_secrets=show_secrets)
+    if sources:
+        key_sources = get_config_sources(current_app)
+        config = {
+            key: {"value": value, "source": key_sources.get(key, "default")}
+            for key, value in config.items()
+        }
+    click.echo(json.dumps(config, indent=2, sort_keys=True, default=repr))
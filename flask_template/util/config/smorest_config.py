@@ -2,8 +2,15 @@ class SmorestProductionConfig:
     OPENAPI_VERSION = "3.0.2"
     OPENAPI_JSON_PATH = "api-spec.json"
     OPENAPI_URL_PREFIX = "/api"
+    # render the spec once at startup and serve it with compression and etag
+    OPENAPI_JSON_PRERENDER = True
 
     # OpenAPI Documentation renderers:
+    # "cdn" loads the renderers from the urls below, "vendored" serves them from
+    # flask_template/static/openapi (use `invoke vendor-openapi-assets` to
+    # download them)
+    OPENAPI_ASSETS_MODE = "cdn"
+
     OPENAPI_REDOC_PATH = "/redoc/"
     OPENAPI_REDOC_URL = (
         "https://cdn.jsdelivr.net/npm/redoc@next/bundles/redoc.standalone.js"
@@ -1,6 +1,43 @@
 class SQLAchemyProductionConfig:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # connection pool of all engines, None uses the default of the database
+    # backend (see flask_template/db/pool.py); SQLALCHEMY_ENGINE_OPTIONS take
+    # precedence
+    SQLALCHEMY_POOL = {
+        "poolclass": None,  # e.g. "QueuePool" or "NullPool"
+        "pool_size": None,
+        "max_overflow": None,
+        "pool_timeout": None,  # seconds to wait for a connection
+        "pool_recycle": None,  # seconds, -1 to disable
+        "pool_pre_ping": None,
+        "pool_use_lifo": None,
+    }
+    SQLALCHEMY_POOL_METRICS = True  # record checkout wait times of queue pools
+
+    # read replicas of the default database (see flask_template/db/replicas.py)
+    SQLALCHEMY_REPLICA_URIS = []
+    SQLALCHEMY_REPLICA_STRATEGY = "round_robin"  # or "least_connections"
+    # route all reads to the replicas, not only reads in read only views
+    SQLALCHEMY_REPLICA_AUTO_ROUTING = False
+
+    # count and time the queries of every request (Server-Timing header and
+    # /debug/queries)
+    SQLALCHEMY_QUERY_INSTRUMENTATION = False
+    SQLALCHEMY_QUERY_HISTORY_SIZE = 50  # requests kept for the debug page
+    SQLALCHEMY_N_PLUS_ONE_THRESHOLD = 5  # executions of the same statement per request
+
+    # pragmas applied to every new SQLite connection (None skips a pragma)
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",  # readers do not block the writer (and vice versa)
+        "synchronous": "NORMAL",  # safe in WAL mode, only fsyncs on checkpoints
+        "mmap_size": 268_435_456,  # 256 MiB
+        "cache_size": -65_536,  # 64 MiB (negative values are in KiB)
+        "temp_store": "MEMORY",
+        "busy_timeout": 5_000,  # ms to wait for locks instead of "database is locked"
+    }
+
 
 class SQLAchemyDebugConfig(SQLAchemyProductionConfig):
     SQLALCHEMY_ECHO = True
+    SQLALCHEMY_QUERY_INSTRUMENTATION = True
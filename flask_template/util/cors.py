@@ -0,0 +1,223 @@
+"""Module containing the CORS configuration of the app.
+
+The CORS policies are configured per path prefix in ``CORS_POLICIES`` (e.g. one
+for the api, the licenses and the debug pages). All response headers of a policy
+are computed once when the app is created. A WSGI middleware answers CORS
+preflight requests for existing routes directly (only matching the url map,
+without request context or views) and adds the CORS headers to the responses of
+cross origin requests. Preflight requests for unknown routes or methods are
+passed to the app and answered without CORS headers.
+
+Policy options (all optional):
+
+* ``path_prefix``: the path prefix the policy applies to (default: ``"/"``)
+* ``origins``: ``"*"`` or a list of allowed origins (default: ``"*"``)
+* ``methods``: the allowed methods (default: all common methods)
+* ``allow_headers``: ``"*"`` (allow all requested headers) or a list of headers
+* ``expose_headers``: response headers the browser may read (default: none)
+* ``supports_credentials``: allow cookies and authorization headers
+  (default: False)
+* ``max_age``: seconds browsers may cache the preflight
+  (default: ``CORS_MAX_AGE``)
+"""
+
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+
+EXTENSION_NAME = "cors"
+
+DEFAULT_METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+
+Headers = List[Tuple[str, str]]
+
+
+def _as_tuple(value: Any) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        return tuple(v.strip() for v in value.split(",") if v.strip())
+    return tuple(value)
+
+
+@dataclass(frozen=True)
+class CorsPolicy:
+    """The CORS policy of all paths starting with ``path_prefix``."""
+
+    name: str
+    path_prefix: str
+    origins: Optional[FrozenSet[str]]  # None allows all origins
+    methods: FrozenSet[str]
+    allow_all_headers: bool
+    supports_credentials: bool
+    # precomputed headers (the Access-Control-Allow-Origin header is added per
+    # request)
+    preflight_headers: Headers = field(default_factory=list)
+    response_headers: Headers = field(default_factory=list)
+
+    @classmethod
+    def from_config(
+        cls, name: str, options: Mapping[str, Any], default_max_age: int
+    ) -> "CorsPolicy":
+        origins = options.get("origins", "*")
+        allowed_origins = None if origins == "*" else frozenset(_as_tuple(origins))
+        methods = tuple(
+            m.upper() for m in _as_tuple(options.get("methods", DEFAULT_METHODS))
+        )
+        allow_headers = options.get("allow_headers", "*")
+        allow_all_headers = allow_headers == "*"
+        supports_credentials = bool(options.get("supports_credentials", False))
+        max_age = options.get("max_age", default_max_age)
+
+        preflight_headers: Headers = [
+            ("Access-Control-Allow-Methods", ", ".join(methods))
+        ]
+        if not allow_all_headers and allow_headers:
+            preflight_headers.append(
+                ("Access-Control-Allow-Headers", ", ".join(_as_tuple(allow_headers)))
+            )
+        if max_age:
+            preflight_headers.append(("Access-Control-Max-Age", str(int(max_age))))
+        response_headers: Headers = []
+        expose_headers = _as_tuple(options.get("expose_headers", ()))
+        if expose_headers:
+            response_headers.append(
+                ("Access-Control-Expose-Headers", ", ".join(expose_headers))
+            )
+        if supports_credentials:
+            preflight_headers.append(("Access-Control-Allow-Credentials", "true"))
+            response_headers.append(("Access-Control-Allow-Credentials", "true"))
+        return cls(
+            name=name,
+            path_prefix=options.get("path_prefix", "/"),
+            origins=allowed_origins,
+            methods=frozenset(methods),
+            allow_all_headers=allow_all_headers,
+            supports_credentials=supports_credentials,
+            preflight_headers=preflight_headers,
+            response_headers=response_headers,
+        )
+
+    def origin_headers(self, origin: str) -> Optional[Headers]:
+        """The Access-Control-Allow-Origin (and Vary) headers for the origin.
+
+        Returns None if the origin is not allowed.
+        """
+        if self.origins is None and not self.supports_credentials:
+            return [("Access-Control-Allow-Origin", "*")]
+        if self.origins is not None and origin not in self.origins:
+            return None
+        # credentials are not allowed with the wildcard origin
+        return [("Access-Control-Allow-Origin", origin), ("Vary", "Origin")]
+
+
+class CorsMiddleware:
+    """WSGI middleware applying the CORS policies of the app."""
+
+    def __init__(
+        self,
+        app: Callable[..., Any],
+        policies: Iterable[CorsPolicy],
+        flask_app: Optional[Flask] = None,
+    ) -> None:
+        self.app = app
+        # used to check that the route of a preflight request exists
+        self.flask_app = flask_app
+        # longest prefix first
+        self.policies = sorted(policies, key=lambda p: len(p.path_prefix), reverse=True)
+
+    def match(self, path: str) -> Optional[CorsPolicy]:
+        for policy in self.policies:
+            if path.startswith(policy.path_prefix):
+                return policy
+        return None
+
+    def __call__(
+        self, environ: Dict[str, Any], start_response: Callable[..., Any]
+    ) -> Any:
+        origin = environ.get("HTTP_ORIGIN")
+        if origin is None:
+            return self.app(environ, start_response)  # not a cross origin request
+        policy = self.match(environ.get("PATH_INFO", "/"))
+        if policy is None:
+            return self.app(environ, start_response)
+        headers = policy.origin_headers(origin)
+        if headers is None:
+            return self.app(environ, start_response)
+        request_method = environ.get("HTTP_ACCESS_CONTROL_REQUEST_METHOD")
+        if environ["REQUEST_METHOD"] == "OPTIONS" and request_method is not None:
+            return self.preflight(
+                environ, start_response, policy, headers, request_method
+            )
+
+        def cors_start_response(status: str, response_headers: Headers, exc_info=None):
+            if not any(
+                k.lower() == "access-control-allow-origin" for k, _ in response_headers
+            ):
+                response_headers.extend(headers)
+                response_headers.extend(policy.response_headers)
+            return start_response(status, response_headers, exc_info)
+
+        return self.app(environ, cors_start_response)
+
+    def preflight(
+        self,
+        environ: Dict[str, Any],
+        start_response: Callable[..., Any],
+        policy: CorsPolicy,
+        headers: Headers,
+        request_method: str,
+    ) -> Any:
+        if request_method.upper() not in policy.methods or not self.route_exists(
+            environ, request_method
+        ):
+            # answered by the app without CORS headers (the browser blocks the
+            # request)
+            return self.app(environ, start_response)
+        headers = headers + policy.preflight_headers
+        requested_headers = environ.get("HTTP_ACCESS_CONTROL_REQUEST_HEADERS")
+        if policy.allow_all_headers and requested_headers:
+            headers.append(("Access-Control-Allow-Headers", requested_headers))
+            headers.append(("Vary", "Access-Control-Request-Headers"))
+        headers.append(("Content-Length", "0"))
+        start_response("204 NO CONTENT", headers)
+        return [b""]
+
+    def route_exists(self, environ: Dict[str, Any], request_method: str) -> bool:
+        """Check if the url map has a route for the path and the method."""
+        if self.flask_app is None:
+            return True
+        app = self.flask_app
+        try:
+            app.create_url_adapter(app.request_class(environ)).match(
+                method=request_method.upper()
+            )
+        except HTTPException:
+            # not found, method not allowed or a redirect (not followed in
+            # preflights)
+            return False
+        return True
+
+
+def register_cors(app: Flask):
+    """Apply the CORS policies of ``CORS_POLICIES`` (as WSGI middleware)."""
+    config = app.config
+    default_max_age = config.get("CORS_MAX_AGE", 0)
+    policies = [
+        CorsPolicy.from_config(name, options, default_max_age)
+        for name, options in config.get("CORS_POLICIES", {}).items()
+        if options is not None
+    ]
+    app.extensions[EXTENSION_NAME] = policies
+    if policies:
+        app.wsgi_app = CorsMiddleware(app.wsgi_app, policies, app)  # type: ignore
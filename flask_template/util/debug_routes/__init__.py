@@ -7,6 +7,9 @@ This Module should only be loaded in debug Mode.
 from flask.app import Flask
 from . import root  # noqa
 from . import routes  # noqa
+from . import db_pool  # noqa
+from . import queries  # noqa
+from .profiler import register_profiler
 
 
 def register_debug_routes(app: Flask):
@@ -15,3 +18,4 @@ def register_debug_routes(app: Flask):
         app.logger.warning("This Module should only be loaded if DEBUG mode is active!")
         raise Warning("This Module should only be loaded if DEBUG mode is active!")
     app.register_blueprint(root.DEBUG_BLP)
+    register_profiler(app)
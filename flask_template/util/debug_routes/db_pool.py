@@ -0,0 +1,16 @@
+"""Module containing the debug page showing the database connection pools."""
+
+from flask import render_template
+
+from ...db.pool import get_pool_stats
+from .root import DEBUG_BLP
+
+
+@DEBUG_BLP.route("/db-pool")
+def db_pool():
+    """Render the status and checkout metrics of all connection pools."""
+    return render_template(
+        "debug/db_pool.html",
+        title="Flask Template – Connection Pools",
+        pools=get_pool_stats(),
+    )
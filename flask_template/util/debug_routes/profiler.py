@@ -0,0 +1,293 @@
+"""Module containing the request profiler of the debug routes.
+
+Requests with the ``X-Debug-Profile`` header or the ``_profile`` query argument
+are run under cProfile. The last profiles are kept in a ring buffer and can be
+viewed as a sortable table of hot functions or downloaded as collapsed stacks
+for flamegraph tools (e.g. ``flamegraph.pl`` or speedscope).
+"""
+
+import sys
+from collections import deque
+from cProfile import Profile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+from pstats import Stats
+from threading import Lock
+from time import perf_counter
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from flask import (
+    Flask,
+    Response,
+    abort,
+    current_app,
+    g,
+    render_template,
+    request,
+    url_for,
+)
+
+from .root import DEBUG_BLP
+
+EXTENSION_NAME = "debug_profiler"
+
+PROFILE_HEADER = "X-Debug-Profile"
+PROFILE_QUERY_ARG = "_profile"
+
+SORT_KEYS = {
+    "tottime": lambda row: row.tottime,
+    "cumtime": lambda row: row.cumtime,
+    "calls": lambda row: row.calls,
+    "name": lambda row: row.function,
+}
+
+# (file, line, function name) as used by pstats
+FunctionKey = Tuple[str, int, str]
+
+
+@dataclass
+class FunctionRow:
+    """A single row of the hot function table."""
+
+    function: str
+    location: str
+    calls: int
+    primitive_calls: int
+    tottime: float  # seconds
+    cumtime: float  # seconds
+
+
+@dataclass
+class ProfileRecord:
+    """The profile of a single request."""
+
+    id: int
+    method: str
+    path: str
+    status_code: int
+    duration: float  # seconds
+    created: datetime
+    stats: Dict[FunctionKey, tuple]  # pstats raw stats
+
+    def rows(self) -> List[FunctionRow]:
+        return [
+            FunctionRow(
+                function=key[2],
+                location=f"{_short_path(key[0])}:{key[1]}",
+                calls=nc,
+                primitive_calls=cc,
+                tottime=tt,
+                cumtime=ct,
+            )
+            for key, (cc, nc, tt, ct, _) in self.stats.items()
+        ]
+
+
+def _short_path(path: str) -> str:
+    # strip the longest matching sys.path entry to keep the locations readable
+    for base in sorted((p for p in sys.path if p), key=len, reverse=True):
+        if path.startswith(base):
+            return Path(path).relative_to(base).as_posix()
+    return path
+
+
+def _frame_name(key: FunctionKey) -> str:
+    file, line, name = key
+    if file == "~":  # builtins
+        return name
+    # no spaces or semicolons, as they separate the frames and the sample count
+    return f"{name}@{_short_path(file)}:{line}".replace(" ", "_").replace(";", ",")
+
+
+def _callee_map(stats: Dict[FunctionKey, tuple]) -> Dict[FunctionKey, List[FunctionKey]]:
+    callees: Dict[FunctionKey, List[FunctionKey]] = {key: [] for key in stats}
+    for key, (_, _, _, _, callers) in stats.items():
+        for caller in callers:
+            if caller in callees:
+                callees[caller].append(key)
+    return callees
+
+
+def _callee_shares(
+    stats: Dict[FunctionKey, tuple],
+    callees: List[FunctionKey],
+    key: FunctionKey,
+    weight: float,
+    seen: frozenset,
+    min_microseconds: float,
+) -> Iterator[Tuple[FunctionKey, float]]:
+    """The callees of the frame with the share of their time on this path."""
+    for callee in callees:
+        if callee in seen:
+            continue  # recursion, the time is already attributed to the callee
+        callee_cumtime = stats[callee][3]
+        from_caller = stats[callee][4][key][3]
+        if callee_cumtime <= 0 or from_caller <= 0:
+            continue
+        share = weight * min(1.0, from_caller / callee_cumtime)
+        if callee_cumtime * share * 1_000_000 >= min_microseconds:
+            yield callee, share
+
+
+def _format_stacks(totals: Dict[str, float]) -> Iterator[str]:
+    for stack, microseconds in sorted(totals.items()):
+        yield f"{stack} {round(microseconds)}\n"
+
+
+def collapsed_stacks(
+    stats: Dict[FunctionKey, tuple], min_microseconds: float = 1.0, max_depth: int = 64
+) -> Iterator[str]:
+    """Reconstruct collapsed stacks from the profile.
+
+    The stacks use the format ``frame;frame;frame microseconds``. cProfile only
+    records the direct callers of each function, so the own time of a function
+    is distributed across the call paths proportionally to the cumulative time
+    each caller spent in it.
+    """
+    callees = _callee_map(stats)
+    roots = [key for key, value in stats.items() if not value[4]]
+
+    totals: Dict[str, float] = {}
+
+    def walk(key: FunctionKey, path: Tuple[str, ...], weight: float, seen: frozenset):
+        path = (*path, _frame_name(key))
+        own = stats[key][2] * weight * 1_000_000
+        if own >= min_microseconds:
+            stack = ";".join(path)
+            totals[stack] = totals.get(stack, 0.0) + own
+        if len(path) >= max_depth:
+            return
+        for callee, share in _callee_shares(
+            stats, callees[key], key, weight, seen, min_microseconds
+        ):
+            walk(callee, path, share, seen | {callee})
+
+    for root in roots:
+        walk(root, (), 1.0, frozenset({root}))
+    yield from _format_stacks(totals)
+
+
+class RequestProfiler:
+    """Profiles flagged requests and keeps the last profiles of a single app."""
+
+    def __init__(self, history_size: int):
+        self.history: Deque[ProfileRecord] = deque(maxlen=history_size)
+        self._ids = count(1)
+        self._lock = Lock()
+
+    def start_request(self):
+        if (
+            PROFILE_HEADER not in request.headers
+            and PROFILE_QUERY_ARG not in request.args
+        ):
+            return
+        profile = Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiler is already active
+            return
+        g._debug_profile = (profile, perf_counter())
+
+    def finish_request(self, response: Response) -> Response:
+        record = self._stop(response.status_code)
+        if record is not None:
+            response.headers["X-Debug-Profile-Url"] = url_for(
+                "debug-routes.profile", profile_id=record.id, _external=True
+            )
+        return response
+
+    def teardown_request(self, exc: Optional[BaseException] = None):
+        # after_request is skipped if the view raised an unhandled exception
+        # (e.g. in debug mode), the profiler must not keep running on the thread
+        self._stop(500)
+
+    def _stop(self, status_code: int) -> Optional[ProfileRecord]:
+        profile_start: Optional[Tuple[Profile, float]] = g.pop("_debug_profile", None)
+        if profile_start is None:
+            return None
+        profile, start = profile_start
+        profile.disable()
+        duration = perf_counter() - start
+        record = ProfileRecord(
+            id=next(self._ids),
+            method=request.method,
+            path=request.full_path.rstrip("?"),
+            status_code=status_code,
+            duration=duration,
+            created=datetime.now(timezone.utc),
+            stats=Stats(profile).stats,  # type: ignore
+        )
+        with self._lock:
+            self.history.append(record)
+        return record
+
+    def get(self, profile_id: int) -> Optional[ProfileRecord]:
+        with self._lock:
+            return next((r for r in self.history if r.id == profile_id), None)
+
+    def records(self) -> List[ProfileRecord]:
+        """Get the recorded profiles (newest first)."""
+        with self._lock:
+            return list(reversed(self.history))
+
+
+def _get_profiler() -> RequestProfiler:
+    return current_app.extensions[EXTENSION_NAME]
+
+
+@DEBUG_BLP.route("/profiles")
+def profiles():
+    """Render the list of the last profiled requests."""
+    return render_template(
+        "debug/profiles/all.html",
+        title="Flask Template – Profiles",
+        profiles=_get_profiler().records(),
+        header=PROFILE_HEADER,
+        query_arg=PROFILE_QUERY_ARG,
+    )
+
+
+@DEBUG_BLP.route("/profiles/<int:profile_id>")
+def profile(profile_id: int):
+    """Render the hot function table of a profiled request."""
+    record = _get_profiler().get(profile_id)
+    if record is None:
+        abort(404)
+    sort = request.args.get("sort", "tottime")
+    if sort not in SORT_KEYS:
+        sort = "tottime"
+    limit = request.args.get("limit", 100, type=int)
+    rows = sorted(record.rows(), key=SORT_KEYS[sort], reverse=sort != "name")
+    return render_template(
+        "debug/profiles/profile.html",
+        title=f"Flask Template – Profile {record.id}",
+        profile=record,
+        rows=rows[:limit] if limit > 0 else rows,
+        sort=sort,
+    )
+
+
+@DEBUG_BLP.route("/profiles/<int:profile_id>/collapsed")
+def profile_collapsed(profile_id: int):
+    """Download the collapsed stacks of a profiled request (in microseconds)."""
+    record = _get_profiler().get(profile_id)
+    if record is None:
+        abort(404)
+    response = current_app.response_class(
+        "".join(collapsed_stacks(record.stats)), mimetype="text/plain"
+    )
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=profile-{record.id}.collapsed.txt"
+    )
+    return response
+
+
+def register_profiler(app: Flask):
+    """Profile requests flagged with the profile header or query argument."""
+    profiler = RequestProfiler(app.config.get("DEBUG_PROFILER_HISTORY_SIZE", 20))
+    app.extensions[EXTENSION_NAME] = profiler
+    app.before_request(profiler.start_request)
+    app.after_request(profiler.finish_request)
+    app.teardown_request(profiler.teardown_request)
@@ -0,0 +1,19 @@
+"""Module containing the debug page showing the queries of the last requests."""
+
+from flask import render_template
+
+from ...db.instrumentation import get_query_instrumentation
+from .root import DEBUG_BLP
+
+
+@DEBUG_BLP.route("/queries")
+def queries():
+    """Render the query counts, times and possible N+1 queries per request."""
+    instrumentation = get_query_instrumentation()
+    return render_template(
+        "debug/queries.html",
+        title="Flask Template – Queries",
+        enabled=instrumentation is not None,
+        threshold=instrumentation.threshold if instrumentation else None,
+        requests=instrumentation.recent_requests() if instrumentation else [],
+    )
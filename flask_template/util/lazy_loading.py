@@ -0,0 +1,198 @@
+"""Module containing the deferred registration of app components (lazy mode).
+
+Every component of the app is registered by a ``register_*(app)`` function
+given as import string, so its modules are only imported when it is registered.
+In lazy mode ``create_app`` only registers the components that cannot be
+deferred and the others are registered on first use:
+
+* components handling requests are registered right before the first request
+  (by a WSGI middleware) or when an app context is pushed outside of a CLI
+  command of an already registered component (e.g. in ``flask shell``),
+* components adding CLI commands are registered when one of their commands is
+  looked up (e.g. ``flask db upgrade`` only registers the migrations).
+
+Flask does not allow adding routes once the first request was handled, so all
+request handling components are registered together on the first request.
+Components adding WSGI middleware must not be deferred, as the first request
+would bypass the middleware.
+"""
+
+from dataclasses import dataclass
+from threading import RLock, get_ident
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+from flask.signals import appcontext_pushed
+from werkzeug.utils import import_string
+
+EXTENSION_NAME = "lazy_loading"
+
+
+@dataclass(frozen=True)
+class AppComponent:
+    """A component of the app registered by a ``register_*(app)`` function."""
+
+    name: str
+    register: str  # import string of the register function ("module:function")
+    deferrable: bool = True
+    handles_requests: bool = True
+    cli_commands: Tuple[str, ...] = ()  # top level CLI commands added by the component
+
+    def register_with(self, app: Flask):
+        import_string(self.register)(app)
+
+
+def _invoked_cli_command(ctx: click.Context) -> Optional[str]:
+    """Get the invoked top level CLI command name (None if not yet resolved)."""
+    if ctx.parent is None:
+        return None
+    while ctx.parent.parent is not None:
+        ctx = ctx.parent
+    return ctx.info_name
+
+
+class LazyLoader:
+    """Registers the deferred components of a single app on first use."""
+
+    def __init__(self, app: Flask, components: Sequence[AppComponent]):
+        self.app = app
+        self.components = components
+        self.registered: List[str] = []
+        self.registration_times: Dict[str, float] = {}  # seconds per component
+        self._pending_requests = True
+        self._lock = RLock()
+        self._registering_thread: Optional[int] = None
+        self._wsgi_app = app.wsgi_app
+
+    def pending(self) -> List[AppComponent]:
+        return [c for c in self.components if c.name not in self.registered]
+
+    def register(self, components: Iterable[AppComponent]):
+        """Register the components in order (skipping registered components)."""
+        with self._lock:
+            self._registering_thread = get_ident()
+            try:
+                self._register(components)
+            finally:
+                self._registering_thread = None
+            if not any(c.handles_requests for c in self.pending()):
+                self._pending_requests = False
+                appcontext_pushed.disconnect(self._on_appcontext_pushed, self.app)
+
+    def _register(self, components: Iterable[AppComponent]):
+        for component in components:
+            if component.name in self.registered:
+                continue
+            self.registered.append(component.name)
+            start = perf_counter()
+            component.register_with(self.app)
+            self.registration_times[component.name] = perf_counter() - start
+            self.app.logger.info(
+                f'Registered deferred component "{component.name}" in '
+                f"{self.registration_times[component.name]:.3f}s."
+            )
+
+    def register_request_components(self):
+        self.register(c for c in self.components if c.handles_requests)
+
+    def register_cli_command(self, name: str):
+        """Register the components adding the CLI command (all if unknown)."""
+        pending = self.pending()
+        providers = [c for c in pending if name in c.cli_commands]
+        self.register(providers or pending)
+
+    def wsgi_app(self, environ: Dict[str, Any], start_response: Any) -> Any:
+        if self._pending_requests:
+            self.register_request_components()
+        return self._wsgi_app(environ, start_response)
+
+    def _on_appcontext_pushed(self, app: Flask, **kwargs: Any):
+        if not self._pending_requests or self._registering_thread == get_ident():
+            return  # registering a component may push an app context
+        ctx = click.get_current_context(silent=True)
+        if ctx is not None:
+            command = _invoked_cli_command(ctx)
+            if command is None or command in app.cli.commands:
+                # the flask CLI looking up a command (the lazy CLI group
+                # registers the component of deferred commands) or e.g. a
+                # database command
+                return
+        self.register_request_components()
+
+    def install(self):
+        """Install the hooks registering the deferred components on use."""
+        self.app.wsgi_app = self.wsgi_app  # type: ignore
+        self.app.cli = LazyAppGroup(
+            self, name=self.app.cli.name, commands=self.app.cli.commands
+        )
+        appcontext_pushed.connect(self._on_appcontext_pushed, self.app)
+
+
+class LazyAppGroup(AppGroup):
+    """The CLI group of a lazy app registering deferred components on demand.
+
+    The commands of deferred components are listed in ``flask --help`` with a
+    placeholder help text, so listing the commands does not register them.
+    """
+
+    # ctx.meta key marking an invocation that lists the commands
+    _LISTING_KEY = "flask_template.lazy_loading.listing"
+
+    def __init__(self, loader: LazyLoader, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.loader = loader
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        names = set(super().list_commands(ctx))
+        for component in self.loader.pending():
+            names.update(component.cli_commands)
+        ctx.meta[self._LISTING_KEY] = True
+        return sorted(names)
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or not self.loader.pending():
+            return command
+        if ctx.meta.get(self._LISTING_KEY):
+            # the help of the command list, do not import the component
+            for component in self.loader.pending():
+                if cmd_name in component.cli_commands:
+                    return click.Command(
+                        cmd_name,
+                        short_help=f"Provided by the {component.name} component (loaded on use).",
+                    )
+        self.loader.register_cli_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+def register_components(
+    app: Flask, components: Sequence[AppComponent], lazy: Optional[bool] = None
+):
+    """Register the components with the app (deferring them if lazy).
+
+    Only deferrable components are deferred. If lazy is None the config
+    ``LAZY_LOADING`` is used (if that is None too, the app is lazy only if it is
+    created by the flask CLI).
+    """
+    if lazy is None:
+        lazy = app.config.get("LAZY_LOADING")
+    if lazy is None:
+        lazy = click.get_current_context(silent=True) is not None
+    if not lazy:
+        for component in components:
+            component.register_with(app)
+        return
+    for component in components:
+        if not component.deferrable:
+            component.register_with(app)
+    loader = LazyLoader(app, [c for c in components if c.deferrable])
+    app.extensions[EXTENSION_NAME] = loader
+    loader.install()
+
+
+def get_lazy_loader(app: Flask) -> Optional[LazyLoader]:
+    """Get the lazy loader of the app (None if the app is not lazy)."""
+    return app.extensions.get(EXTENSION_NAME)
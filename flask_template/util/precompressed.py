@@ -0,0 +1,124 @@
+"""Module containing helpers to serve static content precompressed.
+
+The content is compressed once (gzip and, if the optional ``brotli`` package is
+installed, brotli) and served according to the ``Accept-Encoding`` header of
+the request. Conditional requests with ``If-None-Match`` are answered with
+``304 Not Modified``.
+"""
+
+import gzip
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+"""Content smaller than this is not compressed."""
+MIN_COMPRESS_SIZE = 256
+
+
+@dataclass(frozen=True)
+class PrecompressedContent:
+    """Immutable content with precomputed compressed variants and ETags."""
+
+    data: bytes
+    mimetype: str
+    etag: str
+    variants: Dict[str, bytes]
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, mimetype: str, *, compress: bool = True
+    ) -> "PrecompressedContent":
+        """Compress the data and compute its (strong) ETag."""
+        variants: Dict[str, bytes] = {}
+        if compress and len(data) >= MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                variants["br"] = brotli.compress(data, quality=11)
+            # mtime=0 makes the output reproducible
+            variants["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+        etag = sha256(data).hexdigest()[:32]
+        return cls(data=data, mimetype=mimetype, etag=etag, variants=variants)
+
+    @classmethod
+    def from_file(cls, path: Path, mimetype: str) -> "PrecompressedContent":
+        """Load a file and its precompressed siblings (``.br`` and ``.gz``).
+
+        The file is only compressed on load if no precompressed variant exists.
+        """
+        data = path.read_bytes()
+        variants: Dict[str, bytes] = {}
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            compressed = path.with_name(path.name + suffix)
+            if compressed.is_file():
+                variants[encoding] = compressed.read_bytes()
+        content = cls.from_bytes(data, mimetype, compress=not variants)
+        variants.update(content.variants)
+        return cls(data=data, mimetype=mimetype, etag=content.etag, variants=variants)
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # different representations must have different strong etags
+        return f"{self.etag}-{encoding}" if encoding else self.etag
+
+    def choose_encoding(self) -> Optional[str]:
+        """Choose the best precompressed variant accepted by the request."""
+        accept = request.accept_encodings
+        best: Optional[str] = None
+        best_quality = 0.0
+        for encoding in self.variants:
+            quality = accept[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+
+def make_precompressed_response(
+    content: PrecompressedContent,
+    *,
+    max_age: Optional[int] = None,
+    immutable: bool = False,
+    public: bool = True,
+) -> Response:
+    """Create a response for the current request serving the content.
+
+    Args:
+        content (PrecompressedContent): the content to serve
+        max_age (Optional[int], optional): the max-age in seconds. Defaults to
+            None (always revalidate).
+        immutable (bool, optional): mark the content as immutable. Defaults to
+            False.
+        public (bool, optional): allow shared caches to store the response.
+            Defaults to True.
+    """
+    encoding = content.choose_encoding()
+    etag = content.etag_for(encoding)
+    etags = request.if_none_match
+    if etags and any(
+        etags.contains(content.etag_for(e)) for e in (None, *content.variants)
+    ):
+        response = current_app.response_class(status=304)
+    else:
+        body = content.variants[encoding] if encoding else content.data
+        response = current_app.response_class(body, mimetype=content.mimetype)
+        if encoding:
+            response.content_encoding = encoding
+    response.set_etag(etag)
+    if content.variants:
+        response.vary.add("Accept-Encoding")
+    cache_control = response.cache_control
+    if public:
+        cache_control.public = True
+    if max_age is None:
+        # allow caching, but always revalidate using the etag
+        cache_control.no_cache = True
+    else:
+        cache_control.max_age = max_age
+    if immutable:
+        cache_control.immutable = True
+    return response
@@ -1,12 +1,108 @@
+"""Module containing the reverse proxy fix of the app.
+
+With ``REVERSE_PROXY_COUNT`` the ``X-Forwarded-*`` headers set by that number of
+proxies are applied to the request (e.g. for external urls and the remote
+address). With ``REVERSE_PROXY_TRUSTED_CIDRS`` they are only applied to requests
+coming directly from one of the trusted proxy networks, the headers of all other
+requests are ignored.
+"""
+
+from functools import lru_cache
+from ipaddress import ip_address, ip_network
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Tuple
+
 from flask import Flask
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 
+class ProxyNetworks:
+    """A set of networks matched independently of the number of networks.
+
+    The networks are precomputed into one hash set of network addresses per
+    prefix length, so matching an address needs at most one lookup per distinct
+    prefix length (instead of one comparison per network). The results of the
+    last ``cache_size`` addresses are cached (requests mostly come from a few
+    proxies).
+    """
+
+    def __init__(self, cidrs: Iterable[str], cache_size: int = 1024) -> None:
+        # (version, prefix length, netmask) -> network addresses as int
+        networks: Dict[Tuple[int, int, int], set] = {}
+        for cidr in cidrs:
+            network = ip_network(cidr.strip(), strict=False)
+            key = (network.version, network.prefixlen, int(network.netmask))
+            networks.setdefault(key, set()).add(int(network.network_address))
+        self._lookups: Dict[int, List[Tuple[int, FrozenSet[int]]]] = {4: [], 6: []}
+        # longer prefixes first (they usually match the proxies)
+        for (version, _, netmask), addresses in sorted(
+            networks.items(), key=lambda item: -item[0][1]
+        ):
+            self._lookups[version].append((netmask, frozenset(addresses)))
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    def __bool__(self) -> bool:
+        return bool(self._lookups[4] or self._lookups[6])
+
+    def __contains__(self, address: str) -> bool:
+        return self._cached_match(address)
+
+    def _match(self, address: str) -> bool:
+        try:
+            ip = ip_address(address)
+        except ValueError:
+            return False  # e.g. unix sockets
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        value = int(ip)
+        return any(
+            value & netmask in addresses
+            for netmask, addresses in self._lookups[ip.version]
+        )
+
+
+class TrustedProxyFix:
+    """Apply the ProxyFix only to requests directly from trusted proxies."""
+
+    def __init__(
+        self,
+        app: Callable[[Dict[str, Any], Any], Any],
+        trusted_networks: ProxyNetworks,
+        proxy_count: int = 1,
+    ) -> None:
+        self.app = app
+        self.trusted_networks = trusted_networks
+        self.proxy_fix = ProxyFix(
+            app,
+            x_for=proxy_count,
+            x_host=proxy_count,
+            x_port=proxy_count,
+            x_prefix=proxy_count,
+            x_proto=proxy_count,
+        )
+
+    def __call__(self, environ: Dict[str, Any], start_response: Any) -> Any:
+        if environ.get("REMOTE_ADDR", "") in self.trusted_networks:
+            return self.proxy_fix(environ, start_response)
+        return self.app(environ, start_response)
+
+
 def apply_reverse_proxy_fix(app: Flask):
-    """Apply the reverse proxy fix from werkzeug with the number configured in REVERSE_PROXY_COUNT."""
+    """Apply the reverse proxy fix from werkzeug with the number configured in REVERSE_PROXY_COUNT.
+
+    If REVERSE_PROXY_TRUSTED_CIDRS is set the fix is only applied to requests
+    from these networks (with REVERSE_PROXY_COUNT defaulting to 1).
+    """
     r_p_count = app.config.get("REVERSE_PROXY_COUNT", 0)
-    if r_p_count > 0:
-        app.wsgi_app = ProxyFix(
+    trusted_cidrs = app.config.get("REVERSE_PROXY_TRUSTED_CIDRS", ())
+    if isinstance(trusted_cidrs, str):
+        trusted_cidrs = [c.strip() for c in trusted_cidrs.split(",") if c.strip()]
+    trusted_networks = ProxyNetworks(trusted_cidrs)
+    if trusted_networks:
+        app.wsgi_app = TrustedProxyFix(  # type: ignore
+            app.wsgi_app, trusted_networks, proxy_count=max(r_p_count, 1)
+        )
+    elif r_p_count > 0:
+        app.wsgi_app = ProxyFix(  # type: ignore
             app.wsgi_app,
             x_for=r_p_count,
             x_host=r_p_count,
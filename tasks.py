@@ -239,6 +239,18 @@ def update_licenses(c: Context, include_installed: bool = False):
         )
 
 
+@task
+def prerender_licenses(c: Context):
+    """Render the licenses page into the static folder (with gzip and brotli variants).
+
+    The app serves the prerendered page instead of rendering it (until the license templates change).
+
+    Args:
+        c (Context): task context
+    """
+    c.run(join(["flask", "prerender-licenses"]), echo=True)
+
+
 @task(update_licenses)
 def update_dependencies(c: Context):
     """Update dependencies that are derived from the pyproject.toml dependencies (e.g. doc dependencies and licenses).
@@ -264,6 +276,86 @@ def update_dependencies(c: Context):
     )
 
 
+@task
+def vendor_openapi_assets(
+    c: Context,
+    redoc_version: str = "next",
+    rapidoc_version: str = "latest",
+    swagger_ui_version: str = "latest",
+):
+    """Download the assets of the OpenAPI documentation renderers into the static folder.
+
+    Set OPENAPI_ASSETS_MODE="vendored" to serve the downloaded assets instead of using the CDN.
+
+    Args:
+        c (Context): task context
+        redoc_version (str, optional): the npm version of redoc. Defaults to "next".
+        rapidoc_version (str, optional): the npm version of rapidoc. Defaults to "latest".
+        swagger_ui_version (str, optional): the npm version of swagger-ui-dist. Defaults to "latest".
+    """
+    import gzip
+    from urllib.request import urlopen
+
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    cdn = "https://cdn.jsdelivr.net/npm"
+    assets = {
+        "redoc": [f"{cdn}/redoc@{redoc_version}/bundles/redoc.standalone.js"],
+        "rapidoc": [f"{cdn}/rapidoc@{rapidoc_version}/dist/rapidoc-min.js"],
+        "swagger-ui": [
+            f"{cdn}/swagger-ui-dist@{swagger_ui_version}/{file_}"
+            for file_ in (
+                "swagger-ui.css",
+                "swagger-ui-bundle.js",
+                "swagger-ui-standalone-preset.js",
+            )
+        ],
+    }
+    assets_folder = Path(".") / Path(MODULE_NAME) / Path("static/openapi")
+    for folder, urls in assets.items():
+        target_folder = assets_folder / folder
+        rmtree(target_folder, ignore_errors=True)
+        target_folder.mkdir(parents=True)
+        for url in urls:
+            print("Download:", url)
+            with urlopen(url) as response:
+                data: bytes = response.read()
+            target = target_folder / url.rsplit("/", 1)[-1]
+            target.write_bytes(data)
+            # precompress assets to avoid compressing them at runtime
+            target.with_name(target.name + ".gz").write_bytes(
+                gzip.compress(data, compresslevel=9, mtime=0)
+            )
+            if brotli is not None:
+                target.with_name(target.name + ".br").write_bytes(
+                    brotli.compress(data, quality=11)
+                )
+
+
+@task
+def benchmark(c: Context, name: str = ""):
+    """Run the benchmarks in the benchmarks folder.
+
+    Args:
+        c (Context): task context
+        name (str, optional): the name of a single benchmark module to run. Defaults to "" (all benchmarks).
+    """
+    names: List[str] = (
+        [name]
+        if name
+        else [
+            p.stem
+            for p in sorted(Path("./benchmarks").glob("*.py"))
+            if not p.stem.startswith("_")
+        ]
+    )
+    for benchmark_name in names:
+        c.run(join(["python", "-m", f"benchmarks.{benchmark_name}"]), echo=True)
+
+
 @task()
 def rename_project(c: Context, name: str):
     """Rename the project template to a different project name.